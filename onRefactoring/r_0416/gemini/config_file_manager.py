@@ -4,7 +4,12 @@
 json file 검증 및 fix 스크립트
 """
 
-from gemini_config_gen import GeminiConfigGenerator
+import os
+import json
+from datetime import datetime
+
+from gemini_config_gen import GeminiConfigGenerator, PromptBuilder, minify_json
+
 class ConfigFileManager:
     def __init__(self, temp_dir=None):
         self.temp_dir = temp_dir or os.getcwd()
@@ -92,21 +97,23 @@ class ConfigValidator(GeminiConfigGenerator):
 
     def fix_with_feedback(self, config, analysis):
         """Gemini를 이용한 컨텍스트 보존 수정"""
-        prompt = f"""다음 웹 자동화 설정 파일을 수정하세요. 문제 분석 결과와 원본 구조를 유지해야 합니다.
+        builder = PromptBuilder(self.prompt_budget)
+        builder.add(f"""다음 웹 자동화 설정 파일을 수정하세요. 문제 분석 결과와 원본 구조를 유지해야 합니다.
         
         [원본 설정]
-        {json.dumps(config, indent=2, ensure_ascii=False)}
-        
-        [발견된 문제점]
-        {analysis}
-        
+        {minify_json(config)}
+        """)
+        # 설정은 그대로 유지해야 하므로 자르지 않고, 문제 목록이 길면 뒷부분을 잘라냄
+        builder.add(f"[발견된 문제점]\n{minify_json(analysis)}", priority=0)
+        builder.add(f"""
         [수정 요구사항]
         1. 구조적 문제({analysis['severity']} 우선순위) 해결
         2. 셀렉터 오류 수정 시 원본 로직 유지
         3. 액션 순서 변경 없이 구문만 교정
         4. 누락된 필드는 원본 데이터 참조하여 추가
         5. JSON 형식 엄격 준수
-        """
-        
+        """)
+        prompt = self._finish_prompt(builder, "설정 수정")
+
         response = self.model.generate_content(prompt)
         return self._extract_and_validate_config(response.text)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chrome DevTools Protocol 액션 백엔드
+WebDriver 명령(find_element -> click/send_keys/get_attribute)은 명령마다 chromedriver 왕복이 생기므로,
+요소 탐색과 동작을 JS 한 번으로 묶어 CDP Runtime.evaluate 한 번에 처리
+클릭은 WebDriver 와 같이 보이는지/가려졌는지 확인한 뒤 Input.dispatchMouseEvent 로 실제 마우스 이벤트를 보냄
+
+사용: browser.action_backend: "cdp" (Chrome/Edge 전용, 그 외 드라이버는 WebDriver 로 처리)
+"""
+
+import json
+
+# 로케이터(By 값) -> 요소 목록 (WebDriver 와 같은 의미의 탐색)
+FIND_ELEMENTS_JS = """
+function __crawlerFind(by, value) {
+  var d = document, list;
+  switch (by) {
+    case "css selector": list = d.querySelectorAll(value); break;
+    case "xpath":
+      var r = d.evaluate(value, d, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      list = [];
+      for (var i = 0; i < r.snapshotLength; i++) list.push(r.snapshotItem(i));
+      break;
+    case "id": list = d.querySelectorAll('[id="' + CSS.escape(value) + '"]'); break;
+    case "class name": list = d.getElementsByClassName(value); break;
+    case "tag name": list = d.getElementsByTagName(value); break;
+    case "name": list = d.getElementsByName(value); break;
+    case "link text":
+      list = Array.from(d.links).filter(function (a) { return a.innerText.trim() === value; }); break;
+    case "partial link text":
+      list = Array.from(d.links).filter(function (a) { return a.innerText.indexOf(value) !== -1; }); break;
+    default: throw new Error("unsupported locator: " + by);
+  }
+  return Array.from(list);
+}
+"""
+
+
+class CdpActionBackend:
+    """execute_cdp_cmd 기반 액션 (액션당 CDP 명령 1회, 클릭은 가림 확인 + 마우스 누름/뗌으로 3회)"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def evaluate(self, body, *args):
+        """__crawlerFind 가 정의된 함수 본문을 실행하고 반환값을 돌려받음 (args 는 JSON 으로 전달)"""
+        expression = "(async function () {%s\n%s}).apply(null, %s)" % (
+            FIND_ELEMENTS_JS, body, json.dumps(args, ensure_ascii=False)
+        )
+        response = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True,
+            "userGesture": True,
+        })
+        if response.get("exceptionDetails"):
+            from selenium.common.exceptions import WebDriverException
+
+            details = response["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text")
+            raise WebDriverException(f"CDP 스크립트 오류: {message}")
+        return response.get("result", {}).get("value")
+
+    def _require(self, found, locator):
+        if not found:
+            from selenium.common.exceptions import NoSuchElementException
+
+            raise NoSuchElementException(f"요소를 찾을 수 없음: {locator[0]}={locator[1]}")
+
+    def click(self, locator):
+        """요소 중앙 클릭 - 보이지 않으면 ElementNotInteractableException, 다른 요소에 가려져 있으면
+        ElementClickInterceptedException (el.click() 과 달리 WebDriver 클릭과 같은 조건)
+
+        탐색/스크롤/가림 확인은 Runtime.evaluate 한 번, 클릭은 Input.dispatchMouseEvent (누름/뗌)
+        """
+        target = self.evaluate("""
+            var el = __crawlerFind(arguments[0], arguments[1])[0];
+            if (!el) return null;
+            el.scrollIntoView({block: "center", inline: "center"});
+            var rect = el.getClientRects()[0];
+            var style = getComputedStyle(el);
+            if (!rect || rect.width === 0 || rect.height === 0 || style.visibility === "hidden") {
+              return {status: "hidden"};
+            }
+            var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+            var hit = document.elementFromPoint(x, y);
+            if (hit !== el && !el.contains(hit)) {
+              return {status: "obscured", by: hit ? hit.outerHTML.slice(0, 120) : "(뷰포트 밖)"};
+            }
+            return {status: "ok", x: x, y: y};
+        """, *locator)
+        self._require(target, locator)
+        if target["status"] == "hidden":
+            from selenium.common.exceptions import ElementNotInteractableException
+
+            raise ElementNotInteractableException(f"보이지 않는 요소: {locator[0]}={locator[1]}")
+        if target["status"] == "obscured":
+            from selenium.common.exceptions import ElementClickInterceptedException
+
+            raise ElementClickInterceptedException(
+                f"다른 요소에 가려져 클릭할 수 없음: {locator[0]}={locator[1]} - {target['by']}"
+            )
+        for event_type in ("mousePressed", "mouseReleased"):
+            self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
+                "type": event_type, "x": target["x"], "y": target["y"], "button": "left", "clickCount": 1,
+            })
+
+    def input(self, locator, text, submit=False):
+        # React 등 프레임워크가 값 변경을 감지하도록 네이티브 setter + input/change 이벤트 사용
+        found = self.evaluate("""
+            var el = __crawlerFind(arguments[0], arguments[1])[0];
+            if (!el) return false;
+            el.focus();
+            var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            var setter = Object.getOwnPropertyDescriptor(proto, "value");
+            if (setter && setter.set && (el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement)) {
+              setter.set.call(el, arguments[2]);
+            } else {
+              el.textContent = arguments[2];
+            }
+            el.dispatchEvent(new Event("input", {bubbles: true}));
+            el.dispatchEvent(new Event("change", {bubbles: true}));
+            if (arguments[3]) {
+              var opts = {key: "Enter", code: "Enter", keyCode: 13, which: 13, bubbles: true, cancelable: true};
+              var proceed = el.dispatchEvent(new KeyboardEvent("keydown", opts));
+              el.dispatchEvent(new KeyboardEvent("keypress", opts));
+              el.dispatchEvent(new KeyboardEvent("keyup", opts));
+              if (proceed && el.form) {
+                if (el.form.requestSubmit) el.form.requestSubmit(); else el.form.submit();
+              }
+            }
+            return true;
+        """, locator[0], locator[1], text, bool(submit))
+        self._require(found, locator)
+
+    def extract(self, locator, attribute=None):
+        return self.evaluate("""
+            var attribute = arguments[2];
+            return __crawlerFind(arguments[0], arguments[1]).map(function (el) {
+              if (!attribute) return el.innerText;
+              // WebDriver get_attribute 와 같이 프로퍼티를 우선하고 없으면 속성 값
+              var prop = el[attribute];
+              if (prop !== undefined && prop !== null && typeof prop !== "object" && typeof prop !== "function") {
+                return String(prop);
+              }
+              return el.getAttribute(attribute);
+            });
+        """, locator[0], locator[1], attribute)
+
+    def execute(self, script):
+        self.evaluate(script)
+
+    def wait_for(self, locator, timeout):
+        """요소가 나타날 때까지 브라우저 안에서 폴링 - 나타나면 True"""
+        return self.evaluate("""
+            var deadline = Date.now() + arguments[2] * 1000;
+            while (Date.now() < deadline) {
+              if (__crawlerFind(arguments[0], arguments[1]).length) return true;
+              await new Promise(function (resolve) { setTimeout(resolve, 100); });
+            }
+            return __crawlerFind(arguments[0], arguments[1]).length > 0;
+        """, locator[0], locator[1], float(timeout))
+
+
+def cdp_backend_for(driver, config):
+    """설정이 cdp 이고 드라이버가 CDP 를 지원하면 백엔드 반환, 아니면 None (WebDriver 사용)"""
+    if config.get("browser", {}).get("action_backend") != "cdp":
+        return None
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    return CdpActionBackend(driver)
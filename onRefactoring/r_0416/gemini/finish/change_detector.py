@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+추출 결과 변경 감지
+대상/액션별로 직전 실행의 추출 결과와 지문(fingerprint)을 저장해 두고, 다음 실행에서
+추가/삭제/변경된 항목만 기록. 변경이 없으면 아무 파일도 쓰지 않음
+
+사용: output.change_detection: true (전체) 또는 extract 액션에 "detect_changes": true
+  <results_dir>/.changes/<키>.json      - 직전 결과 상태
+  <results_dir>/<output_file 이름>.changes.jsonl - 변경 내역 (실행마다 한 줄)
+"""
+
+import re
+import json
+import hashlib
+import difflib
+from datetime import datetime
+
+STATE_DIR = ".changes"
+
+
+def fingerprint(results):
+    payload = json.dumps(results, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _safe_name(key):
+    return re.sub(r"[^\w.-]+", "_", key)
+
+
+def _item_key(item):
+    return json.dumps(item, ensure_ascii=False, sort_keys=True)
+
+
+def diff_results(previous, current):
+    """순서를 고려한 비교 - {"added": [...], "removed": [...], "changed": [{"index", "before", "after"}]}"""
+    added, removed, changed = [], [], []
+    # dict/list 항목(extract_json 결과)도 비교할 수 있도록 직렬화한 값으로 매칭
+    matcher = difflib.SequenceMatcher(None, [_item_key(item) for item in previous],
+                                      [_item_key(item) for item in current], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if tag == "replace":
+            # 같은 위치에서 바뀐 항목은 변경으로, 남는 항목은 추가/삭제로 분류
+            pairs = min(i2 - i1, j2 - j1)
+            for offset in range(pairs):
+                changed.append({"index": j1 + offset, "before": previous[i1 + offset], "after": current[j1 + offset]})
+            removed.extend(previous[i1 + pairs:i2])
+            added.extend(current[j1 + pairs:j2])
+        elif tag == "delete":
+            removed.extend(previous[i1:i2])
+        elif tag == "insert":
+            added.extend(current[j1:j2])
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def detect_changes(writer, key, results):
+    """직전 상태와 비교 - 변경이 없으면 None, 있으면 diff (새 상태는 writer 로 기록 예약)"""
+    state_path = writer.path("results_dir", f"{STATE_DIR}/{_safe_name(key)}.json")
+    current = fingerprint(results)
+
+    previous = None
+    text = writer.read(state_path)
+    if text:
+        try:
+            previous = json.loads(text)
+        except json.JSONDecodeError:
+            previous = None
+
+    if previous is not None and previous.get("fingerprint") == current:
+        return None
+
+    diff = diff_results(previous.get("results", []) if previous else [], results)
+    diff["first_run"] = previous is None
+    writer.write(state_path, json.dumps(
+        {"key": key, "fingerprint": current, "results": results,
+         "time": datetime.now().isoformat(timespec="seconds")},
+        ensure_ascii=False,
+    ))
+    return diff
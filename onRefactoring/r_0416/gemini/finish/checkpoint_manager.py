@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실행 체크포인트 저널 (append-only JSON lines)
+긴 multi-target 실행이 중단되었을 때 --resume 으로 완료된 대상을 건너뛰기 위해 사용
+
+재개 단위는 대상: 중단된 대상은 처음(페이지 이동)부터 다시 실행
+(클릭/입력으로 만든 페이지 상태는 저장할 수 없으므로 완료된 액션만 건너뛸 수 없음)
+액션 레코드는 중단 전까지의 결과를 확인하기 위한 기록으로만 남김
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+
+def config_hash(config):
+    """설정 내용 기반 해시 (저널과 설정 파일의 일치 여부 확인용)"""
+    payload = json.dumps(config.get("targets", []), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def target_key(index, target):
+    """대상 식별 키 (순서 + 이름)"""
+    return f"{index}:{target.get('name', 'Unnamed Target')}"
+
+
+class CheckpointManager:
+    """완료된 대상과 액션 결과를 기록하는 저널
+
+    레코드 형식 (한 줄에 하나):
+      {"event": "run_start", "config_hash": ...}
+      {"event": "action", "target": key, "action_index": n, "output": ...}
+      {"event": "target_done", "target": key, "success": true}
+      {"event": "run_complete"}
+    """
+
+    def __init__(self, journal_path, config, resume=False, logger=None):
+        self.journal_path = journal_path
+        self.config_hash = config_hash(config)
+        self.logger = logger
+        self.completed_targets = {}
+
+        journal_dir = os.path.dirname(journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+
+        if resume and self._load():
+            mode = "a"
+        else:
+            self.completed_targets = {}
+            mode = "w"
+
+        self._file = open(journal_path, mode, encoding="utf-8")
+        if mode == "w":
+            self._append({"event": "run_start", "config_hash": self.config_hash}, sync=True)
+
+    def journal_path_for(config, config_path):
+        """설정 파일 경로에 대응하는 기본 저널 경로"""
+        output_config = config.get("output", {})
+        if output_config.get("checkpoint_file"):
+            return output_config["checkpoint_file"]
+        results_dir = output_config.get("results_dir", "results")
+        base = os.path.splitext(os.path.basename(config_path))[0]
+        return os.path.join(results_dir, "checkpoints", f"{base}.journal.jsonl")
+
+    def _load(self):
+        """기존 저널 읽기 - 이어서 실행 가능한 경우 True"""
+        if not os.path.exists(self.journal_path):
+            return False
+
+        records = []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 강제 종료로 잘린 마지막 줄은 무시
+                    break
+
+        if not records or records[0].get("event") != "run_start":
+            return False
+        if records[0].get("config_hash") != self.config_hash:
+            if self.logger:
+                self.logger.warning("설정이 변경되어 체크포인트를 무시합니다: %s", self.journal_path)
+            return False
+        if records[-1].get("event") == "run_complete":
+            # 이전 실행이 정상 종료됨 - 처음부터 다시 실행
+            return False
+
+        for record in records:
+            if record.get("event") == "target_done":
+                self.completed_targets[record["target"]] = record.get("success", True)
+        return True
+
+    def _append(self, record, sync=False):
+        record["time"] = datetime.now().isoformat(timespec="seconds")
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def is_completed(self, key):
+        """성공적으로 완료된 대상인지 여부 (실패한 대상은 재개 시 다시 실행)"""
+        return self.completed_targets.get(key) is True
+
+    def record_action(self, key, action_index, output):
+        self._append({"event": "action", "target": key, "action_index": action_index, "output": output})
+
+    def record_target(self, key, success):
+        self.completed_targets[key] = success
+        self._append({"event": "target_done", "target": key, "success": success}, sync=True)
+
+    def complete(self):
+        self._append({"event": "run_complete"}, sync=True)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
@@ -4,7 +4,13 @@
 json file 검증 및 fix 스크립트
 """
 
+import os
+import re
+import json
+from datetime import datetime
+
 from gemini_config_gen import GeminiConfigGenerator
+from prompt_builder import PromptBuilder, minify_json
 
 
 class ConfigFileManager:
@@ -94,25 +100,123 @@ class ConfigValidator(GeminiConfigGenerator):
 
     def fix_with_feedback(self, config, analysis):
         """Gemini를 이용한 컨텍스트 보존 수정"""
-        prompt = f"""다음 웹 자동화 설정 파일을 수정하세요. 문제 분석 결과와 원본 구조를 유지해야 합니다.
+        builder = PromptBuilder(self.prompt_budget)
+        builder.add(f"""다음 웹 자동화 설정 파일을 수정하세요. 문제 분석 결과와 원본 구조를 유지해야 합니다.
 
         [원본 설정]
-        {json.dumps(config, indent=2, ensure_ascii=False)}
-
-        [발견된 문제점]
-        {analysis}
-
+        {minify_json(config)}
+        """)
+        # 설정은 그대로 유지해야 하므로 자르지 않고, 문제 목록이 길면 뒷부분을 잘라냄
+        builder.add(f"[발견된 문제점]\n{minify_json(analysis)}", priority=0)
+        builder.add(f"""
         [수정 요구사항]
         1. 구조적 문제({analysis['severity']} 우선순위) 해결
         2. 셀렉터 오류 수정 시 원본 로직 유지
         3. 액션 순서 변경 없이 구문만 교정
         4. 누락된 필드는 원본 데이터 참조하여 추가
         5. JSON 형식 엄격 준수
-        """
+        """)
+        prompt = self._finish_prompt(builder, "설정 수정")
 
         response = self.model.generate_content(prompt)
         return self._extract_and_validate_config(response.text)
 
+    def fix_with_runtime_feedback(self, config, max_rounds=3, collect_failures=None):
+        """실제 실행 결과 기반 수정 - 실행해서 실패한 단계만 Gemini 에 보내 해당 부분만 교체
+
+        모든 단계가 성공하거나, max_rounds 를 다 쓰거나, 더 이상 진전이 없으면 종료
+        collect_failures(config) -> 실패 목록 (기본: runtime_feedback.collect_failures)
+        """
+        if collect_failures is None:
+            from runtime_feedback import collect_failures
+        current_config = json.loads(json.dumps(config))
+        file_manager = ConfigFileManager(self.temp_dir)
+        previous = None
+
+        for attempt in range(1, max_rounds + 1):
+            failures = collect_failures(current_config)
+            if not failures:
+                print(f"✅ [{attempt}/{max_rounds}] 실행 성공 - 모든 단계 통과")
+                return current_config
+
+            signature = sorted((f["target_index"], f.get("action_index"), f["stage"], f["error"]) for f in failures)
+            if signature == previous:
+                print(f"⚠️ [{attempt}/{max_rounds}] 이전 수정 후에도 같은 실패 반복 - 중단")
+                break
+            previous = signature
+
+            print(f"🔧 [{attempt}/{max_rounds}] 실행 실패 {len(failures)}건 수정 시도 중...")
+            response = self.model.generate_content(self._runtime_repair_prompt(current_config, failures))
+            applied = self._apply_runtime_fixes(current_config, self._parse_runtime_fixes(response.text))
+            if not applied:
+                print("⚠️ 적용할 수정 사항이 없습니다 - 중단")
+                break
+            file_manager.save_revision(current_config, f"runtime_{attempt}")
+
+        return current_config
+
+    def _runtime_repair_prompt(self, config, failures):
+        """실패한 단계와 주변 DOM 만 포함한 수정 프롬프트 (예산을 넘으면 뒤쪽 실패의 DOM 부터 축소)"""
+        builder = PromptBuilder(self.prompt_budget)
+        builder.add("""웹 자동화 설정을 실제로 실행했더니 아래 단계가 실패했습니다.
+주변 DOM 을 참고해 실패한 단계만 고쳐 주세요. 성공한 단계는 다루지 않습니다.""")
+        for number, failure in enumerate(failures, 1):
+            target = config["targets"][failure["target_index"]]
+            lines = [f"## 실패 {number}: 대상 #{failure['target_index']} ({failure['target']}) - {failure['stage']}",
+                     f"URL: {failure['url']}", f"오류: {failure['error']}"]
+            if failure["stage"] == "wait":
+                lines.append(f"wait_for: {minify_json(target.get('wait_for'))}")
+            if failure.get("action") is not None:
+                lines.append(f"액션 #{failure['action_index']}: {minify_json(failure['action'])}")
+            builder.add("\n".join(lines))
+            dom = failure.get("dom") or {}
+            if dom.get("html"):
+                where = f"'{dom['matched']}' 일치 요소 ({dom['count']}개)" if dom.get("matched") else "body 앞부분"
+                builder.add(f"주변 DOM ({where}): {dom['html']}", priority=-number, squeeze=False)
+
+        builder.add(f"""규칙:
+- 셀렉터 type 은 다음 중 하나: {', '.join(self.valid_selector_types)}
+- 액션 type 은 다음 중 하나: {', '.join(self.valid_action_types)}
+- 실제 DOM 에 있는 id/name/class/속성을 사용하고, 추측한 셀렉터는 쓰지 않습니다
+- 응답은 다음 형식의 JSON 만 (설명 없이):
+{{"fixes":[{{"target_index":0,"action_index":1,"action":{{...교체할 액션 전체...}}}},
+{{"target_index":0,"wait_for":{{"type":"css","value":"...","timeout":10}}}},
+{{"target_index":0,"url":"..."}}]}}""")
+        return self._finish_prompt(builder, "실행 기반 수정")
+
+    def _parse_runtime_fixes(self, raw_text):
+        start, end = raw_text.find("{"), raw_text.rfind("}") + 1
+        if start < 0 or end <= start:
+            return []
+        try:
+            fixes = json.loads(raw_text[start:end]).get("fixes", [])
+        except (ValueError, AttributeError):
+            self._save_failed_json(raw_text[start:end], "수정 응답 파싱 실패", "runtime_fix")
+            return []
+        return [fix for fix in fixes if isinstance(fix, dict)]
+
+    def _apply_runtime_fixes(self, config, fixes):
+        """수정 사항을 설정에 반영 - 적용한 개수 반환 (범위를 벗어난 항목은 무시)"""
+        applied = 0
+        targets = config.get("targets", [])
+        for fix in fixes:
+            target_index = fix.get("target_index")
+            if not isinstance(target_index, int) or not 0 <= target_index < len(targets):
+                continue
+            target = targets[target_index]
+            action_index = fix.get("action_index")
+            if isinstance(fix.get("action"), dict) and isinstance(action_index, int) \
+                    and 0 <= action_index < len(target.get("actions", [])):
+                target["actions"][action_index] = fix["action"]
+                applied += 1
+            if isinstance(fix.get("wait_for"), dict):
+                target["wait_for"] = fix["wait_for"]
+                applied += 1
+            if isinstance(fix.get("url"), str) and fix["url"].startswith(("http://", "https://")):
+                target["url"] = fix["url"]
+                applied += 1
+        return applied
+
     def _create_default_config(self, task_description):
         """안전한 기본 설정 파일 생성"""
         default_config = self.config_template.copy()
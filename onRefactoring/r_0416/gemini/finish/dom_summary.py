@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM 프롬프트용 DOM 요약
+페이지 HTML 전체 대신 필요한 부분만 잘라서 전달
+  - excerpt: 실패한 셀렉터가 가리키려던 위치 주변 HTML (셀렉터를 앞에서부터 줄여 가며 일치하는 조상 요소)
+  - summarize_page / fetch_page_summary: 설정 생성 전 페이지 구조 요약
+    (폼, 입력 필드, 버튼, 반복되는 목록 구조와 각 요소의 후보 셀렉터)
+스크립트/스타일/SVG 를 제거하고, 셀렉터 작성에 필요한 속성만 남긴 뒤 공백을 줄이고 길이 제한
+"""
+
+from cdp_backend import FIND_ELEMENTS_JS
+
+# 셀렉터 작성에 쓸 만한 속성만 유지
+KEEP_ATTRIBUTES = ("id", "class", "name", "type", "role", "placeholder", "aria-label", "title", "href", "value",
+                   "for", "action", "method")
+
+COMPACT_JS = """
+var KEEP = arguments[arguments.length - 1];
+function __crawlerCompact(node, limit) {
+  var clone = node.cloneNode(true);
+  clone.querySelectorAll("script, style, svg, noscript, template, iframe, link, meta").forEach(function (el) { el.remove(); });
+  [clone].concat(Array.from(clone.querySelectorAll("*"))).forEach(function (el) {
+    Array.from(el.attributes).forEach(function (attr) {
+      if (KEEP.indexOf(attr.name) === -1 && attr.name.indexOf("data-") !== 0) el.removeAttribute(attr.name);
+      else if (attr.value.length > 80) el.setAttribute(attr.name, attr.value.slice(0, 80));
+    });
+  });
+  var html = clone.outerHTML.replace(/\\s+/g, " ").replace(/> </g, "><");
+  return html.length > limit ? html.slice(0, limit) + "..." : html;
+}
+"""
+
+EXCERPT_JS = FIND_ELEMENTS_JS + COMPACT_JS + """
+var candidates = arguments[0], limit = arguments[1];
+for (var i = 0; i < candidates.length; i++) {
+  var found;
+  try { found = __crawlerFind(candidates[i][0], candidates[i][1]); } catch (e) { continue; }
+  if (found.length) return {matched: candidates[i][1], count: found.length, html: __crawlerCompact(found[0], limit)};
+}
+return {matched: null, count: 0, html: document.body ? __crawlerCompact(document.body, limit) : ""};
+"""
+
+
+# 페이지 구조 요약 - 화면에 보이는 요소만, 종류별 개수 제한
+SUMMARY_JS = """
+var limits = arguments[0];
+function visible(el) { return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length); }
+function label(el) {
+  var value = el.innerText || el.value || el.getAttribute("aria-label") || el.getAttribute("title") || el.getAttribute("alt") || "";
+  return value.replace(/\\s+/g, " ").trim().slice(0, 40);
+}
+function esc(value) { return window.CSS && CSS.escape ? CSS.escape(value) : value; }
+function unique(selector) { try { return document.querySelectorAll(selector).length === 1; } catch (e) { return false; } }
+function stableClasses(el) {
+  // 상태 표시용/자동 생성 클래스는 셀렉터 후보에서 제외
+  return Array.from(el.classList).filter(function (c) {
+    return c.length < 40 && !/[0-9]{3,}|^(active|on|selected|hover|focus|show|hide|hidden|open)$/.test(c);
+  });
+}
+function shortSelector(el) {
+  var tag = el.tagName.toLowerCase(), classes = stableClasses(el);
+  return classes.length ? tag + "." + esc(classes[0]) : tag;
+}
+function selector(el) {
+  var tag = el.tagName.toLowerCase();
+  if (el.id && !/[0-9]{4,}/.test(el.id) && unique("#" + esc(el.id))) return "#" + esc(el.id);
+  var attrs = ["name", "placeholder", "aria-label", "type"];
+  for (var i = 0; i < attrs.length; i++) {
+    var value = el.getAttribute(attrs[i]);
+    if (value && value.indexOf('"') === -1 && unique(tag + "[" + attrs[i] + '="' + value + '"]')) return tag + "[" + attrs[i] + '="' + value + '"]';
+  }
+  var classes = stableClasses(el);
+  for (var j = 0; j < classes.length; j++) if (unique(tag + "." + esc(classes[j]))) return tag + "." + esc(classes[j]);
+  // id 가 있는 가장 가까운 조상부터 nth-of-type 경로
+  var path = [], node = el;
+  while (node && node.nodeType === 1 && node !== document.body) {
+    if (node !== el && node.id && unique("#" + esc(node.id))) { path.unshift("#" + esc(node.id)); break; }
+    var index = 1, sibling = node;
+    while ((sibling = sibling.previousElementSibling)) if (sibling.tagName === node.tagName) index++;
+    path.unshift(node.tagName.toLowerCase() + ":nth-of-type(" + index + ")");
+    node = node.parentElement;
+  }
+  return path.join(" > ");
+}
+function field(el) {
+  return {selector: selector(el), tag: el.tagName.toLowerCase(), type: el.getAttribute("type") || "",
+          placeholder: el.getAttribute("placeholder") || "",
+          label: el.labels && el.labels.length ? label(el.labels[0]) : (el.getAttribute("aria-label") || "")};
+}
+var FIELDS = "input:not([type=hidden]), select, textarea";
+var BUTTONS = "button, input[type=submit], input[type=button], [role=button]";
+
+var forms = Array.from(document.forms).filter(visible).slice(0, limits.forms).map(function (form) {
+  return {selector: selector(form), action: form.getAttribute("action") || "", method: (form.getAttribute("method") || "get").toLowerCase(),
+          fields: Array.from(form.querySelectorAll(FIELDS)).filter(visible).slice(0, limits.fields).map(field),
+          buttons: Array.from(form.querySelectorAll(BUTTONS)).filter(visible).slice(0, limits.buttons).map(function (el) {
+            return {selector: selector(el), text: label(el)};
+          })};
+});
+var inputs = Array.from(document.querySelectorAll(FIELDS)).filter(function (el) {
+  return !el.form && visible(el);
+}).slice(0, limits.fields).map(field);
+var buttons = Array.from(document.querySelectorAll(BUTTONS)).filter(function (el) {
+  return !el.form && visible(el) && label(el);
+}).slice(0, limits.buttons).map(function (el) { return {selector: selector(el), text: label(el)}; });
+
+// 같은 태그/클래스의 자식이 반복되는 컨테이너 = 목록 (검색 결과, 게시글 등)
+var lists = [];
+Array.from(document.body ? document.body.querySelectorAll("*") : []).forEach(function (container) {
+  if (container.children.length < limits.min_repeat || !visible(container)) return;
+  var groups = {};
+  Array.from(container.children).forEach(function (child) {
+    var key = shortSelector(child);
+    (groups[key] = groups[key] || []).push(child);
+  });
+  Object.keys(groups).forEach(function (key) {
+    var items = groups[key];
+    if (items.length < limits.min_repeat) return;
+    var size = items.reduce(function (total, item) { return total + item.textContent.trim().length; }, 0);
+    if (size / items.length >= 10) lists.push({container: container, key: key, items: items, score: items.length * Math.min(size / items.length, 200)});
+  });
+});
+lists.sort(function (a, b) { return b.score - a.score; });
+var chosen = [];
+lists.forEach(function (list) {
+  if (chosen.length >= limits.lists) return;
+  // 이미 고른 목록 항목 안에 있는 목록은 제외
+  if (chosen.some(function (other) { return other.items.some(function (item) { return item.contains(list.container); }); })) return;
+  chosen.push(list);
+});
+lists = chosen.map(function (list) {
+  var seen = {}, fields = [];
+  Array.from(list.items[0].querySelectorAll("*")).forEach(function (el) {
+    if (fields.length >= limits.list_fields || !visible(el)) return;
+    var own = Array.from(el.childNodes).some(function (node) { return node.nodeType === 3 && node.textContent.trim(); });
+    if (!own && el.tagName !== "A" && el.tagName !== "IMG") return;
+    var key = shortSelector(el);
+    if (seen[key]) return;
+    seen[key] = true;
+    fields.push({selector: key, text: label(el), href: el.tagName === "A"});
+  });
+  return {container: selector(list.container), item: list.key, count: list.items.length, fields: fields};
+});
+return {title: document.title, url: location.href, forms: forms, inputs: inputs, buttons: buttons, lists: lists};
+"""
+
+# 요약 항목 개수 제한 (min_repeat: 목록으로 볼 최소 반복 횟수)
+SUMMARY_LIMITS = {"forms": 3, "fields": 8, "buttons": 8, "lists": 3, "list_fields": 6, "min_repeat": 3}
+
+
+def _split_top_level(value, separators):
+    """괄호/따옴표 밖의 구분자 위치에서 분리 (구분자는 앞 조각에 포함하지 않음)"""
+    parts, depth, quote, current = [], 0, None, ""
+    for char in value:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0 and char in separators:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def ancestor_locators(locator):
+    """실패한 로케이터 -> 점점 넓어지는 로케이터 목록 (자신 포함)"""
+    by, value = locator
+    if by == "css selector":
+        # 여러 셀렉터(,)는 첫 번째만, 자손/자식 결합자 기준으로 앞부분만 남김
+        first = _split_top_level(value, ",")[0].strip()
+        steps = [step for step in _split_top_level(first, " >+~") if step]
+        return list(dict.fromkeys([locator] + [(by, " ".join(steps[:size])) for size in range(len(steps), 0, -1)]))
+    if by == "xpath":
+        steps = _split_top_level(value, "/")
+        candidates = []
+        for size in range(len(steps), 1, -1):
+            prefix = "/".join(steps[:size]).rstrip("/")
+            if prefix and prefix not in ("/", "//"):
+                candidates.append((by, prefix))
+        return list(dict.fromkeys([locator] + candidates))
+    return [locator]
+
+
+def excerpt(driver, locator=None, limit=1500):
+    """셀렉터 주변 HTML 요약 - {"matched": 일치한 (축약) 셀렉터 또는 None, "count": n, "html": ...}
+
+    아무 후보도 일치하지 않으면 body 앞부분
+    """
+    candidates = ancestor_locators(locator) if locator else []
+    try:
+        return driver.execute_script(EXCERPT_JS, [list(candidate) for candidate in candidates], limit,
+                                     list(KEEP_ATTRIBUTES))
+    except Exception as e:
+        return {"matched": None, "count": 0, "html": "", "error": str(e).strip().split("\n")[0]}
+
+
+def summarize_page(driver, limits=None):
+    """현재 페이지 구조 요약 (dict) - 스크립트 실행에 실패하면 None"""
+    try:
+        return driver.execute_script(SUMMARY_JS, dict(SUMMARY_LIMITS, **(limits or {})))
+    except Exception:
+        return None
+
+
+def _describe_field(item):
+    parts = [item["selector"]]
+    if item.get("type"):
+        parts.append(f"type={item['type']}")
+    for key in ("placeholder", "label"):
+        if item.get(key):
+            parts.append(f'{key}="{item[key]}"')
+    return " ".join(parts)
+
+
+def format_summary(summary, max_chars=3000):
+    """요약 dict -> 프롬프트용 텍스트 (중요도 순: 폼 -> 입력/버튼 -> 목록, max_chars 를 넘으면 이후 줄 생략)"""
+    if not summary:
+        return ""
+    lines = [f"페이지: {summary.get('title') or ''} ({summary.get('url')})"]
+    for form in summary.get("forms", []):
+        lines.append(f"[폼] {form['selector']} ({form['method'].upper()} {form['action']})")
+        lines.extend(f"  - 입력 {_describe_field(item)}" for item in form["fields"])
+        lines.extend(f'  - 버튼 {item["selector"]} "{item["text"]}"' for item in form["buttons"])
+    lines.extend(f"[입력] {_describe_field(item)}" for item in summary.get("inputs", []))
+    lines.extend(f'[버튼] {item["selector"]} "{item["text"]}"' for item in summary.get("buttons", []))
+    for item in summary.get("lists", []):
+        lines.append(f"[반복 목록] {item['container']} > {item['item']} x{item['count']}")
+        lines.extend(f'  - {field["selector"]}{" (링크)" if field["href"] else ""} "{field["text"]}"'
+                     for field in item["fields"])
+
+    text = ""
+    for count, line in enumerate(lines):
+        if len(text) + len(line) + 1 > max_chars:
+            return text + f"... ({len(lines) - count}줄 생략)\n"
+        text += line + "\n"
+    return text
+
+
+def fetch_page_summary(url, logger=None, browser=None, max_chars=3000):
+    """URL 을 브라우저로 한 번 열어 구조 요약 텍스트 반환 (실패하면 빈 문자열)
+
+    browser: 브라우저 설정 (기본 web_automation.DEFAULT_CONFIG) - 이미지/폰트/미디어는 차단
+    """
+    import logging
+    import web_automation
+
+    logger = logger or logging.getLogger(__name__)
+    browser_config = dict(web_automation.DEFAULT_CONFIG["browser"], **(browser or {}))
+    browser_config.setdefault("block_resources", ["image", "font", "media"])
+    config = {"browser": browser_config, "timeouts": dict(web_automation.DEFAULT_CONFIG["timeouts"])}
+
+    driver = None
+    try:
+        driver = web_automation.setup_driver(config, logger)
+        driver.set_page_load_timeout(config["timeouts"]["page_load"])
+        driver.get(url)
+        return format_summary(summarize_page(driver), max_chars)
+    except Exception as e:
+        logger.warning("페이지 구조 요약 실패 (%s): %s", url, str(e).strip().split("\n")[0])
+        return ""
+    finally:
+        if driver:
+            web_automation.teardown_driver(driver, logger)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대상(페이지) 단위 요소 캐시
+연속된 액션이 같은 셀렉터를 쓰는 경우(input -> click, 반복 extract) find_element 왕복을 줄임
+  - 키: 로케이터 (By, value)
+  - 무효화: 새 페이지로 이동할 때 새 캐시 생성, DOM 을 바꿀 수 있는 액션 수행 후,
+    캐시된 요소가 stale 이면 (DOM 변경 신호) 다시 찾아서 한 번 더 시도
+  - prefetch: 대상의 첫 DOM 변경 액션까지 필요한 로케이터를 execute_script 한 번으로 탐색
+"""
+
+from cdp_backend import FIND_ELEMENTS_JS
+
+BATCH_FIND_JS = FIND_ELEMENTS_JS + """
+var locators = arguments[0], found = [];
+for (var i = 0; i < locators.length; i++) {
+  try { found.push(__crawlerFind(locators[i][0], locators[i][1])); } catch (e) { found.push(null); }
+}
+return found;
+"""
+
+# 수행 후에도 페이지 DOM 이 그대로라고 볼 수 있는 액션 (그 외 액션 뒤에는 캐시 무효화)
+READ_ONLY_ACTIONS = ("extract", "extract_json", "screenshot", "save_session")
+# 캐시된 요소를 사용하는 액션
+LOOKUP_ACTIONS = ("input", "click", "extract")
+
+
+def mutates_dom(action):
+    if action.type == "input":
+        return bool(action.params.get("submit"))
+    return action.type not in READ_ONLY_ACTIONS
+
+
+class ElementCache:
+    """로케이터 -> 요소 목록 캐시 (WebDriver 요소 핸들 재사용)"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        self._elements.clear()
+
+    def prefetch(self, locators):
+        """여러 로케이터를 스크립트 한 번으로 탐색 - 캐시에 없는 로케이터가 2개 이상일 때만"""
+        pending = list(dict.fromkeys(locator for locator in locators if locator not in self._elements))
+        if len(pending) < 2:
+            return
+        try:
+            found = self.driver.execute_script(BATCH_FIND_JS, [list(locator) for locator in pending])
+        except Exception:
+            # 스크립트 실행이 막힌 페이지(CSP 등)는 개별 탐색으로 처리
+            return
+        for locator, elements in zip(pending, found or []):
+            # 찾지 못한 로케이터는 캐시하지 않음 (나중에 나타날 수 있으므로 액션 시점에 다시 탐색)
+            if elements:
+                self._elements[locator] = list(elements)
+
+    def find_all(self, locator):
+        elements = self._elements.get(locator)
+        if elements is not None:
+            self.hits += 1
+            return elements
+        self.misses += 1
+        elements = self.driver.find_elements(*locator)
+        if elements:
+            self._elements[locator] = elements
+        return elements
+
+    def find(self, locator):
+        elements = self._elements.get(locator)
+        if elements:
+            self.hits += 1
+            return elements[0]
+        self.misses += 1
+        element = self.driver.find_element(*locator)
+        self._elements[locator] = [element]
+        return element
+
+    def use(self, locator, operation, many=False):
+        """operation(요소 또는 요소 목록) 실행 - 캐시된 요소가 stale 이면 다시 찾아 한 번 재시도"""
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        lookup = self.find_all if many else self.find
+        try:
+            return operation(lookup(locator))
+        except StaleElementReferenceException:
+            self._elements.pop(locator, None)
+            return operation(lookup(locator))
+
+    def after_action(self, action):
+        if mutates_dom(action):
+            self.invalidate()
+
+
+def prefetch_locators(actions, locator_of=None):
+    """첫 DOM 변경 액션(포함)까지 요소를 찾는 액션들의 로케이터 (locator_of: 액션 -> 먼저 시도할 로케이터)"""
+    locators = []
+    for action in actions:
+        if action.type in LOOKUP_ACTIONS and action.locator is not None and not action.error:
+            locators.append(locator_of(action) if locator_of else action.locator)
+        if mutates_dom(action):
+            break
+    return locators
@@ -6,7 +6,7 @@ class EnhancedSafeFormatter(string.Formatter):
         # 허용된 포맷 키
         self.valid_keys = {
             "task_description", "config_template",
-            "valid_selector_types", "valid_action_types"
+            "valid_selector_types", "valid_action_types", "page_summary"
         }
 
     def get_value(self, key, args, kwargs):
@@ -152,7 +152,8 @@ class EnhancedSafeFormatter(string.Formatter):
             "task_description",
             "config_template",
             "valid_selector_types",
-            "valid_action_types"
+            "valid_action_types",
+            "page_summary"
         ]
 
         # 정규 표현식으로 유효하지 않은 중괄호만 이스케이프
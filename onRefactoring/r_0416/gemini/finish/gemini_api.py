@@ -1,74 +1,101 @@
-class GeminiApi:
-    load_dotenv()
-    self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-    self.max_retries = max_retries
-    self.task_description = ""
-    self.verbose = verbose
-    self.temp_dir = temp_dir or os.getcwd()
-    self.safe_formatter = EnhancedSafeFormatter()
-    self.user_url = None
-    # 로깅 설정
-    self._setup_logging()
-
-    # 기본 프롬프트 템플릿 설정
-    self.default_prompt_template = """
-        다음 작업 설명을 바탕으로 Selenium 웹 자동화 설정 파일을 JSON 형식으로 생성해주세요.
-
-        작업 설명: {task_description}
-
-        생성할 설정 파일은 다음 조건을 반드시 충족해야 합니다:
-        1. 다양한 웹사이트에 사용할 수 있는 범용적인 구조를 가져야 합니다.
-        2. 사이트 방문, 정보 검색, 데이터 추출, 스크린샷 촬영 등의 기본적인 기능을 포함해야 합니다.
-        3. 검색 기능을 사용할 경우 적절한 입력 필드와 검색 버튼을 찾을 수 있어야 합니다.
-        4. 결과 데이터를 정확히 추출할 수 있도록 구체적인 셀렉터가 정의되어야 합니다.
-        5. 페이지 로딩 시간을 고려한 적절한 대기 시간이 설정되어야 합니다.
-
-        응답은 반드시: 
-        - 유효한 JSON 형식이어야 합니다 (주석 없음)
-        - 모든 속성명은 따옴표로 감싸야 합니다
-        - 특수 문자나 제어 문자는 이스케이프 처리해야 합니다
-        """
-
-    if not self.api_key:
-        raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
-
-    genai.configure(api_key=self.api_key)
-
-    # 지원되는 모델로 변경
-    self.model = genai.GenerativeModel('gemini-1.5-flash')
-
-    self.config_template = {
-        "targetUrl": "https://example.com",
-        "browser": {
-            "type": "chrome",
-            "headless": True
-        },
-        "timeouts": {"implicit": 10},
-        "output": {"format": "json"},
-        "targets": [
-            {
-                "name": "기본 작업",
-                "url": "https://example.com",
-                "actions": []
-            }
-        ],
-        "selectors": {},
-        "actions": []
-    }
-
-    # 유효한 셀렉터 타입 목록
-    self.valid_selector_types = [
-        "id", "css", "xpath", "class_name", "tag_name", "name", "link_text", "partial_link_text"
-    ]
-
-    # 유효한 액션 타입 목록
-    self.valid_action_types = [
-        "screenshot", "input", "click", "wait", "extract", "scroll"
-    ]
+import os
+import re
+
+from dotenv import load_dotenv
+
+from format_checker import EnhancedSafeFormatter
+from prompt_builder import DEFAULT_PROMPT_TOKEN_BUDGET, PromptBudgetMixin, PromptBuilder, compact_template, minify_json
+
+
+class GeminiApi(PromptBudgetMixin):
+    def __init__(self, api_key=None, max_retries=5, verbose=False, temp_dir=None, page_summary=True,
+                 prompt_budget=None):
+        load_dotenv()
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.max_retries = max_retries
+        self.task_description = ""
+        self.verbose = verbose
+        self.temp_dir = temp_dir or os.getcwd()
+        self.safe_formatter = EnhancedSafeFormatter()
+        self.user_url = None
+        # 생성 전에 대상 페이지를 한 번 열어 구조 요약을 프롬프트에 포함 (실제 셀렉터 사용 유도)
+        self.page_summary_enabled = page_summary
+        self.page_summary_chars = 3000
+        self.page_summary = ""
+        # 프롬프트 토큰 예산 - 넘으면 페이지 요약/컨텍스트 등 우선순위 낮은 섹션부터 축소
+        self.prompt_budget = prompt_budget or int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET))
+        # 로깅 설정
+        self._setup_logging()
+
+        # 기본 프롬프트 템플릿 설정
+        self.default_prompt_template = """
+            다음 작업 설명을 바탕으로 Selenium 웹 자동화 설정 파일을 JSON 형식으로 생성해주세요.
+
+            작업 설명: {task_description}
+
+            생성할 설정 파일은 다음 조건을 반드시 충족해야 합니다:
+            1. 다양한 웹사이트에 사용할 수 있는 범용적인 구조를 가져야 합니다.
+            2. 사이트 방문, 정보 검색, 데이터 추출, 스크린샷 촬영 등의 기본적인 기능을 포함해야 합니다.
+            3. 검색 기능을 사용할 경우 적절한 입력 필드와 검색 버튼을 찾을 수 있어야 합니다.
+            4. 결과 데이터를 정확히 추출할 수 있도록 구체적인 셀렉터가 정의되어야 합니다.
+            5. 페이지 로딩 시간을 고려한 적절한 대기 시간이 설정되어야 합니다.
+
+            응답은 반드시: 
+            - 유효한 JSON 형식이어야 합니다 (주석 없음)
+            - 모든 속성명은 따옴표로 감싸야 합니다
+            - 특수 문자나 제어 문자는 이스케이프 처리해야 합니다
+            """
+
+        # Gemini 모델은 실제 API 호출이 필요할 때 초기화 (검증 전용 경로는 import 비용 없음)
+        self._model = None
+
+        self.config_template = {
+            "targetUrl": "https://example.com",
+            "browser": {
+                "type": "chrome",
+                "headless": True
+            },
+            "timeouts": {"implicit": 10},
+            "output": {"format": "json"},
+            "targets": [
+                {
+                    "name": "기본 작업",
+                    "url": "https://example.com",
+                    "actions": []
+                }
+            ],
+            "selectors": {},
+            "actions": []
+        }
 
+        # 유효한 셀렉터 타입 목록
+        self.valid_selector_types = [
+            "id", "css", "xpath", "class_name", "tag_name", "name", "link_text", "partial_link_text"
+        ]
+
+        # 유효한 액션 타입 목록
+        self.valid_action_types = [
+            "screenshot", "input", "click", "wait", "extract", "scroll"
+        ]
+
+    @property
+    def model(self):
+        """Gemini 모델 (처음 사용할 때 google.generativeai import 및 설정)"""
+        if self._model is None:
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
+
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+
+            # 지원되는 모델로 변경
+            self._model = genai.GenerativeModel('gemini-1.5-flash')
+        return self._model
 
     def generate_config(self, task_description, custom_prompt=None, user_url=None):
         """유효한 설정 파일을 생성할 때까지 반복 시도"""
+        # API 키 누락은 기본 설정으로 대체하지 않고 바로 오류 처리
+        self.model
 
         self.user_url = self._fix_url(user_url) if user_url else None
 
@@ -79,6 +106,9 @@ class GeminiApi:
 
         self.task_description = task_description
 
+        # 페이지 요약은 재시도마다 다시 수집하지 않고 한 번만
+        self.page_summary = self._load_page_summary(task_description)
+
         for attempt in range(self.max_retries):
             print(f"설정 파일 생성 시도 중... (시도 {attempt + 1}/{self.max_retries})")
 
@@ -160,11 +190,12 @@ class GeminiApi:
                 if self.user_url:
                     url_context = f"\n대상 사이트 URL: {self.user_url}\n"
 
-                prompt += f"""
+                builder = PromptBuilder(self.prompt_budget).add(prompt)
+                builder.add(f"""
     
     
                     설정 파일 구조는 다음과 같아야 합니다:
-                    {json.dumps(self.config_template, indent=2, ensure_ascii=False)}
+                    {minify_json(compact_template(self.config_template))}
     
                     중요한 주의사항:
                     1. targets 배열에는 최소 1개 이상의 작업 단계를 포함해야 합니다
@@ -175,7 +206,9 @@ class GeminiApi:
                         - 각 selector의 "type"은 다음 중 하나여야 합니다: {', '.join(self.valid_selector_types)}
                     4. 각 액션 타입은 다음 중 하나여야 합니다: {', '.join(self.valid_action_types)}
                     5. 웹사이트 특성에 맞게 적절한 셀렉터와 대기 시간을 설정해야 합니다
-                    """
+                    """)
+                builder.add(self._page_summary_section(), priority=1, squeeze=False)
+                prompt = self._finish_prompt(builder, "설정 생성")
             else:
                 # 사용자 정의 프롬프트 처리
                 try:
@@ -185,15 +218,21 @@ class GeminiApi:
                     # 2. 포맷 변수 준비
                     format_vars = {
                         "task_description": task_description,
-                        "config_template": json.dumps(self.config_template, indent=2, ensure_ascii=False),
+                        "config_template": minify_json(compact_template(self.config_template)),
                         "valid_selector_types": ", ".join(self.valid_selector_types),
                         "valid_action_types": ", ".join(self.valid_action_types),
-                        "current_date": datetime.now().strftime('%Y-%m-%d')
+                        "current_date": datetime.now().strftime('%Y-%m-%d'),
+                        "page_summary": self.page_summary
                     }
 
                     # 3. 향상된 안전 포맷터 사용
                     formatter = EnhancedSafeFormatter()
                     prompt = formatter.format(custom_prompt, **format_vars)
+                    builder = PromptBuilder(self.prompt_budget).add(prompt, squeeze=False)
+                    # 프롬프트에 {page_summary} 자리가 없으면 끝에 덧붙임
+                    if "{page_summary}" not in custom_prompt:
+                        builder.add(self._page_summary_section(), priority=1, squeeze=False)
+                    prompt = self._finish_prompt(builder, "사용자 정의")
 
                 except Exception as e:
                     # 내부 try-except 블록: 프롬프트 포맷팅 오류 처리
@@ -337,16 +376,15 @@ class GeminiApi:
         url_info = f'\n반드시 "targetUrl": "{self.user_url}" 필드를 포함해야 합니다.' if self.user_url else ''
 
         """Gemini API를 사용하여 잘못된 JSON 수정 시도"""
-        prompt = f"""
+        builder = PromptBuilder(self.prompt_budget)
+        builder.add(f"""
         다음은 잘못된 형식의 JSON 문자열입니다. 이를 올바른 Selenium 자동화 설정 JSON으로 수정해주세요.
 
-        {url_info}  
-
-        잘못된 JSON:
-        ```
-        {invalid_json}
-        ```
-
+        {url_info}
+        """)
+        # 잘못된 JSON 은 들여쓰기를 제거해 넣고, 예산을 넘으면 뒷부분부터 잘라냄
+        builder.add(f"잘못된 JSON:\n{invalid_json}", priority=0)
+        builder.add(f"""
         수정된 JSON은 다음 필수 요구사항을 충족해야 합니다:
         1. 모든 문자열은 큰따옴표로 묶여야 합니다.
         2. 객체의 키 이름은 큰따옴표로 묶여야 합니다.
@@ -373,7 +411,8 @@ class GeminiApi:
             }}
         ]
         }}
-        """
+        """)
+        prompt = self._finish_prompt(builder, "JSON 수정")
 
         try:
             if hasattr(self, 'logger'):
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+브라우저 상태 감시 + 드라이버 재생성
+대상 처리 사이마다 드라이버를 점검하고, 임계값을 넘거나 응답이 없으면 새 드라이버로 교체
+  - 메모리: 드라이버 서비스와 하위 브라우저 프로세스 전체의 RSS 합계 (psutil)
+  - 충돌/무응답: 간단한 스크립트 실행이 실패(탭 충돌, 세션 종료)하거나 제한 시간 안에 끝나지 않음
+  - 수명: 처리한 대상 수 / 드라이버 생성 후 경과 시간
+
+설정 (browser.health):
+  {"max_rss_mb": 2048, "max_targets": 0, "max_age": 0, "response_timeout": 10, "preserve_session": false}
+  0 이면 해당 검사를 사용하지 않음. preserve_session 이 true 면 정상 상태에서 교체할 때
+  쿠키/localStorage 를 새 드라이버로 옮김 (충돌로 교체할 때는 옮길 수 없음)
+"""
+
+import time
+import threading
+from urllib.parse import urlparse
+
+import session_store
+
+DEFAULT_HEALTH = {
+    "max_rss_mb": 2048,
+    "max_targets": 0,
+    "max_age": 0,
+    "response_timeout": 10,
+    "preserve_session": False,
+}
+
+
+def driver_rss_mb(driver):
+    """드라이버 서비스 프로세스와 모든 하위 프로세스의 RSS 합계(MB) - 측정 불가면 None"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(process.pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return None
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+def ping(driver, timeout):
+    """스크립트 왕복 확인 - 정상이면 None, 아니면 실패 사유"""
+    outcome = {}
+
+    def probe():
+        try:
+            driver.execute_script("return 1;")
+            outcome["ok"] = True
+        except Exception as e:
+            outcome["error"] = e
+
+    # 멈춘 렌더러는 명령이 반환되지 않으므로 별도 스레드에서 제한 시간만 기다림
+    thread = threading.Thread(target=probe, name="health-ping", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return f"{timeout}초 동안 응답 없음"
+    if "error" in outcome:
+        lines = str(outcome["error"]).strip().splitlines()
+        return f"브라우저 오류 ({lines[0] if lines else type(outcome['error']).__name__})"
+    return None
+
+
+def count_targets(driver, count=1):
+    """드라이버가 처리한 대상 수 누적 (max_targets 검사용)"""
+    driver.health_targets = getattr(driver, "health_targets", 0) + count
+
+
+class HealthMonitor:
+    """드라이버 점검 후 필요하면 setup_driver/teardown_driver 로 교체
+
+    driver: 현재 사용 중인 드라이버 - 교체 중 새 드라이버 생성에 실패하면 None
+    (호출한 쪽은 정리할 때 자신이 가진 참조 대신 이 값을 사용 - 이미 종료한 드라이버를 다시 종료하지 않도록)
+    """
+
+    def __init__(self, config, setup_driver, teardown_driver, logger):
+        self.config = config
+        self.settings = dict(DEFAULT_HEALTH, **config.get("browser", {}).get("health", {}))
+        self.setup_driver = setup_driver
+        self.teardown_driver = teardown_driver
+        self.logger = logger
+        self.recycled = 0
+        self.driver = None
+
+    def track(self, driver):
+        """새 드라이버의 수명 기록 시작"""
+        self.driver = driver
+        if driver is not None:
+            driver.health_started = time.monotonic()
+            driver.health_targets = 0
+        return driver
+
+    def diagnose(self, driver):
+        """교체가 필요하면 (사유, 응답 여부), 아니면 (None, True)"""
+        settings = self.settings
+        failure = ping(driver, settings["response_timeout"])
+        if failure:
+            return failure, False
+
+        targets = getattr(driver, "health_targets", 0)
+        if settings["max_targets"] and targets >= settings["max_targets"]:
+            return f"처리 대상 {targets}개 도달", True
+        if not hasattr(driver, "health_started"):
+            # track 없이 생성된 드라이버(드라이버 풀 등)는 처음 점검한 시각부터 수명 계산
+            driver.health_started = time.monotonic()
+        if settings["max_age"] and time.monotonic() - driver.health_started >= settings["max_age"]:
+            return f"드라이버 수명 {settings['max_age']}초 경과", True
+        if settings["max_rss_mb"]:
+            rss = driver_rss_mb(driver)
+            if rss is not None:
+                self.logger.debug("브라우저 메모리: %.0fMB", rss)
+                if rss >= settings["max_rss_mb"]:
+                    return f"메모리 {rss:.0f}MB (한도 {settings['max_rss_mb']}MB)", True
+        return None, True
+
+    def after_target(self, driver, count=1):
+        """대상 count 개를 처리한 뒤 호출 - 계속 사용할 드라이버 반환 (교체했으면 새 드라이버)"""
+        if driver is None:
+            return driver
+        count_targets(driver, count)
+        reason, responsive = self.diagnose(driver)
+        if reason is None:
+            return driver
+        return self.recycle(driver, reason, responsive)
+
+    def recycle(self, driver, reason, responsive=True):
+        self.logger.warning("드라이버 교체: %s", reason)
+        state = None
+        if responsive and self.settings["preserve_session"]:
+            try:
+                state = session_store.capture_state(driver)
+            except Exception as e:
+                self.logger.warning("세션 상태 저장 실패 - 새 세션으로 시작: %s", e)
+        self.teardown_driver(driver, self.logger)
+        self.driver = None
+
+        new_driver = self.track(self.setup_driver(self.config, self.logger))
+        self.recycled += 1
+        if state and urlparse(state["origin"]).scheme in ("http", "https"):
+            try:
+                session_store.restore_session(new_driver, state)
+                self.logger.info("세션 상태 복원 완료: %s (쿠키 %d개)", state["origin"], len(state["cookies"]))
+            except Exception as e:
+                self.logger.warning("세션 상태 복원 실패: %s", e)
+        return new_driver
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대상 URL 조건부 요청 캐시
+브라우저로 열기 전에 urllib 로 ETag/Last-Modified 조건부 요청을 보내고, 304 이거나
+본문 해시가 직전과 같으면 브라우저 처리를 건너뛰고 직전 추출 결과를 그대로 사용
+
+사용: 대상에 "conditional_fetch": true 또는 output.conditional_fetch: true
+  - 정적 HTML 로 결과가 결정되는 액션(extract/wait/scroll)만으로 구성된 대상에만 적용
+    스크린샷은 HTML 이 같아도 CSS/이미지/스크립트에 따라 화면이 달라질 수 있으므로 제외
+    입력/클릭, XHR 응답 수집(capture_network/extract_json), 세션(load_session/save_session) 을
+    쓰는 대상은 결과가 URL 의 HTML 만으로 결정되지 않고, urllib 요청에는 브라우저 쿠키가 없어
+    로그인 후 페이지와 다른 페이지를 검증하게 되므로 제외
+  - 캐시: <results_dir>/.http_cache/<URL 해시>.json
+"""
+
+import json
+import hashlib
+import urllib.request
+import urllib.error
+from datetime import datetime
+
+CACHE_DIR = ".http_cache"
+# 결과가 대상 URL 의 HTML 만으로 결정되는 액션 (그 외 액션이 하나라도 있으면 캐시하지 않음)
+STATIC_ACTIONS = ("extract", "wait", "scroll")
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+
+def cacheable(target):
+    """조건부 요청으로 건너뛸 수 있는 대상인지 (정적 추출 액션만 있는 대상)"""
+    return all(action.type in STATIC_ACTIONS for action in target.actions)
+
+
+def _cache_path(writer, url):
+    return writer.path("results_dir", f"{CACHE_DIR}/{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json")
+
+
+def conditional_fetch(writer, url, timeout=10, logger=None):
+    """조건부 요청 - (변경 없음 여부, 직전 캐시 항목, 새 검증 정보)
+
+    네트워크 오류 시에는 변경된 것으로 간주해 평소처럼 브라우저로 처리
+    """
+    entry = None
+    text = writer.read(_cache_path(writer, url))
+    if text:
+        try:
+            entry = json.loads(text)
+        except json.JSONDecodeError:
+            entry = None
+
+    headers = {"User-Agent": USER_AGENT}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            body = response.read()
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": hashlib.sha256(body).hexdigest(),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry:
+            return True, entry, {key: entry.get(key) for key in ("etag", "last_modified", "content_hash")}
+        if logger:
+            logger.debug("조건부 요청 실패 (%s): %s", e.code, url)
+        return False, entry, None
+    except (urllib.error.URLError, OSError) as e:
+        if logger:
+            logger.debug("조건부 요청 실패: %s - %s", url, e)
+        return False, entry, None
+
+    unchanged = bool(entry) and entry.get("content_hash") == validators["content_hash"]
+    return unchanged, entry, validators
+
+
+def store_fetch(writer, url, validators, outputs):
+    """대상 처리 성공 후 검증 정보와 액션 결과 저장 (writer flush 시 기록)"""
+    if not validators:
+        return
+    writer.write(_cache_path(writer, url), json.dumps(
+        dict(validators, url=url, outputs=outputs, time=datetime.now().isoformat(timespec="seconds")),
+        ensure_ascii=False, default=str,
+    ))
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대상(target) 단위 작업 큐
+여러 워커가 같은 큐에서 작업을 임대(lease)해 처리하고 결과를 보고
+  - SqliteJobQueue: 로컬 디스크의 SQLite 파일 기반 (기본) - 같은 호스트의 워커 프로세스 전용
+    WAL 모드는 공유 메모리를 사용하므로 NFS/SMB 같은 네트워크 파일시스템에서는 안전하지 않음
+  - RedisJobQueue: Redis 호환 서버 기반 - 여러 머신의 워커가 함께 쓰는 경우 사용
+    (redis-py 호환 클라이언트 객체면 무엇이든 사용 가능, 서버는 EVAL(Lua 스크립트)을 지원해야 함 -
+     지원하지 않는 호환 서버면 큐 생성 시 RuntimeError)
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# 시도 횟수를 모두 소진한 작업의 결과
+EXHAUSTED_RESULT = {"error": "최대 시도 횟수 초과"}
+
+
+class LeaseLost(Exception):
+    """처리 중 임대가 만료되어 다른 워커가 작업을 가져감 - 이 워커의 결과는 반영하지 않음"""
+
+
+def build_jobs(config, source=None):
+    """설정 파일을 대상별 작업 목록으로 분할"""
+    base_config = {key: value for key, value in config.items() if key != "targets"}
+    jobs = []
+    for index, target in enumerate(config.get("targets", [])):
+        jobs.append({
+            "source": source,
+            "target_index": index,
+            "config": base_config,
+            "target": target,
+        })
+    return jobs
+
+
+class SqliteJobQueue:
+    """SQLite 파일 기반 작업 큐 (visibility timeout 방식 임대)
+
+    단일 호스트 전용 - path 는 로컬 디스크여야 함 (여러 머신은 RedisJobQueue)
+    """
+
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        queue_dir = os.path.dirname(path)
+        if queue_dir:
+            os.makedirs(queue_dir, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        # WAL: 같은 호스트의 워커끼리 읽기/쓰기가 서로 막지 않도록 (네트워크 파일시스템 미지원)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL,
+                worker TEXT,
+                result TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_until)")
+
+    def enqueue(self, payload):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO jobs (id, payload, status, created, updated) VALUES (?, ?, ?, ?, ?)",
+            (job_id, json.dumps(payload, ensure_ascii=False), PENDING, now, now),
+        )
+        return job_id
+
+    def lease(self, worker, visibility_timeout=600):
+        """대기 중이거나 임대가 만료된 작업 하나를 임대 - 없으면 None
+
+        마지막 시도에서 임대가 만료된 작업(워커가 죽음)은 다시 임대할 수 없으므로 실패로 종료
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                """UPDATE jobs SET status = ?, lease_until = NULL, result = ?, updated = ?
+                   WHERE status = ? AND lease_until < ? AND attempts >= ?""",
+                (FAILED, json.dumps(EXHAUSTED_RESULT, ensure_ascii=False), now, LEASED, now, self.max_attempts),
+            )
+            row = self._conn.execute(
+                """SELECT id, payload, attempts FROM jobs
+                   WHERE (status = ? OR (status = ? AND lease_until < ?)) AND attempts < ?
+                   ORDER BY created LIMIT 1""",
+                (PENDING, LEASED, now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            job_id, payload, attempts = row
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, lease_until = ?, worker = ?, attempts = ?, updated = ? WHERE id = ?",
+                (LEASED, now + visibility_timeout, worker, attempts + 1, now, job_id),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return {"id": job_id, "payload": json.loads(payload), "attempts": attempts + 1}
+
+    def extend(self, job_id, worker, visibility_timeout=600):
+        """처리 중인 작업의 임대 연장 (heartbeat) - 임대를 잃었으면 False"""
+        now = time.time()
+        cursor = self._conn.execute(
+            "UPDATE jobs SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND status = ?",
+            (now + visibility_timeout, now, job_id, worker, LEASED),
+        )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id, worker, result):
+        return self._finish(job_id, worker, DONE, result)
+
+    def fail(self, job_id, worker, result, retry=True):
+        """실패 보고 - retry 이면 다시 대기열로, 아니면 실패로 종료
+
+        임대가 만료되어 다른 워커에게 넘어간 작업이면 아무것도 바꾸지 않고 False
+        """
+        if retry:
+            # 시도 횟수를 모두 소진한 작업은 실패로 종료
+            cursor = self._conn.execute(
+                """UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                   lease_until = NULL, result = ?, updated = ? WHERE id = ? AND worker = ? AND status = ?""",
+                (self.max_attempts, FAILED, PENDING,
+                 json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker, LEASED),
+            )
+            return cursor.rowcount > 0
+        return self._finish(job_id, worker, FAILED, result)
+
+    def _finish(self, job_id, worker, status, result):
+        cursor = self._conn.execute(
+            """UPDATE jobs SET status = ?, lease_until = NULL, result = ?, updated = ?
+               WHERE id = ? AND worker = ? AND status = ?""",
+            (status, json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker, LEASED),
+        )
+        return cursor.rowcount > 0
+
+    def results(self):
+        rows = self._conn.execute("SELECT id, status, worker, result FROM jobs ORDER BY created").fetchall()
+        return [
+            {"id": job_id, "status": status, "worker": worker, "result": json.loads(result) if result else None}
+            for job_id, status, worker, result in rows
+        ]
+
+    def close(self):
+        self._conn.close()
+
+
+# KEYS: pending, leases, attempts, jobs, results, owners / ARGV: now, lease_until, max_attempts, exhausted_result, worker
+LEASE_SCRIPT = """
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], 0, ARGV[1])) do
+  redis.call('ZREM', KEYS[2], id)
+  redis.call('HDEL', KEYS[6], id)
+  redis.call('LPUSH', KEYS[1], id)
+end
+while true do
+  local id = redis.call('RPOP', KEYS[1])
+  if not id then return false end
+  local attempts = redis.call('HINCRBY', KEYS[3], id, 1)
+  if attempts > tonumber(ARGV[3]) then
+    redis.call('HSET', KEYS[5], id, ARGV[4])
+  else
+    local payload = redis.call('HGET', KEYS[4], id)
+    if payload then
+      redis.call('ZADD', KEYS[2], ARGV[2], id)
+      redis.call('HSET', KEYS[6], id, ARGV[5])
+      return {id, payload, attempts}
+    end
+  end
+end
+"""
+
+# 임대를 가진 워커만 결과 보고 - KEYS: leases, owners, results, pending / ARGV: id, worker, result, requeue
+FINISH_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] or not redis.call('ZSCORE', KEYS[1], ARGV[1]) then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+if ARGV[4] == '1' then redis.call('LPUSH', KEYS[4], ARGV[1]) end
+return 1
+"""
+
+# KEYS: leases, owners / ARGV: id, worker, lease_until
+EXTEND_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] or not redis.call('ZSCORE', KEYS[1], ARGV[1]) then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+
+class RedisJobQueue:
+    """Redis 호환 서버 기반 작업 큐 (임대는 Lua 스크립트로 원자적으로 처리 - EVAL 지원 서버 필요)
+
+    EVAL 을 지원하지 않는 서버면 생성 시 RuntimeError (작업을 임대한 뒤에야 실패하지 않도록)
+
+    키 구성 (name 접두사):
+      {name}:pending  - 대기 작업 ID 리스트
+      {name}:leases   - 임대 중 작업 ID -> 만료 시각 (sorted set)
+      {name}:owners   - 임대 중 작업 ID -> 워커
+      {name}:jobs     - 작업 ID -> payload
+      {name}:attempts - 작업 ID -> 임대 횟수
+      {name}:results  - 작업 ID -> 결과
+    """
+
+    def __init__(self, client, name="crawler", max_attempts=3):
+        self.client = client
+        self.name = name
+        self.max_attempts = max_attempts
+        try:
+            client.eval("return 1", 0)
+        except Exception as e:
+            raise RuntimeError(f"Redis 큐에는 EVAL(Lua 스크립트)을 지원하는 서버가 필요합니다: {e}") from e
+
+    def _key(self, suffix):
+        return f"{self.name}:{suffix}"
+
+    def enqueue(self, payload):
+        job_id = uuid.uuid4().hex
+        self.client.hset(self._key("jobs"), job_id, json.dumps(payload, ensure_ascii=False))
+        self.client.lpush(self._key("pending"), job_id)
+        return job_id
+
+    def lease(self, worker, visibility_timeout=600):
+        # 만료 임대 복귀 + 꺼내기 + 임대 등록을 스크립트 하나로 원자적으로 처리
+        # (rpop 과 zadd 사이에 워커가 죽어도 작업이 대기열/임대 어느 쪽에서도 사라지지 않도록)
+        now = time.time()
+        exhausted = json.dumps({"status": FAILED, "result": EXHAUSTED_RESULT}, ensure_ascii=False)
+        leased = self.client.eval(
+            LEASE_SCRIPT, 6,
+            self._key("pending"), self._key("leases"), self._key("attempts"), self._key("jobs"), self._key("results"),
+            self._key("owners"), now, now + visibility_timeout, self.max_attempts, exhausted, worker,
+        )
+        if not leased:
+            return None
+        job_id, payload, attempts = (
+            value.decode("utf-8") if isinstance(value, bytes) else value for value in leased
+        )
+        return {"id": job_id, "payload": json.loads(payload), "attempts": int(attempts), "worker": worker}
+
+    def extend(self, job_id, worker, visibility_timeout=600):
+        return bool(self.client.eval(EXTEND_SCRIPT, 2, self._key("leases"), self._key("owners"),
+                                     job_id, worker, time.time() + visibility_timeout))
+
+    def complete(self, job_id, worker, result):
+        return self._finish(job_id, worker, DONE, result)
+
+    def fail(self, job_id, worker, result, retry=True):
+        # 재시도는 결과에 대기 상태를 남기고 대기열로 복귀 (시도 횟수 초과는 다음 임대 시 실패 처리)
+        return self._finish(job_id, worker, PENDING if retry else FAILED, result, requeue=retry)
+
+    def _finish(self, job_id, worker, status, result, requeue=False):
+        return bool(self.client.eval(
+            FINISH_SCRIPT, 4, self._key("leases"), self._key("owners"), self._key("results"), self._key("pending"),
+            job_id, worker, json.dumps({"status": status, "result": result}, ensure_ascii=False, default=str),
+            "1" if requeue else "0",
+        ))
+
+    def results(self):
+        entries = []
+        for job_id, value in self.client.hgetall(self._key("results")).items():
+            if isinstance(job_id, bytes):
+                job_id = job_id.decode("utf-8")
+            data = json.loads(value)
+            entries.append({"id": job_id, "status": data["status"], "result": data["result"]})
+        return entries
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+def open_queue(url, max_attempts=3):
+    """큐 URL 로 백엔드 생성
+
+    - sqlite:///path/to/queue.db 또는 파일 경로: SqliteJobQueue
+    - redis://host:port/db[#name]: RedisJobQueue (redis 패키지 필요)
+    """
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Redis 큐를 사용하려면 redis 패키지가 필요합니다: pip install redis")
+        address, _, name = url.partition("#")
+        return RedisJobQueue(redis.Redis.from_url(address), name or "crawler", max_attempts)
+
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SqliteJobQueue(url, max_attempts)
+
+
+class JobResultCollector:
+    """process_target 의 체크포인트 인터페이스를 이용해 액션 결과 수집 + 임대 연장
+
+    임대 연장에 실패하면 LeaseLost 를 발생시켜 대상 처리를 중단 (다른 워커의 결과와 겹치지 않도록)
+    """
+
+    def __init__(self, job_queue, job_id, worker, visibility_timeout):
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.worker = worker
+        self.visibility_timeout = visibility_timeout
+        self.outputs = {}
+
+    def record_action(self, key, action_index, output):
+        if not self.job_queue.extend(self.job_id, self.worker, self.visibility_timeout):
+            raise LeaseLost(f"작업 임대 만료: {self.job_id}")
+        self.outputs[action_index] = output
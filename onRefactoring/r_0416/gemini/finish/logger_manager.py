@@ -1,24 +1,144 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import socket
+import logging
+import logging.handlers
+import uuid
+from datetime import datetime
+
+# 구조화 로그(JSON lines)에 포함되는 컨텍스트 필드
+STRUCTURED_FIELDS = ("run_id", "worker", "target", "action_index", "duration")
+
+
+class RunContextFilter(logging.Filter):
+    """모든 로그 레코드에 실행 ID / 워커 정보 주입"""
+
+    def __init__(self, run_id, worker):
+        super().__init__()
+        self.run_id = run_id
+        self.worker = worker
+
+    def filter(self, record):
+        if not hasattr(record, "run_id"):
+            record.run_id = self.run_id
+        if not hasattr(record, "worker"):
+            record.worker = self.worker
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄짜리 JSON 으로 변환"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """메시지만 미리 확정하고 예외 정보는 별도 필드로 유지하는 QueueHandler"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class LoggerManager:
 
+    # 비동기 로깅용 QueueListener (프로세스당 1개)
+    _listener = None
+    _atexit_registered = False
+
     def setup_logging(config):
-        """로깅 설정"""
-        log_level = getattr(logging, config["output"].get("log_level", "INFO"))
-        log_dir = config["output"].get("logs_dir", "logs")
+        """로깅 설정
+
+        output 설정:
+          - log_format: "text"(기본) 또는 "json" (구조화 JSON lines)
+          - log_async: true(기본) 이면 QueueHandler/QueueListener 로 파일 I/O 를 별도 스레드에서 처리
+          - log_max_bytes / log_backup_count: 0 보다 크면 크기 기준 로그 로테이션
+          - run_id / worker_id: 구조화 로그에 기록할 실행 ID / 워커 이름 (미지정 시 자동 생성)
+        """
+        output_config = config["output"]
+        log_level = getattr(logging, output_config.get("log_level", "INFO"))
+        log_dir = output_config.get("logs_dir", "logs")
+        log_format = output_config.get("log_format", "text").lower()
+        max_bytes = int(output_config.get("log_max_bytes", 0))
+        backup_count = int(output_config.get("log_backup_count", 5))
 
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-        log_file = os.path.join(log_dir, f"automation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        return logging.getLogger("web_automation")
+        extension = "jsonl" if log_format == "json" else "log"
+        log_file = os.path.join(log_dir, f"automation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}")
+
+        if max_bytes > 0:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        else:
+            file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        stream_handler = logging.StreamHandler()
+
+        text_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler.setFormatter(JsonFormatter() if log_format == "json" else text_formatter)
+        stream_handler.setFormatter(text_formatter)
+
+        run_id = output_config.get("run_id") or uuid.uuid4().hex[:12]
+        worker = output_config.get("worker_id") or f"{socket.gethostname()}-{os.getpid()}"
+        context_filter = RunContextFilter(run_id, worker)
+
+        LoggerManager.shutdown_logging()
+        if output_config.get("log_async", True):
+            # 브라우저 루프는 큐에 넣기만 하고, 디스크 쓰기는 리스너 스레드가 담당
+            log_queue = queue.SimpleQueue()
+            queue_handler = StructuredQueueHandler(log_queue)
+            queue_handler.addFilter(context_filter)
+            handlers = [queue_handler]
+            LoggerManager._listener = logging.handlers.QueueListener(
+                log_queue, file_handler, stream_handler, respect_handler_level=True
+            )
+            LoggerManager._listener.start()
+            if not LoggerManager._atexit_registered:
+                atexit.register(LoggerManager.shutdown_logging)
+                LoggerManager._atexit_registered = True
+        else:
+            file_handler.addFilter(context_filter)
+            stream_handler.addFilter(context_filter)
+            handlers = [file_handler, stream_handler]
+
+        logging.basicConfig(level=log_level, handlers=handlers, force=True)
+        logger = logging.getLogger("web_automation")
+        logger.run_id = run_id
+        return logger
+
+    def shutdown_logging():
+        """QueueListener 종료 - 큐에 남은 레코드를 모두 기록한 뒤 반환"""
+        listener = LoggerManager._listener
+        if listener is not None:
+            LoggerManager._listener = None
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
 
     def _log_prompt_error(self, prompt):
         """프롬프트 오류 기록"""
@@ -1,6 +1,26 @@
+import time
+
+# --profile-startup 용: 모듈 로드 시작 시각
+_MODULE_LOAD_STARTED = time.perf_counter()
+
+import os
+import sys
+import json
+import argparse
+
+# gemini_config_gen 은 상위 디렉터리(gemini/)에 있음 - 작업 디렉터리와 관계없이 import 되도록 추가
+# (뒤에 추가하므로 같은 이름의 모듈은 이 디렉터리(finish/)의 것이 우선)
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PARENT_DIR not in sys.path:
+    sys.path.append(PARENT_DIR)
+
+# 실제 실행 시 필요한 경우에만 import 되는 모듈 (--profile-startup 측정 대상)
+STARTUP_MODULES = ("google.generativeai", "gemini_config_gen", "config_file_manager")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Gemini API를 이용한 Selenium 설정 파일 생성")
-    parser.add_argument("--task", required=True, help="자동화 작업 설명")
+    parser.add_argument("--task", help="자동화 작업 설명 (생성 모드에서 필수)")
     parser.add_argument("--output", default="gemini_generated_config.json", help="출력 파일 경로")
     parser.add_argument("--api-key", help="Gemini API 키")
     parser.add_argument("--max-retries", type=int, default=5, help="최대 시도 횟수")
@@ -11,11 +31,68 @@ if __name__ == "__main__":
     parser.add_argument("--fix", help="기존 설정 파일 수정 모드")
     parser.add_argument("--max-fix-attempts", type=int, default=5,
                         help="최대 수정 시도 횟수")
+    parser.add_argument("--runtime-fix", action="store_true",
+                        help="생성/수정한 설정을 브라우저로 실행해 실패한 단계만 Gemini 로 수정")
+    parser.add_argument("--max-runtime-rounds", type=int, default=3, help="실행 기반 수정 최대 반복 횟수")
+    parser.add_argument("--no-page-summary", action="store_true",
+                        help="생성 전에 대상 페이지를 열어 구조 요약을 프롬프트에 넣는 단계 생략")
+    parser.add_argument("--prompt-budget", type=int,
+                        help="Gemini 프롬프트 토큰 예산 (기본: GEMINI_PROMPT_TOKEN_BUDGET 또는 6000)")
+    parser.add_argument("--profile-startup", action="store_true", help="모듈 import 소요 시간을 출력하고 종료")
 
     args = parser.parse_args()
+    if args.profile_startup:
+        from startup_profiler import profile_imports, print_startup_report
+        print_startup_report(time.perf_counter() - _MODULE_LOAD_STARTED, profile_imports(STARTUP_MODULES))
+        sys.exit(0)
+    if not (args.task or args.validate_only or args.fix):
+        parser.error("--task 가 필요합니다 (--validate-only / --fix 모드 제외)")
     print(f"input arguments : ${args}")
-    # GeminiConfigGenerator 인스턴스 생성 (올바른 문법)
-    config_gen = GeminiConfigGenerator(api_key=args.api_key, max_retries=args.max_retries)
+
+    if args.validate_only:
+        # 검증만 수행 - Gemini 모델 초기화 없음
+        from gemini_config_gen import GeminiConfigGenerator
+        validator = GeminiConfigGenerator(api_key=args.api_key, max_retries=args.max_retries)
+        with open(args.output, 'r', encoding='utf-8') as f:
+            is_valid, issues = validator.validate_config(json.load(f))
+        if is_valid:
+            print(f"✅ 유효한 설정 파일: {args.output}")
+            sys.exit(0)
+        print(f"❌ 설정 파일 유효성 검사 실패: {args.output}")
+        for issue in issues:
+            print(f"  - {issue}")
+        sys.exit(1)
+
+    if args.fix:
+        # 수정 모드 - 모델은 수정이 필요한 문제가 있을 때만 초기화됨
+        import config_file_manager
+        file_manager = config_file_manager.ConfigFileManager()
+        print(f"🔍 설정 파일 수정 모드 시작: {args.fix}")
+
+        validator = config_file_manager.ConfigValidator(api_key=args.api_key, prompt_budget=args.prompt_budget)
+
+        try:
+            original_config = file_manager.load_config(args.fix)
+            fixed_config = validator.iterative_fix(original_config, args.max_fix_attempts)
+            if args.runtime_fix:
+                fixed_config = validator.fix_with_runtime_feedback(fixed_config, args.max_runtime_rounds)
+
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(fixed_config, f, indent=2, ensure_ascii=False)
+
+            print(f"✅ 수정 완료: {args.output}")
+        except Exception as e:
+            print(f"❌ 수정 실패: {e}")
+        sys.exit(0)
+
+    # GeminiConfigGenerator 인스턴스 생성 (실행 기반 수정을 함께 하면 하위 클래스인 ConfigValidator)
+    if args.runtime_fix:
+        from config_file_manager import ConfigValidator as GeminiConfigGenerator
+    else:
+        from gemini_config_gen import GeminiConfigGenerator
+    config_gen = GeminiConfigGenerator(api_key=args.api_key, max_retries=args.max_retries,
+                                       page_summary=not args.no_page_summary,
+                                       prompt_budget=args.prompt_budget)
 
     # 프롬프트 파일 처리
     custom_prompt = None
@@ -33,24 +110,10 @@ if __name__ == "__main__":
     if args.url and "targetUrl" not in config:
         config["targetUrl"] = args.url
 
+    if args.runtime_fix:
+        config = config_gen.fix_with_runtime_feedback(config, args.max_runtime_rounds)
+
     with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
 
-    if args.fix:
-        file_manager = config_file_manager.ConfigFileManager()
-        print(f"🔍 설정 파일 수정 모드 시작: {args.fix}")
-
-        validator = ConfigValidator(api_key=args.api_key)
-
-        try:
-            original_config = file_manager.load_config(args.fix)
-            fixed_config = validator.iterative_fix(original_config, args.max_fix_attempts)
-
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(fixed_config, f, indent=2, ensure_ascii=False)
-
-            print(f"✅ 수정 완료: {args.output}")
-        except Exception as e:
-            print(f"❌ 수정 실패: {e}")
-
     print(f"생성된 설정 파일: {args.output}")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네트워크 응답 수집 (capture_network) + JSONPath 추출 (extract_json)
+Chrome performance 로그의 Network.responseReceived 이벤트에서 조건에 맞는 XHR/fetch 응답을 찾고
+CDP Network.getResponseBody 로 본문을 받아 JSON 으로 보관
+
+액션 설정 예시:
+  {"type": "capture_network", "name": "search", "url_pattern": "api/search", "timeout": 10}
+  {"type": "extract_json", "source": "search", "path": "$.items[*].title", "save": true}
+"""
+
+import re
+import json
+import time
+import base64
+
+PERFORMANCE_LOG_CAPABILITY = "goog:loggingPrefs"
+DEFAULT_RESOURCE_TYPES = ("XHR", "Fetch")
+
+
+def wants_network_capture(config):
+    """설정에서 성능 로그 수집이 필요한지 (명시 설정 또는 capture_network 액션 사용)"""
+    if config.get("browser", {}).get("capture_network"):
+        return True
+    return any(
+        action.get("type") == "capture_network"
+        for target in config.get("targets", [])
+        for action in target.get("actions", [])
+    )
+
+
+def driver_key(config):
+    """드라이버 재사용 판단 키 - 브라우저 설정 + 성능 로그 필요 여부
+
+    성능 로그 없이 만든 드라이버는 capture_network 를 쓰는 설정에 재사용할 수 없음
+    """
+    return json.dumps([config.get("browser", {}), wants_network_capture(config)], sort_keys=True)
+
+
+def enable_performance_logging(options, capability=PERFORMANCE_LOG_CAPABILITY):
+    """성능 로그 활성화 (Edge 는 capability 이름이 ms:loggingPrefs)"""
+    options.set_capability(capability, {"performance": "ALL"})
+
+
+def drain(driver):
+    """쌓여 있는 성능 로그 버림 (이전 대상의 응답이 섞이지 않도록 탐색 전에 호출)"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def _network_events(driver):
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            yield message["method"], message.get("params", {})
+
+
+def _response_body(driver, request_id):
+    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    text = body.get("body", "")
+    if body.get("base64Encoded"):
+        text = base64.b64decode(text).decode("utf-8", errors="replace")
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def capture(driver, pattern, resource_types=DEFAULT_RESOURCE_TYPES, timeout=10, min_count=1, poll_interval=0.25):
+    """조건에 맞는 응답을 min_count 개 이상 모을 때까지 대기 - [{"url", "status", "body"}]
+
+    응답 헤더(responseReceived)를 받은 요청은 본문 수신이 끝난(loadingFinished) 뒤에 본문을 가져옴.
+    성능 로그는 한 번 읽으면 사라지므로 아직 본문을 받지 못한 요청은 pending 에 보관
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        raise ValueError("capture_network 는 Chrome 계열 브라우저에서만 지원됩니다")
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+
+    captured = []
+    pending = {}
+    finished = set()
+
+    def fetch(request_id):
+        response = pending.pop(request_id)
+        try:
+            body = _response_body(driver, request_id)
+        except Exception:
+            # 리다이렉트/취소된 요청은 본문이 없음
+            return
+        captured.append({"url": response.get("url"), "status": response.get("status"), "body": body})
+
+    deadline = time.monotonic() + timeout
+    while True:
+        for method, params in _network_events(driver):
+            request_id = params.get("requestId")
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if resource_types and params.get("type") not in resource_types:
+                    continue
+                if pattern.search(response.get("url", "")):
+                    pending[request_id] = response
+            elif method == "Network.loadingFinished":
+                finished.add(request_id)
+            elif method == "Network.loadingFailed":
+                pending.pop(request_id, None)
+        for request_id in [request_id for request_id in pending if request_id in finished]:
+            fetch(request_id)
+        if len(captured) >= min_count:
+            return captured
+        if time.monotonic() >= deadline:
+            # 완료 이벤트를 놓친 요청도 마지막으로 한 번 시도
+            for request_id in list(pending):
+                fetch(request_id)
+            return captured
+        time.sleep(poll_interval)
+
+
+# --- JSONPath (부분 지원: $, .key, ['key'], [n], [a:b], [*], .*, ..key) ---
+
+_TOKEN = re.compile(
+    r"\.\.(?P<deep>[\w-]+|\*)"
+    r"|\.(?P<key>[\w-]+|\*)"
+    r"|\[\s*(?P<index>-?\d+)\s*\]"
+    r"|\[\s*(?P<slice>-?\d*\s*:\s*-?\d*)\s*\]"
+    r"|\[\s*\*\s*\](?P<wild>)"
+    r"|\[\s*(?P<quote>['\"])(?P<qkey>.*?)(?P=quote)\s*\]"
+)
+
+
+def parse_jsonpath(path):
+    """JSONPath 문자열 -> 토큰 튜플 [(종류, 값)] - 지원하지 않는 문법이면 ValueError"""
+    if not path.startswith("$"):
+        raise ValueError(f"JSONPath 는 $ 로 시작해야 합니다: {path}")
+    tokens = []
+    position = 1
+    while position < len(path):
+        match = _TOKEN.match(path, position)
+        if not match:
+            raise ValueError(f"지원하지 않는 JSONPath 문법: {path[position:]}")
+        if match.group("deep") is not None:
+            tokens.append(("deep", match.group("deep")))
+        elif match.group("key") is not None:
+            key = match.group("key")
+            tokens.append(("wild", None) if key == "*" else ("key", key))
+        elif match.group("index") is not None:
+            tokens.append(("index", int(match.group("index"))))
+        elif match.group("slice") is not None:
+            start, end = (part.strip() for part in match.group("slice").split(":"))
+            tokens.append(("slice", (int(start) if start else None, int(end) if end else None)))
+        elif match.group("wild") is not None:
+            tokens.append(("wild", None))
+        else:
+            tokens.append(("key", match.group("qkey")))
+        position = match.end()
+    return tuple(tokens)
+
+
+def _children(node):
+    if isinstance(node, dict):
+        return list(node.values())
+    if isinstance(node, list):
+        return list(node)
+    return []
+
+
+def _descendants(node):
+    yield node
+    for child in _children(node):
+        yield from _descendants(child)
+
+
+def find_jsonpath(tokens, document):
+    """토큰을 문서에 적용해 일치하는 값 목록 반환"""
+    nodes = [document]
+    for kind, value in tokens:
+        matched = []
+        for node in nodes:
+            if kind == "key":
+                if isinstance(node, dict) and value in node:
+                    matched.append(node[value])
+            elif kind == "index":
+                if isinstance(node, list) and -len(node) <= value < len(node):
+                    matched.append(node[value])
+            elif kind == "slice":
+                if isinstance(node, list):
+                    matched.extend(node[value[0]:value[1]])
+            elif kind == "wild":
+                matched.extend(_children(node))
+            elif kind == "deep":
+                for descendant in _descendants(node):
+                    if value == "*":
+                        matched.extend(_children(descendant))
+                    elif isinstance(descendant, dict) and value in descendant:
+                        matched.append(descendant[value])
+        nodes = matched
+    return nodes
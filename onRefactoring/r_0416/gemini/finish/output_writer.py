@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+결과 파일 출력 관리
+출력 디렉터리는 시작 시 한 번만 생성하고, 대상 처리 중 생성된 파일 내용은 메모리에 모아 두었다가
+대상 처리가 끝날 때 임시 파일 + rename 으로 한꺼번에 기록 (선택적으로 백그라운드 스레드에서)
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+OUTPUT_DIRS = (("results_dir", "results"), ("screenshots_dir", "screenshots"))
+
+
+class OutputWriter:
+    """대상 단위 배치 파일 출력
+
+    output 설정:
+      async_writes: true 이면 flush 를 백그라운드 스레드 하나에서 순서대로 수행
+                    (체크포인트보다 파일 기록이 늦을 수 있으므로 --resume 과 함께 쓸 때는 주의)
+      screenshot:   스크린샷 파이프라인 설정 (screenshot_pipeline.py 참고)
+    """
+
+    def __init__(self, config, logger=None, background=None):
+        output_config = config.get("output", {})
+        self.config = config
+        self.logger = logger
+        self.dirs = {key: output_config.get(key, default) for key, default in OUTPUT_DIRS}
+        self._created = set()
+        for path in self.dirs.values():
+            self.ensure_dir(path)
+
+        if background is None:
+            background = output_config.get("async_writes", False)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer") if background else None
+        self._pending = {}
+        self._appends = {}
+        self._lock = threading.Lock()
+        self._screenshots = None
+
+    def ensure_dir(self, path):
+        """디렉터리 생성 (같은 경로는 한 번만 확인)"""
+        if path and path not in self._created:
+            os.makedirs(path, exist_ok=True)
+            self._created.add(path)
+
+    def path(self, kind, filename):
+        """출력 종류(results_dir/screenshots_dir)별 파일 경로 - 하위 디렉터리가 있으면 생성"""
+        path = os.path.join(self.dirs[kind], filename)
+        self.ensure_dir(os.path.dirname(path))
+        return path
+
+    @property
+    def screenshots(self):
+        """스크린샷 파이프라인 (처음 사용할 때 생성)"""
+        if self._screenshots is None:
+            from screenshot_pipeline import ScreenshotPipeline
+            self._screenshots = ScreenshotPipeline(self.config, self, self.logger)
+        return self._screenshots
+
+    def write(self, path, data):
+        """파일 내용 예약 (같은 경로에 다시 쓰면 덮어씀) - flush 시 기록"""
+        with self._lock:
+            self._pending[path] = [data]
+
+    def append(self, path, data):
+        """기존 파일 끝에 이어 쓰기 예약 (flush 시 경로별로 한 번만 열어서 기록)"""
+        with self._lock:
+            self._appends.setdefault(path, []).append(data)
+
+    def read(self, path):
+        """기록 예약된 내용이 있으면 그 내용, 없으면 파일 내용 (없으면 None)"""
+        with self._lock:
+            if path in self._pending:
+                return "".join(self._pending[path])
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def flush(self):
+        """예약된 파일 일괄 기록 - 백그라운드 모드면 Future 반환"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            appends, self._appends = self._appends, {}
+        if not pending and not appends:
+            return None
+        if self._executor is not None:
+            return self._executor.submit(self._write_all, pending, appends)
+        self._write_all(pending, appends)
+        return None
+
+    def discard(self):
+        """기록 예약된 내용 버림 (결과를 반영하면 안 되는 경우 - 작업 임대를 잃은 워커 등)"""
+        with self._lock:
+            self._pending = {}
+            self._appends = {}
+
+    def write_now(self, path, data):
+        """예약 없이 즉시 기록 (다른 스레드에서 호출 가능)"""
+        self._write_atomic(path, [data])
+
+    def _write_all(self, pending, appends=None):
+        tasks = [(path, chunks, False) for path, chunks in pending.items()]
+        tasks += [(path, chunks, True) for path, chunks in (appends or {}).items()]
+        for path, chunks, append in tasks:
+            try:
+                if append:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.writelines(chunks)
+                else:
+                    self._write_atomic(path, chunks)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error("파일 기록 실패: %s - %s", path, e)
+                if self._executor is None:
+                    raise
+
+    def _write_atomic(self, path, chunks):
+        binary = isinstance(chunks[0], bytes)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            if binary:
+                with os.fdopen(fd, "wb") as f:
+                    f.writelines(chunks)
+            else:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.writelines(chunks)
+            # mkstemp 는 0600 으로 생성하므로 일반 파일 권한으로 맞춤
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self):
+        """남은 내용 기록 + 백그라운드 작업 완료 대기"""
+        if self._screenshots is not None:
+            self._screenshots.close()
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
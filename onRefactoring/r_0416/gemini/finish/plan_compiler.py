@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+설정 파일 -> 실행 계획(execution plan) 컴파일
+셀렉터의 By 로케이터 해석, 파라미터 검증, JS 스니펫 생성을 실행 전에 한 번만 수행하고
+설정 파일 해시를 키로 디스크에 캐시하여 실행/워커 간에 재사용
+캐시는 JSON 으로만 저장 (공유 디렉터리의 pickle 은 로드 시 임의 코드 실행 위험이 있음)
+"""
+
+import os
+import glob
+import json
+import hashlib
+import tempfile
+import re
+from types import MappingProxyType
+from collections import namedtuple
+from collections.abc import Mapping
+
+from network_capture import parse_jsonpath, DEFAULT_RESOURCE_TYPES
+
+# 캐시 형식이 바뀌면 올려서 기존 캐시 무효화
+PLAN_VERSION = 8
+# 디스크 캐시에 남겨둘 최근 계획 수 (오래 쓰지 않은 해시부터 삭제)
+PLAN_CACHE_KEEP = 32
+
+# 셀렉터 타입 -> selenium By 값 (By.ID == "id" 등 문자열 상수)
+SELECTOR_MAP = {
+    'id': "id",
+    'class_name': "class name",
+    'css': "css selector",
+    'xpath': "xpath",
+    'tag_name': "tag name",
+    'name': "name",
+    'link_text': "link text",
+    'partial_link_text': "partial link text",
+}
+DEFAULT_BY = SELECTOR_MAP['css']
+
+# 셀렉터가 필요한 액션
+SELECTOR_ACTIONS = ("input", "click", "extract")
+KNOWN_ACTIONS = ("screenshot", "input", "click", "wait", "extract", "scroll", "capture_network", "extract_json",
+                 "load_session", "save_session")
+
+CompiledWait = namedtuple("CompiledWait", "by value timeout")
+CompiledAction = namedtuple("CompiledAction", "index type locator params script error raw")
+CompiledTarget = namedtuple("CompiledTarget", "index name url wait actions raw")
+
+
+def resolve_by(selector_type):
+    """셀렉터 타입에 따른 By 값 반환"""
+    return SELECTOR_MAP.get((selector_type or "css").lower(), DEFAULT_BY)
+
+
+def _xpath_literal(text):
+    """XPath 문자열 리터럴 (따옴표가 섞인 경우 concat 사용)"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+
+def compile_locator(selector):
+    """셀렉터 dict/문자열 -> (By, value)
+
+    type "text" 는 텍스트 앵커: 자기 텍스트가 value 와 같은 요소를 찾는 XPath 로 변환
+    """
+    if isinstance(selector, str):
+        selector = {"type": "css", "value": selector}
+    value = selector.get("value", "")
+    if (selector.get("type") or "").lower() == "text":
+        return SELECTOR_MAP['xpath'], f"//*[text()[normalize-space(.)={_xpath_literal(str(value).strip())}]]"
+    return resolve_by(selector.get("type", "css")), value
+
+
+def _scroll_script(action):
+    target = action.get("target", "bottom")
+    amount = action.get("amount", None)
+    if target == "bottom":
+        return "window.scrollTo(0, document.body.scrollHeight);"
+    if target == "top":
+        return "window.scrollTo(0, 0);"
+    if amount:
+        return f"window.scrollBy(0, {int(amount)});"
+    return None
+
+
+def compile_action(action, index=0, scope=None, skip_to=None):
+    """액션 dict -> CompiledAction (검증 오류는 error 필드에 기록)
+
+    scope: 대상 이름 - 실행 간에 같은 액션을 식별하는 키(변경 감지 등)에 사용
+    skip_to: load_session 이 세션 복원에 성공했을 때 건너뛸 위치 (compile_target 에서 계산)
+    params 는 읽기 전용 (계획은 실행/워커 간에 공유되므로 컴파일 후 바꾸지 않음)
+    """
+    action_type = (action.get("type") or "").lower()
+    locator = None
+    script = None
+    error = None
+    params = {}
+
+    if action_type in SELECTOR_ACTIONS:
+        selector = action.get("selector", {})
+        if isinstance(selector, str):
+            selector = {"type": "css", "value": selector}
+        value = selector.get("value", "")
+        if not value or not str(value).strip():
+            error = f"셀렉터 값이 비어 있습니다: 액션 #{index + 1} ({action_type})"
+        locator = compile_locator(selector)
+        # 기본 셀렉터가 실패할 때 순서대로 시도할 대체 셀렉터 (selector_healing 참고)
+        params["fallbacks"] = tuple(
+            compile_locator(fallback) for fallback in selector.get("fallbacks", [])
+            if isinstance(fallback, str) or str(fallback.get("value", "")).strip()
+        )
+        params["selector_key"] = f"{scope or 'target'}#{index}"
+
+    if action_type == "screenshot":
+        params["filename"] = action.get("filename")
+        params["full_page"] = action.get("full_page")
+        # 스크린샷 중복 제거에서 실행 간에 같은 화면을 찾는 키
+        params["frame_key"] = f"{scope or 'target'}#{index}"
+        # 요소만 캡처 (선택)
+        selector = action.get("selector")
+        if selector:
+            locator = compile_locator(selector)
+    elif action_type == "input":
+        params["text"] = action.get("text", "")
+        params["submit"] = bool(action.get("submit", False))
+    elif action_type == "wait":
+        try:
+            params["seconds"] = float(action.get("seconds", 1))
+        except (TypeError, ValueError):
+            error = f"잘못된 대기 시간: 액션 #{index + 1} ({action.get('seconds')})"
+            params["seconds"] = 0
+    elif action_type in ("extract", "extract_json"):
+        params["attribute"] = action.get("attribute", None)
+        params["save"] = bool(action.get("save", False))
+        params["output_file"] = action.get("output_file")
+        params["detect_changes"] = action.get("detect_changes")
+        params["change_key"] = f"{scope or 'target'}#{index}"
+        if action_type == "extract_json":
+            params["source"] = action.get("source", "default")
+            try:
+                params["path"] = parse_jsonpath(action.get("path", "$"))
+            except ValueError as e:
+                error = f"잘못된 JSONPath: 액션 #{index + 1} ({e})"
+    elif action_type in ("load_session", "save_session"):
+        params["name"] = action.get("name", scope or "default")
+        if action_type == "load_session":
+            params["url"] = action.get("url")
+            params["max_age"] = action.get("max_age", 24 * 60 * 60)
+            check = action.get("check") or {}
+            params["check_present"] = bool(check.get("present", True))
+            params["check_locator"] = None
+            if check.get("selector"):
+                params["check_locator"] = compile_locator(check["selector"])
+            params["skip_to"] = skip_to
+    elif action_type == "capture_network":
+        params["name"] = action.get("name", "default")
+        params["resource_types"] = tuple(action.get("resource_types", DEFAULT_RESOURCE_TYPES))
+        try:
+            params["timeout"] = float(action.get("timeout", 10))
+            params["min_count"] = int(action.get("min_count", 1))
+            params["url_pattern"] = re.compile(action.get("url_pattern", ""))
+        except (TypeError, ValueError, re.error) as e:
+            error = f"잘못된 capture_network 설정: 액션 #{index + 1} ({e})"
+    elif action_type == "scroll":
+        params["target"] = action.get("target", "bottom")
+        try:
+            script = _scroll_script(action)
+        except (TypeError, ValueError):
+            error = f"잘못된 스크롤 값: 액션 #{index + 1} ({action.get('amount')})"
+
+    return CompiledAction(index, action_type, locator, MappingProxyType(params), script, error, action)
+
+
+def _session_skips(actions, scope):
+    """load_session 인덱스 -> 같은 이름의 save_session 다음 위치 (그 사이가 로그인 액션)"""
+    def session_name(action):
+        return action.get("name", scope or "default")
+
+    skips = {}
+    for index, action in enumerate(actions):
+        if (action.get("type") or "").lower() != "load_session":
+            continue
+        skips[index] = next(
+            (later + 1 for later in range(index + 1, len(actions))
+             if (actions[later].get("type") or "").lower() == "save_session"
+             and session_name(actions[later]) == session_name(action)),
+            None,
+        )
+    return skips
+
+
+def compile_target(target, config, index=0):
+    """대상 dict -> CompiledTarget"""
+    wait = None
+    wait_config = target.get("wait_for", {})
+    if wait_config:
+        wait = CompiledWait(
+            resolve_by(wait_config.get("type", "tag_name")),
+            wait_config.get("value", "body"),
+            wait_config.get("timeout", config.get("timeouts", {}).get("default_wait", 10)),
+        )
+    name = target.get("name", "Unnamed Target")
+    raw_actions = target.get("actions", [])
+    skips = _session_skips(raw_actions, name)
+    actions = tuple(compile_action(action, i, name, skips.get(i)) for i, action in enumerate(raw_actions))
+    return CompiledTarget(index, name, target.get("url"), wait, actions, target)
+
+
+def compile_plan(config, logger=None):
+    """설정 전체 -> CompiledTarget 튜플 (검증 경고는 컴파일 시 한 번만 기록)"""
+    plan = tuple(compile_target(target, config, i) for i, target in enumerate(config.get("targets", [])))
+    if logger:
+        report_plan_issues(plan, logger)
+    return plan
+
+
+def report_plan_issues(plan, logger):
+    """컴파일 시 발견된 검증 오류 기록"""
+    for target in plan:
+        for action in target.actions:
+            if action.error:
+                logger.warning("실행 계획 검증 오류 (%s): %s", target.name, action.error)
+            elif action.type not in KNOWN_ACTIONS:
+                logger.warning("알 수 없는 액션 타입 (%s): %s", target.name, action.type)
+
+
+_PLAN_TYPES = {cls.__name__: cls for cls in (CompiledWait, CompiledAction, CompiledTarget)}
+
+
+def _encode_plan(value):
+    """계획 -> JSON 호환 값 (튜플/정규식/계획 namedtuple 은 태그를 붙여 보존)"""
+    if type(value).__name__ in _PLAN_TYPES and isinstance(value, tuple):
+        return {"__plan__": type(value).__name__, "fields": [_encode_plan(item) for item in value]}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode_plan(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_plan(item) for item in value]
+    if isinstance(value, Mapping):
+        return {key: _encode_plan(item) for key, item in value.items()}
+    if isinstance(value, re.Pattern):
+        return {"__regex__": value.pattern, "flags": value.flags}
+    return value
+
+
+def _decode_plan(value):
+    """_encode_plan 의 역변환 - 알려진 계획 타입 외에는 만들지 않음"""
+    if isinstance(value, dict):
+        if "__plan__" in value:
+            item = _PLAN_TYPES[value["__plan__"]](*(_decode_plan(field) for field in value["fields"]))
+            if isinstance(item, CompiledAction):
+                item = item._replace(params=MappingProxyType(item.params))
+            return item
+        if "__tuple__" in value:
+            return tuple(_decode_plan(item) for item in value["__tuple__"])
+        if "__regex__" in value:
+            return re.compile(value["__regex__"], value.get("flags", 0))
+        return {key: _decode_plan(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_plan(item) for item in value]
+    return value
+
+
+def _prune_cache(cache_dir, keep=PLAN_CACHE_KEEP):
+    """최근에 쓴 keep 개만 남기고 삭제 (이전 형식의 pickle 캐시는 모두 삭제)"""
+    paths = glob.glob(os.path.join(cache_dir, "*.json"))
+    stale = glob.glob(os.path.join(cache_dir, "*.pickle"))
+    if len(paths) > keep:
+        paths.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0, reverse=True)
+        stale.extend(paths[keep:])
+    for path in stale:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_compiled(config_path, cache_dir=".plan_cache", logger=None):
+    """설정 파일 로드 + 컴파일 - 파일 해시가 같으면 디스크 캐시 재사용
+
+    반환: (config, plan)
+    """
+    with open(config_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(f"v{PLAN_VERSION}:".encode("utf-8") + raw).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{digest}.json")
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                config, plan = _decode_plan(json.load(f))
+            # 최근 사용 시각 갱신 (정리 대상에서 제외)
+            os.utime(cache_path)
+            if logger:
+                logger.debug("실행 계획 캐시 사용: %s", cache_path)
+            return config, plan
+        except Exception as e:
+            if logger:
+                logger.warning("실행 계획 캐시 로드 실패, 다시 컴파일: %s", e)
+
+    config = json.loads(raw.decode("utf-8"))
+    plan = compile_plan(config, logger)
+
+    # 다른 워커와 동시에 써도 안전하도록 임시 파일에 쓴 뒤 교체
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(_encode_plan([config, plan]), f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _prune_cache(cache_dir)
+    return config, plan
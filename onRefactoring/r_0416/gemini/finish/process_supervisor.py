@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+브라우저 프로세스 감독
+  - 드라이버 서비스(chromedriver 등)를 새 세션(프로세스 그룹)으로 띄워, 종료 시 그룹 전체를 바로 종료
+  - 실행 중인 드라이버를 레지스트리(<tempdir>/crawler_drivers/*.json)에 기록
+  - 임시 프로필마다 만든 프로세스를 기록(<프로필>/.crawler_owner.json)
+  - 리퍼(reaper): 소유 프로세스가 죽은(SIGKILL 등) 드라이버의 프로세스 그룹/임시 프로필과
+    레지스트리에 없지만 소유 프로세스가 죽은 임시 프로필을 정리하고 좀비 자식 프로세스 회수
+    (소유 기록이 없는 프로필은 누가 쓰는지 알 수 없으므로 삭제하지 않음)
+"""
+
+import os
+import re
+import json
+import time
+import glob
+import shutil
+import signal
+import tempfile
+import threading
+
+REGISTRY_DIR = os.path.join(tempfile.gettempdir(), "crawler_drivers")
+# webdrive_manager 가 만드는 임시 프로필 이름 (<브라우저>_<uuid hex>_XXXX)
+PROFILE_PATTERN = re.compile(r"^(chrome|edge|firefox)_[0-9a-f]{32}_")
+# 임시 프로필을 만든 프로세스 기록 파일
+OWNER_MARKER = ".crawler_owner.json"
+
+
+def service_kwargs():
+    """드라이버 Service 생성 인자 - POSIX 에서는 새 세션으로 실행해 프로세스 그룹을 분리"""
+    if os.name == "posix":
+        return {"popen_kw": {"start_new_session": True}}
+    return {}
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _identity(pid):
+    """(생성 시각, 프로세스 이름) - 없는 프로세스면 None"""
+    import psutil
+    try:
+        process = psutil.Process(pid)
+        return process.create_time(), process.name()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def _owns_group(record):
+    """기록된 프로세스 그룹이 아직 그 드라이버의 그룹인지 (PID 재사용으로 다른 프로세스 그룹이 된 경우 False)"""
+    pgid = record.get("pgid")
+    identity = _identity(pgid)
+    if identity is None:
+        # 그룹 리더(드라이버 서비스)는 종료됨 - 그룹이 남아 있는 동안 커널은 그 번호를
+        # 새 프로세스에 주지 않으므로, 남은 구성원은 원래 그룹의 브라우저 프로세스
+        return True
+    created, name = identity
+    return abs(created - record.get("created", 0)) < 1.0 and name == record.get("name")
+
+
+def mark_owner(profile_dir):
+    """임시 프로필에 이 프로세스를 소유자로 기록 (PID 재사용 확인용 생성 시각 포함)"""
+    identity = _identity(os.getpid())
+    with open(os.path.join(profile_dir, OWNER_MARKER), "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "created": identity[0] if identity else None}, f)
+
+
+def _owner_dead(profile_dir):
+    """소유 기록상 프로필을 만든 프로세스가 종료되었는지 - 기록이 없거나 읽을 수 없으면 False"""
+    try:
+        with open(os.path.join(profile_dir, OWNER_MARKER), "r", encoding="utf-8") as f:
+            owner = json.load(f)
+    except (OSError, ValueError):
+        return False
+    import psutil
+    try:
+        created = psutil.Process(owner.get("pid", 0)).create_time()
+    except psutil.NoSuchProcess:
+        return True
+    except psutil.AccessDenied:
+        return False
+    # 같은 PID 의 다른 프로세스 (PID 재사용)
+    return owner.get("created") is not None and abs(created - owner["created"]) >= 1.0
+
+
+def _record_path(service_pid):
+    return os.path.join(REGISTRY_DIR, f"{service_pid}.json")
+
+
+def register(driver, user_data_dir=None):
+    """드라이버 프로세스 그룹과 임시 프로필 기록 (driver.supervised 에 레코드 보관)"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    pgid = None
+    if os.name == "posix":
+        try:
+            pgid = os.getpgid(process.pid)
+        except ProcessLookupError:
+            return None
+        if pgid == os.getpgid(0):
+            # 같은 그룹이면 그룹 종료 시 자기 자신도 종료되므로 사용하지 않음
+            pgid = None
+    identity = _identity(process.pid)
+    if identity is None:
+        return None
+    record = {
+        "service_pid": process.pid,
+        "pgid": pgid,
+        # PID 재사용 확인용 (그룹 리더 = 드라이버 서비스의 생성 시각/이름)
+        "created": identity[0],
+        "name": identity[1],
+        "user_data_dir": user_data_dir,
+        "owner": os.getpid(),
+        "started": time.time(),
+    }
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    with open(_record_path(process.pid), "w", encoding="utf-8") as f:
+        json.dump(record, f)
+    driver.supervised = record
+    return record
+
+
+def kill_group(record, grace=3.0):
+    """기록된 프로세스 그룹 종료 (SIGTERM -> 유예 후 SIGKILL)
+
+    그룹 리더의 생성 시각/이름이 기록과 다르면 (PID 재사용) 다른 프로세스 그룹이므로 건드리지 않음
+    """
+    pgid = record.get("pgid")
+    if pgid and os.name == "posix":
+        if not _owns_group(record):
+            return
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        else:
+            deadline = time.monotonic() + grace
+            while time.monotonic() < deadline:
+                # 자식(드라이버 서비스)이면 좀비로 남아 그룹이 살아 있는 것처럼 보이므로 먼저 회수
+                _reap_service(record)
+                try:
+                    os.killpg(pgid, 0)
+                except ProcessLookupError:
+                    break
+                time.sleep(0.1)
+            else:
+                try:
+                    os.killpg(pgid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        _reap_service(record)
+
+
+def release(driver, kill=True):
+    """드라이버 종료 후 남은 프로세스 정리 + 레지스트리에서 제거"""
+    record = getattr(driver, "supervised", None)
+    if not record:
+        return
+    if kill:
+        kill_group(record)
+    try:
+        os.remove(_record_path(record["service_pid"]))
+    except FileNotFoundError:
+        pass
+
+
+def find_records(user_data_dir=None):
+    records = []
+    for path in glob.glob(os.path.join(REGISTRY_DIR, "*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if user_data_dir is None or record.get("user_data_dir") == user_data_dir:
+            records.append(record)
+    return records
+
+
+def _reap_service(record):
+    """이 프로세스가 띄운 드라이버 서비스가 좀비로 남았으면 회수
+
+    waitpid(-1) 은 clone_profile 의 cp, selenium 의 Popen 등 다른 코드의 자식까지 가로채므로
+    등록된 서비스 PID 만 기다림
+    """
+    if os.name != "posix" or record.get("owner") != os.getpid():
+        return
+    try:
+        os.waitpid(record["service_pid"], os.WNOHANG)
+    except ChildProcessError:
+        pass
+
+
+def reap(logger=None):
+    """고아 드라이버/임시 프로필 정리 - 정리한 항목 수 반환"""
+    cleaned = 0
+    live_dirs = set()
+    for record in find_records():
+        if _alive(record.get("owner", 0)):
+            if record.get("user_data_dir"):
+                live_dirs.add(record["user_data_dir"])
+            continue
+        # 소유 프로세스가 강제 종료됨 - 브라우저 그룹과 프로필 정리
+        kill_group(record, grace=1.0)
+        if record.get("user_data_dir"):
+            shutil.rmtree(record["user_data_dir"], ignore_errors=True)
+        try:
+            os.remove(_record_path(record["service_pid"]))
+        except FileNotFoundError:
+            pass
+        cleaned += 1
+        if logger:
+            logger.info("고아 드라이버 정리: PID=%s, 프로필=%s", record["service_pid"], record.get("user_data_dir"))
+
+    for entry in os.scandir(tempfile.gettempdir()):
+        path = entry.path
+        if path in live_dirs or not PROFILE_PATTERN.match(entry.name) or not entry.is_dir(follow_symlinks=False):
+            continue
+        if not _owner_dead(path):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        cleaned += 1
+        if logger:
+            logger.info("고아 임시 프로필 삭제: %s", path)
+
+    return cleaned
+
+
+class Reaper:
+    """주기적으로 reap() 을 실행하는 백그라운드 스레드 (스케줄러/워커 모드용)"""
+
+    def __init__(self, logger, interval=300):
+        self.logger = logger
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="reaper", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                reap(self.logger)
+            except Exception as e:
+                self.logger.error("고아 프로세스 정리 실패: %s", e)
+
+    def stop(self):
+        self._stop.set()
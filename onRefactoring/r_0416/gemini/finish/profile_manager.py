@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+브라우저 프로필 템플릿
+미리 초기화한 user-data-dir(프로필, 컴포넌트, HTTP 디스크 캐시 포함)을 실행마다 복제해서 사용
+  - Linux 에서는 cp --reflink=auto 로 복제 (btrfs/xfs 등에서는 copy-on-write 라 거의 비용 없음)
+  - 그 외 환경은 일반 복사
+Chrome 은 디스크 캐시를 읽기 전용으로 쓸 수 없으므로, 캐시도 프로필과 함께 복제되어
+CoW 파일시스템에서는 변경되지 않은 캐시 블록을 모든 워커가 공유
+
+설정:
+  browser.profile_template: 템플릿 디렉터리 (없으면 기존처럼 빈 임시 프로필 사용)
+  템플릿 생성: web_automation.py -c config.json --build-profile-template
+템플릿에는 프로필 형식(chromium/firefox)을 기록해 두고, 다른 형식의 브라우저에서 쓰면 드라이버 생성 시 오류
+"""
+
+import os
+import json
+import sys
+import shutil
+import tempfile
+import subprocess
+
+# 실행 중인 브라우저 인스턴스 전용 파일 - 복제하지 않음
+LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "DevToolsActivePort", "lockfile")
+
+# 템플릿의 프로필 형식 기록 파일
+TEMPLATE_MARKER = ".crawler_template.json"
+# 형식 기록이 없는 (이전에 만든) 템플릿은 브라우저가 만드는 파일로 형식 판별
+FORMAT_FILES = (("Local State", "chromium"), ("prefs.js", "firefox"))
+
+
+def _ignore_locks(directory, names):
+    return [name for name in names if name in LOCK_FILES]
+
+
+def clone_profile(template_dir, prefix="chrome_", logger=None):
+    """템플릿을 새 임시 디렉터리로 복제하고 경로 반환"""
+    clone_dir = tempfile.mkdtemp(prefix=prefix)
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        # 빈 디렉터리에 템플릿 내용을 복제 (reflink 를 지원하지 않는 파일시스템이면 cp 가 일반 복사)
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=auto", os.path.join(template_dir, "."), clone_dir],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        if result.returncode == 0:
+            for root, _, files in os.walk(clone_dir):
+                for name in files:
+                    if name in LOCK_FILES:
+                        os.remove(os.path.join(root, name))
+            return clone_dir
+        if logger:
+            logger.warning("reflink 복제 실패, 일반 복사 사용: %s", result.stderr.strip())
+        shutil.rmtree(clone_dir, ignore_errors=True)
+        clone_dir = tempfile.mkdtemp(prefix=prefix)
+
+    shutil.copytree(template_dir, clone_dir, symlinks=True, ignore=_ignore_locks, dirs_exist_ok=True)
+    return clone_dir
+
+
+def template_ready(template_dir):
+    return bool(template_dir) and os.path.isdir(template_dir) and bool(os.listdir(template_dir))
+
+
+def template_format(template_dir):
+    """템플릿의 프로필 형식 (chromium/firefox) - 알 수 없으면 None"""
+    try:
+        with open(os.path.join(template_dir, TEMPLATE_MARKER), "r", encoding="utf-8") as f:
+            return json.load(f).get("profile_format")
+    except (OSError, ValueError):
+        pass
+    for name, profile_format in FORMAT_FILES:
+        if os.path.exists(os.path.join(template_dir, name)):
+            return profile_format
+    return None
+
+
+def build_template(template_dir, launch, teardown, urls, logger, profile_format=None):
+    """템플릿 프로필 생성 - launch(user_data_dir) 로 브라우저를 띄워 urls 를 한 번씩 열고 종료
+
+    첫 실행 초기화(프로필/컴포넌트)와 대상 페이지 정적 리소스 캐시가 템플릿에 남음
+    profile_format: 템플릿에 기록할 프로필 형식 (복제할 때 브라우저와 맞는지 확인)
+    """
+    os.makedirs(template_dir, exist_ok=True)
+    driver = launch(template_dir)
+    try:
+        for url in urls:
+            try:
+                driver.get(url)
+                logger.info("템플릿 캐시 준비: %s", url)
+            except Exception as e:
+                logger.warning("템플릿 캐시 준비 실패: %s - %s", url, e)
+    finally:
+        teardown(driver, logger)
+    for name in LOCK_FILES:
+        path = os.path.join(template_dir, name)
+        if os.path.lexists(path):
+            os.remove(path)
+    if profile_format:
+        with open(os.path.join(template_dir, TEMPLATE_MARKER), "w", encoding="utf-8") as f:
+            json.dump({"profile_format": profile_format}, f)
+    logger.info("프로필 템플릿 생성 완료: %s", template_dir)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemini 프롬프트 크기 관리
+  - 토큰 수 추정, 임베드 JSON 최소화, 사용하지 않는 템플릿 필드 제거
+  - 토큰 예산을 넘으면 우선순위가 낮은 섹션(페이지 요약, 원본 프롬프트 컨텍스트, 잘못된 JSON 등)부터 잘라냄
+  - PromptBudgetMixin: 설정 생성기(GeminiConfigGenerator 등)가 공유하는 예산 적용/페이지 요약 메서드
+"""
+
+import re
+import json
+import time
+
+# 프롬프트 토큰 예산 (환경 변수 GEMINI_PROMPT_TOKEN_BUDGET / --prompt-budget 으로 변경)
+DEFAULT_PROMPT_TOKEN_BUDGET = 6000
+# 추정치가 예산의 이 비율 안쪽으로 가까울 때만 model.count_tokens 로 실제 토큰 수 확인 (API 호출 1회)
+COUNT_TOKENS_MARGIN = 0.1
+
+TRUNCATION_MARKER = " ...(생략)"
+SECTION_SEPARATOR = "\n\n"
+
+
+def estimate_tokens(text):
+    """토큰 수 추정 (API 호출 없이) - ASCII 는 약 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰
+
+    실제 토크나이저와 차이가 있으므로 예산에 가까운 프롬프트만 _finish_prompt 에서 model.count_tokens 로 확인
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def minify_json(value):
+    """프롬프트에 넣을 JSON - 들여쓰기/공백 없이"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_template(template):
+    """실행기가 사용하지 않는 빈 최상위 필드(selectors: {}, actions: [] 등) 제거"""
+    return {key: value for key, value in template.items() if value not in ({}, [], "", None)}
+
+
+def squeeze_whitespace(text):
+    """줄 앞뒤 공백(소스 코드 들여쓰기)과 연속된 빈 줄 제거"""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+class PromptBuilder:
+    """섹션 단위 프롬프트 구성 - 토큰 예산을 넘으면 우선순위가 낮은 섹션부터 뒷부분을 잘라냄
+
+    priority=None 인 섹션(지시문, 설정 구조 등)은 자르지 않음. 숫자가 작을수록 먼저 잘림
+    """
+
+    def __init__(self, budget=DEFAULT_PROMPT_TOKEN_BUDGET, count_tokens=estimate_tokens):
+        self.budget = budget
+        self.count_tokens = count_tokens
+        self.sections = []
+        self.original_tokens = 0
+        self.tokens = 0
+
+    def add(self, text, priority=None, squeeze=True):
+        if text:
+            self.sections.append([squeeze_whitespace(text) if squeeze else text.strip(), priority])
+        return self
+
+    def _truncate(self, text, max_tokens):
+        """max_tokens 이내가 되도록 뒷부분 잘라냄 (표시 문구 포함, 남길 수 없으면 빈 문자열)"""
+        if max_tokens <= self.count_tokens(TRUNCATION_MARKER):
+            return ""
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(text[:middle] + TRUNCATION_MARKER) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low] + TRUNCATION_MARKER
+
+    def build(self):
+        sizes = [self.count_tokens(text) for text, _ in self.sections]
+        # 섹션 구분자(빈 줄)도 예산에 포함
+        separators = self.count_tokens(SECTION_SEPARATOR) * max(len(sizes) - 1, 0)
+        self.original_tokens = total = sum(sizes) + separators
+        elastic = sorted((index for index, (_, priority) in enumerate(self.sections) if priority is not None),
+                         key=lambda index: self.sections[index][1])
+        for index in elastic:
+            if total <= self.budget:
+                break
+            text = self._truncate(self.sections[index][0], sizes[index] - (total - self.budget))
+            self.sections[index][0] = text
+            total -= sizes[index] - self.count_tokens(text)
+            sizes[index] = self.count_tokens(text)
+        self.tokens = total
+        return SECTION_SEPARATOR.join(text for text, _ in self.sections if text)
+
+
+class PromptBudgetMixin:
+    """예산 적용 프롬프트 생성 + 대상 페이지 구조 요약
+
+    사용하는 속성: model, logger, prompt_budget, user_url, page_summary_enabled, page_summary_chars, page_summary
+    """
+
+    def _count_prompt_tokens(self, prompt):
+        """모델 토크나이저로 센 토큰 수 - 모델을 쓸 수 없거나 호출이 실패하면 None (추정치 사용)"""
+        try:
+            return self.model.count_tokens(prompt).total_tokens
+        except Exception as e:
+            self.logger.debug("토큰 수 확인 실패, 추정치 사용: %s", e)
+            return None
+
+    def _finish_prompt(self, builder, purpose):
+        """예산 적용한 프롬프트 생성 및 토큰 수 기록
+
+        자르기는 추정치(estimate_tokens)로 하고, 추정치가 예산에 가까울 때(COUNT_TOKENS_MARGIN)만
+        model.count_tokens 로 한 번 확인 - 실제 토큰 수가 예산을 넘으면 추정치/실제 비율만큼 예산을 줄여
+        다시 자르고, 결과 토큰 수는 같은 비율로 환산 (다시 세지 않음)
+        """
+        prompt = builder.build()
+        original_tokens = builder.original_tokens
+        tokens, counted = builder.tokens, "약 "
+        if self.prompt_budget * (1 - COUNT_TOKENS_MARGIN) <= builder.tokens <= self.prompt_budget:
+            actual = self._count_prompt_tokens(prompt)
+            if actual is not None:
+                tokens, counted = actual, ""
+                if actual > self.prompt_budget and builder.tokens:
+                    ratio = actual / builder.tokens
+                    builder.budget = int(self.prompt_budget / ratio)
+                    prompt = builder.build()
+                    tokens, counted = round(builder.tokens * ratio), "약 "
+        message = "%s 프롬프트: %s%d 토큰 (원본 추정 %d, 예산 %d)" % (
+            purpose, counted, tokens, original_tokens, self.prompt_budget)
+        if tokens > self.prompt_budget:
+            self.logger.warning("%s - 필수 섹션만으로 예산 초과", message)
+        else:
+            self.logger.info(message)
+        return prompt
+
+    def _load_page_summary(self, task_description):
+        """대상 URL 을 브라우저로 한 번 열어 페이지 구조 요약 (비활성화/URL 없음/실패 시 빈 문자열)"""
+        if not self.page_summary_enabled:
+            return ""
+        url = self.user_url
+        if not url:
+            url_match = re.search(r'https?://[^\s"\'<>]+', task_description)
+            url = url_match.group(0) if url_match else None
+        if not url:
+            return ""
+
+        # 브라우저 관련 모듈은 요약이 필요할 때만 로드
+        from dom_summary import fetch_page_summary
+
+        started = time.time()
+        summary = fetch_page_summary(url, self.logger, max_chars=self.page_summary_chars)
+        if summary:
+            self.logger.info("페이지 구조 요약 완료: %s (%d자, %.1f초)", url, len(summary), time.time() - started)
+        return summary
+
+    def _page_summary_section(self):
+        """프롬프트에 덧붙일 페이지 구조 요약 (요약이 없으면 빈 문자열)"""
+        if not self.page_summary:
+            return ""
+        return (
+            "\n실제 대상 페이지 구조 요약 (화면에 보이는 요소와 후보 CSS 셀렉터):\n"
+            f"{self.page_summary}\n"
+            "셀렉터는 위 요약에 있는 값을 우선 사용하고 (type: css), 요약에 없는 id/클래스를 추측하지 마세요.\n"
+            "반복 목록의 데이터는 '컨테이너 > 항목' 셀렉터 뒤에 항목 안의 필드 셀렉터를 붙여 추출하세요.\n"
+        )
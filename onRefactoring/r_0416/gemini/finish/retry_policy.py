@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+액션 재시도 정책 및 호스트별 서킷 브레이커
+일시적 오류(stale element, 타임아웃 등)는 지수 백오프로 재시도하고,
+연속 실패가 누적된 호스트는 남은 대상을 건너뜀
+"""
+
+import time
+import random
+from urllib.parse import urlparse
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+# WebDriverException 메시지 중 일시적 네트워크/렌더러 문제로 볼 수 있는 패턴
+TRANSIENT_MESSAGES = (
+    "timed out",
+    "timeout",
+    "connection refused",
+    "connection reset",
+    "net::err_",
+    "disconnected",
+)
+
+DEFAULT_RETRY_CONFIG = {
+    "max_attempts": 3,
+    "base_delay": 0.5,
+    "max_delay": 8.0,
+    "jitter": True,
+    "circuit_threshold": 5,
+}
+
+
+_exception_groups = None
+
+
+def exception_groups():
+    """(일시적 예외, 영구 예외, WebDriverException) - selenium 은 처음 분류할 때 import"""
+    global _exception_groups
+    if _exception_groups is None:
+        from selenium.common.exceptions import (
+            TimeoutException,
+            StaleElementReferenceException,
+            ElementClickInterceptedException,
+            ElementNotInteractableException,
+            NoSuchElementException,
+            InvalidSelectorException,
+            WebDriverException,
+        )
+        # 재시도하면 회복될 가능성이 있는 예외
+        transient = (
+            TimeoutException,
+            StaleElementReferenceException,
+            ElementClickInterceptedException,
+            ElementNotInteractableException,
+        )
+        # 재시도해도 결과가 같은 예외 (셀렉터 오류 등)
+        permanent = (
+            NoSuchElementException,
+            InvalidSelectorException,
+            ValueError,
+            KeyError,
+            TypeError,
+        )
+        _exception_groups = (transient, permanent, WebDriverException)
+    return _exception_groups
+
+
+def classify_failure(error):
+    """예외를 transient / permanent 로 분류"""
+    transient, permanent, webdriver_exception = exception_groups()
+    if isinstance(error, transient):
+        return TRANSIENT
+    if isinstance(error, permanent):
+        return PERMANENT
+    if isinstance(error, webdriver_exception):
+        message = str(error).lower()
+        if any(pattern in message for pattern in TRANSIENT_MESSAGES):
+            return TRANSIENT
+    return PERMANENT
+
+
+def host_of(url):
+    """URL 의 호스트 (서킷 브레이커 키)"""
+    return urlparse(url or "").netloc.lower()
+
+
+class CircuitBreaker:
+    """호스트별 연속 실패 횟수를 세고 임계값을 넘으면 차단"""
+
+    def __init__(self, threshold=5):
+        self.threshold = threshold
+        self.failures = {}
+
+    def is_open(self, host):
+        return self.threshold > 0 and self.failures.get(host, 0) >= self.threshold
+
+    def record_success(self, host):
+        self.failures[host] = 0
+
+    def record_failure(self, host):
+        self.failures[host] = self.failures.get(host, 0) + 1
+        return self.is_open(host)
+
+
+class RetryPolicy:
+    """액션별 재시도 예산 + 지수 백오프(지터) 정책
+
+    설정 예시 (config["retry"]):
+      {"max_attempts": 3, "base_delay": 0.5, "max_delay": 8, "jitter": true, "circuit_threshold": 5}
+    액션에 "retries": n 을 지정하면 해당 액션의 재시도 횟수를 덮어씀
+    """
+
+    def __init__(self, config=None, sleep=time.sleep):
+        retry_config = dict(DEFAULT_RETRY_CONFIG)
+        retry_config.update((config or {}).get("retry", {}))
+        self.max_attempts = max(1, int(retry_config["max_attempts"]))
+        self.base_delay = float(retry_config["base_delay"])
+        self.max_delay = float(retry_config["max_delay"])
+        self.jitter = bool(retry_config["jitter"])
+        self.breaker = CircuitBreaker(int(retry_config["circuit_threshold"]))
+        self._sleep = sleep
+
+    def attempts_for(self, action):
+        if "retries" in action:
+            return max(1, int(action["retries"]) + 1)
+        return self.max_attempts
+
+    def backoff(self, attempt):
+        """attempt 번째 실패 후 대기 시간 (full jitter)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def run(self, func, action, logger=None):
+        """func 실행 - 일시적 오류는 재시도, 영구 오류나 예산 소진 시 마지막 예외를 다시 발생"""
+        attempts = self.attempts_for(action)
+        for attempt in range(attempts):
+            try:
+                return func()
+            except Exception as e:
+                kind = classify_failure(e)
+                if kind == PERMANENT or attempt == attempts - 1:
+                    raise
+                delay = self.backoff(attempt)
+                if logger:
+                    logger.warning("일시적 오류 재시도 %d/%d (%.2f초 후): %s - %s",
+                                   attempt + 1, attempts - 1, delay, action.get("type"), e)
+                self._sleep(delay)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+설정 파일 실제 실행 결과 수집 (설정 자동 수정용)
+생성/수정된 설정을 브라우저로 한 번 실행하고, 실패한 단계마다 오류와 기대 위치 주변 DOM 요약을 모음
+결과 파일/스크린샷은 임시 디렉터리에 기록하고 실행 후 삭제
+"""
+
+import copy
+import shutil
+import logging
+import tempfile
+
+
+def feedback_config(config, work_dir):
+    """실행용 설정 - 누락된 섹션은 기본값, 출력은 work_dir, 재시도 없이 모든 실패를 수집"""
+    from web_automation import DEFAULT_CONFIG
+
+    run_config = copy.deepcopy(config)
+    for section in ("browser", "output", "timeouts"):
+        run_config[section] = dict(DEFAULT_CONFIG[section], **(config.get(section) or {}))
+    run_config["output"].update({
+        "results_dir": f"{work_dir}/results",
+        "screenshots_dir": f"{work_dir}/screenshots",
+        "sessions_dir": f"{work_dir}/sessions",
+        "learned_selectors": f"{work_dir}/learned_selectors.json",
+        "conditional_fetch": False,
+        "async_writes": False,
+    })
+    run_config["browser"]["tabs"] = 1
+    # 대체 셀렉터/학습된 셀렉터로 가려지지 않도록 기본 셀렉터 실패를 그대로 드러냄
+    for target in run_config.get("targets", []):
+        for action in target.get("actions", []):
+            if isinstance(action.get("selector"), dict):
+                action["selector"].pop("fallbacks", None)
+    run_config["retry"] = {"max_attempts": 1, "circuit_threshold": 1000}
+    return run_config
+
+
+def collect_failures(config, logger=None):
+    """설정 실행 후 실패 목록 반환 (빈 목록이면 모든 단계 성공)
+
+    실패 항목: {"target_index", "target", "url", "stage": compile/navigate/wait/action,
+              "action_index", "action", "error", "dom": {"matched", "count", "html"}}
+    """
+    import web_automation
+    from plan_compiler import compile_plan
+
+    logger = logger or logging.getLogger(__name__)
+    work_dir = tempfile.mkdtemp(prefix="runtime_feedback_")
+    failures = []
+    try:
+        run_config = feedback_config(config, work_dir)
+        plan = compile_plan(run_config, logger)
+
+        # 실행 전에 알 수 있는 오류(빈 셀렉터, 잘못된 JSONPath 등)는 브라우저 없이 기록
+        for target in plan:
+            for action in target.actions:
+                if action.error:
+                    failures.append({"target_index": target.index, "target": target.name, "url": target.url,
+                                     "stage": "compile", "action_index": action.index, "action": action.raw,
+                                     "error": action.error})
+
+        driver = web_automation.setup_driver(run_config, logger)
+        try:
+            for target in plan:
+                web_automation.process_target(driver, target, run_config, logger, failures=failures)
+        finally:
+            web_automation.teardown_driver(driver, logger)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # 컴파일 오류 액션은 실행 중에도 같은 오류로 실패하므로 한 번만 남김
+    unique = {}
+    for failure in failures:
+        unique.setdefault((failure["target_index"], failure.get("action_index"), failure["stage"] == "wait"), failure)
+    return list(unique.values())
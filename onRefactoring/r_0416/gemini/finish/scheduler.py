@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+반복 실행 설정 파일용 스케줄러 데몬
+디렉터리의 설정 파일들을 cron 형식 스케줄에 따라 실행하며,
+드라이버를 미리 띄워 재사용(warm pool)하고 변경된 설정 파일은 자동으로 다시 읽음
+
+설정 파일 예시:
+  {"schedule": "*/10 * * * *", "browser": {...}, "targets": [...], ...}
+  또는 {"interval": 300, ...}  (초 단위)
+"""
+
+import os
+import json
+import time
+import glob
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import network_capture
+from plan_compiler import compile_plan
+
+# cron 필드 (분, 시, 일, 월, 요일) 허용 범위
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class CronSchedule:
+    """5필드 cron 표현식 (*, */n, a-b, a-b/n, a,b 지원, 요일 0 또는 7=일요일)
+
+    일과 요일이 모두 제한되어 있으면 (둘 다 * 로 시작하지 않음) 표준 cron 처럼 둘 중 하나만 맞아도 실행
+    """
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"잘못된 cron 표현식: {expression}")
+        self.expression = expression
+        self.fields = [self._parse_field(part, low, high) for part, (low, high) in zip(parts, CRON_FIELDS)]
+        if 7 in self.fields[4]:
+            self.fields[4] = (self.fields[4] - {7}) | {0}
+        self.day_or_weekday = not parts[2].startswith("*") and not parts[4].startswith("*")
+
+    def _parse_field(self, field, low, high):
+        values = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start, end = (int(v) for v in item.split("-", 1))
+            else:
+                start = end = int(item)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"cron 필드 범위 오류: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, moment):
+        minute, hour, day, month, weekday = self.fields
+        if not (moment.minute in minute and moment.hour in hour and moment.month in month):
+            return False
+        day_matches = moment.day in day
+        weekday_matches = (moment.isoweekday() % 7) in weekday
+        if self.day_or_weekday:
+            return day_matches or weekday_matches
+        return day_matches and weekday_matches
+
+    def next_run(self, after):
+        """after 이후(초과) 첫 실행 시각"""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # 최대 1년 탐색
+        for _ in range(366 * 24 * 60):
+            if self.matches(moment):
+                return moment
+            moment += timedelta(minutes=1)
+        raise ValueError(f"실행 시각을 찾을 수 없는 cron 표현식: {self.expression}")
+
+
+class IntervalSchedule:
+    """고정 간격(초) 스케줄"""
+
+    def __init__(self, seconds):
+        self.seconds = float(seconds)
+
+    def next_run(self, after):
+        return after + timedelta(seconds=self.seconds)
+
+
+def schedule_for(config):
+    if config.get("schedule"):
+        return CronSchedule(config["schedule"])
+    if config.get("interval"):
+        return IntervalSchedule(config["interval"])
+    return None
+
+
+class DriverPool:
+    """브라우저 설정별로 유휴 드라이버를 보관하고 재사용
+
+    health_check(config, driver) 가 사유(문자열)를 반환하면 반납된 드라이버를 보관하지 않고 종료
+    """
+
+    def __init__(self, setup_driver, teardown_driver, logger, max_idle=2, health_check=None):
+        self.setup_driver = setup_driver
+        self.teardown_driver = teardown_driver
+        self.health_check = health_check
+        self.logger = logger
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _key(self, config):
+        return network_capture.driver_key(config)
+
+    def acquire(self, config):
+        key = self._key(config)
+        with self._lock:
+            drivers = self._idle.get(key, [])
+            driver = drivers.pop() if drivers else None
+        if driver is None:
+            return self.setup_driver(config, self.logger)
+        return driver
+
+    def release(self, config, driver, healthy=True):
+        key = self._key(config)
+        if healthy:
+            try:
+                driver.get("about:blank")
+            except Exception:
+                healthy = False
+        if healthy and self.health_check is not None:
+            reason = self.health_check(config, driver)
+            if reason:
+                self.logger.warning("드라이버 교체: %s", reason)
+                healthy = False
+        with self._lock:
+            drivers = self._idle.setdefault(key, [])
+            if healthy and len(drivers) < self.max_idle:
+                drivers.append(driver)
+                return
+        self.teardown_driver(driver, self.logger)
+
+    def close(self):
+        with self._lock:
+            drivers = [driver for pool in self._idle.values() for driver in pool]
+            self._idle = {}
+        for driver in drivers:
+            self.teardown_driver(driver, self.logger)
+
+
+class ConfigScheduler:
+    """설정 디렉터리 감시 + 스케줄 실행 데몬
+
+    run_config(driver, config, logger, plan) 콜백으로 실제 대상 처리를 위임
+    (실행 계획은 설정 파일을 다시 읽을 때만 컴파일)
+    """
+
+    def __init__(self, config_dir, run_config, setup_driver, teardown_driver, logger,
+                 max_workers=2, poll_interval=1.0, health_check=None):
+        self.config_dir = config_dir
+        self.run_config = run_config
+        self.logger = logger
+        self.poll_interval = poll_interval
+        self.pool = DriverPool(setup_driver, teardown_driver, logger, max_idle=max_workers, health_check=health_check)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduler")
+        self.entries = {}
+        self.running = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def reload(self, now=None):
+        """새로 추가/변경/삭제된 설정 파일 반영"""
+        now = now or datetime.now()
+        seen = set()
+        for path in sorted(glob.glob(os.path.join(self.config_dir, "*.json"))):
+            seen.add(path)
+            mtime = os.path.getmtime(path)
+            entry = self.entries.get(path)
+            if entry and entry["mtime"] == mtime:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+                schedule = schedule_for(config)
+                plan = compile_plan(config, self.logger)
+            except Exception as e:
+                self.logger.error("설정 파일 로드 실패: %s - %s", path, e)
+                self.entries[path] = {"mtime": mtime, "config": None, "plan": None, "schedule": None,
+                                      "next_run": None}
+                continue
+            if schedule is None:
+                self.logger.warning("스케줄이 없는 설정 파일 무시: %s", path)
+            next_run = schedule.next_run(now) if schedule else None
+            self.entries[path] = {"mtime": mtime, "config": config, "plan": plan, "schedule": schedule,
+                                  "next_run": next_run}
+            self.logger.info("설정 파일 %s: %s (다음 실행: %s)", "변경" if entry else "등록", path, next_run)
+
+        for path in set(self.entries) - seen:
+            del self.entries[path]
+            self.logger.info("설정 파일 제거: %s", path)
+
+    def tick(self, now=None):
+        """실행 시각이 된 설정 파일 제출 - 같은 설정이 실행 중이면 건너뜀"""
+        now = now or datetime.now()
+        for path, entry in self.entries.items():
+            if entry["next_run"] is None or entry["next_run"] > now:
+                continue
+            entry["next_run"] = entry["schedule"].next_run(now)
+            with self._lock:
+                if path in self.running:
+                    self.logger.warning("이전 실행이 끝나지 않아 건너뜀: %s", path)
+                    continue
+                self.running.add(path)
+            self.executor.submit(self._run, path, entry["config"], entry["plan"])
+
+    def _run(self, path, config, plan):
+        started = time.perf_counter()
+        driver = None
+        healthy = True
+        try:
+            driver = self.pool.acquire(config)
+            self.run_config(driver, config, self.logger, plan)
+            self.logger.info("스케줄 실행 완료: %s (%.1f초)", path, time.perf_counter() - started)
+        except Exception as e:
+            healthy = False
+            self.logger.error("스케줄 실행 실패: %s - %s", path, e, exc_info=True)
+        finally:
+            if driver is not None:
+                self.pool.release(config, driver, healthy)
+            with self._lock:
+                self.running.discard(path)
+
+    def serve_forever(self):
+        self.logger.info("스케줄러 시작: %s", self.config_dir)
+        try:
+            while not self._stop.is_set():
+                self.reload()
+                self.tick()
+                self._stop.wait(self.poll_interval)
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        self._stop.set()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+        self.logger.info("스케줄러 종료")
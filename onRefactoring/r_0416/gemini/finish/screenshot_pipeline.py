@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스크린샷 파이프라인
+브라우저 스레드에서는 base64 이미지만 받아오고, 디코딩/축소/재인코딩/파일 기록은
+백그라운드 스레드 풀에서 처리 (Pillow 가 있으면 JPEG/WebP 재인코딩 및 축소 지원)
+
+output.screenshot 설정 예시:
+  {"async": true, "workers": 2, "format": "webp", "quality": 80, "max_width": 1280, "full_page": false,
+   "dedup": {"dir": "screenshots/store", "threshold": 4}}
+  dedup 을 켜면 직전 실행과 거의 같은 프레임은 다시 저장하지 않음 (screenshot_store.py 참고)
+
+액션 설정:
+  {"type": "screenshot", "filename": "result.png", "selector": {...}}   - 요소만 캡처
+  {"type": "screenshot", "full_page": true}                            - 전체 페이지 캡처
+"""
+
+import os
+import io
+import base64
+import importlib.util
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from screenshot_store import open_store, link_frame
+
+FORMAT_EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+FORMAT_ALIASES = {"jpg": "jpeg"}
+
+
+class ScreenshotPipeline:
+    """스크린샷 캡처 + 백그라운드 인코딩/기록"""
+
+    def __init__(self, config, writer, logger=None):
+        settings = config.get("output", {}).get("screenshot", {}) or {}
+        self.writer = writer
+        self.logger = logger
+        self.format = FORMAT_ALIASES.get(str(settings.get("format", "png")).lower(),
+                                         str(settings.get("format", "png")).lower())
+        if self.format not in FORMAT_EXTENSIONS:
+            self._warn("지원하지 않는 스크린샷 형식, png 사용: %s", self.format)
+            self.format = "png"
+        self.quality = int(settings.get("quality", 80))
+        self.max_width = settings.get("max_width")
+        self.full_page = bool(settings.get("full_page", False))
+        self.has_pillow = importlib.util.find_spec("PIL") is not None
+        if (self.format != "png" or self.max_width) and not self.has_pillow:
+            self._warn("Pillow 가 없어 축소/재인코딩 없이 브라우저 인코딩 결과를 사용합니다: pip install pillow")
+
+        self.store = None
+        dedup = settings.get("dedup")
+        if dedup:
+            dedup = dedup if isinstance(dedup, dict) else {}
+            store_dir = dedup.get("dir") or os.path.join(writer.dirs["screenshots_dir"], "store")
+            self.store = open_store(store_dir, int(dedup.get("threshold", 4)), logger)
+            self.run_id = (config.get("output", {}).get("run_id") or getattr(logger, "run_id", None)
+                           or datetime.now().strftime('%Y%m%d_%H%M%S'))
+
+        workers = int(settings.get("workers", 2))
+        self._executor = None
+        if settings.get("async", True) and workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")
+        self._futures = []
+
+    def _warn(self, message, *args):
+        if self.logger:
+            self.logger.warning(message, *args)
+
+    def capture(self, driver, filename=None, locator=None, full_page=None, key=None):
+        """캡처 후 기록 예약 - 최종 파일 경로 반환 (async 모드에서는 기록 완료 전에 반환)
+
+        key: 중복 제거 시 직전 실행의 프레임을 찾는 키 (없으면 파일 이름 사용)
+        """
+        if filename is None:
+            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
+        if full_page is None:
+            full_page = self.full_page
+        use_cdp = hasattr(driver, "execute_cdp_cmd")
+        # CDP 도 Pillow 도 없으면 PNG 그대로 저장
+        target_format = self.format if use_cdp or self.has_pillow else "png"
+        path = self.writer.path("screenshots_dir", os.path.splitext(filename)[0] + FORMAT_EXTENSIONS[target_format])
+
+        data, encoded_format = self._grab(driver, locator, full_page, use_cdp)
+        if self._executor is None:
+            self._process(path, data, encoded_format, target_format, key)
+        else:
+            self._futures = [future for future in self._futures if not future.done()]
+            self._futures.append(self._executor.submit(self._process, path, data, encoded_format, target_format, key))
+        return path
+
+    def _grab(self, driver, locator, full_page, use_cdp):
+        """브라우저에서 base64 이미지 획득 - (base64 문자열, 인코딩 형식)
+
+        Chrome/Edge 는 CDP Page.captureScreenshot 으로 목표 형식을 브라우저에서 바로 인코딩
+        """
+        if use_cdp:
+            params = {"format": self.format, "captureBeyondViewport": bool(full_page or locator)}
+            if self.format != "png":
+                params["quality"] = self.quality
+            if locator is not None:
+                rect = driver.find_element(*locator).rect
+                params["clip"] = {"x": rect["x"], "y": rect["y"], "width": rect["width"],
+                                  "height": rect["height"], "scale": 1}
+            elif full_page:
+                metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+                size = metrics.get("cssContentSize") or metrics["contentSize"]
+                params["clip"] = {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1}
+            return driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"], self.format
+
+        if locator is not None:
+            return driver.find_element(*locator).screenshot_as_base64, "png"
+        if full_page and hasattr(driver, "get_full_page_screenshot_as_base64"):
+            # Firefox
+            return driver.get_full_page_screenshot_as_base64(), "png"
+        return driver.get_screenshot_as_base64(), "png"
+
+    def _process(self, path, data, encoded_format, target_format, key=None):
+        """디코딩 -> (필요 시) 축소/재인코딩 -> 파일 기록"""
+        try:
+            raw = base64.b64decode(data)
+            if self.has_pillow and (self.max_width or encoded_format != target_format):
+                raw = self._reencode(raw, target_format)
+            if self.store is None:
+                self.writer.write_now(path, raw)
+            else:
+                name = key or os.path.relpath(path, self.writer.dirs["screenshots_dir"])
+                frame_path, _ = self.store.add(self.run_id, name, raw, os.path.splitext(path)[1])
+                link_frame(frame_path, path)
+        except Exception as e:
+            if self.logger:
+                self.logger.error("스크린샷 처리 실패: %s - %s", path, e)
+            if self._executor is None:
+                raise
+
+    def _reencode(self, raw, target_format):
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(raw))
+        if self.max_width and image.width > int(self.max_width):
+            width = int(self.max_width)
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        if target_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        options = {"quality": self.quality} if target_format != "png" else {"optimize": True}
+        image.save(buffer, format=target_format.upper(), **options)
+        return buffer.getvalue()
+
+    def wait(self):
+        """예약된 스크린샷 처리 완료 대기"""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실행 간 스크린샷 중복 제거 저장소
+캡처한 이미지의 perceptual hash (16x16 dHash, 256비트) 를 계산해 같은 키의 직전 프레임과 거의 같으면
+새로 저장하지 않고 기존 프레임을 재사용. 실행 -> 프레임 매핑은 append-only 인덱스에 기록
+키는 실행마다 바뀌는 파일 이름이 아니라 "대상 이름#액션 순번" 처럼 실행 간에 같은 값을 사용
+
+저장소 구조:
+  <dir>/frames/<sha256 앞 20자>.<확장자>   - 실제 이미지 (내용 주소 방식)
+  <dir>/index.jsonl                        - {"run_id", "name", "frame", "digest", "phash", "stored", "time"} 한 줄씩
+
+Pillow 가 없으면 perceptual hash 대신 내용 해시가 같은 경우만 중복으로 처리
+"""
+
+import os
+import io
+import json
+import hashlib
+import threading
+import importlib.util
+from datetime import datetime
+
+# 8x8(64비트) 은 작은 글자/숫자 변화가 해시에 드러나지 않아 다른 화면을 같은 프레임으로 판단함
+HASH_SIZE = 16
+HASH_HEX_LENGTH = HASH_SIZE * HASH_SIZE // 4
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(store_dir, threshold=4, logger=None):
+    """같은 디렉터리의 저장소 객체를 프로세스 안에서 공유 (스케줄러 동시 실행 대비)"""
+    key = os.path.abspath(store_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ScreenshotStore(store_dir, threshold, logger)
+        return store
+
+
+def dhash(raw):
+    """difference hash (HASH_SIZE * HASH_SIZE 비트 정수) - Pillow 가 없으면 None"""
+    if not HAS_PILLOW:
+        return None
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(raw)).convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = list(image.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class ScreenshotStore:
+    """이름별 최신 프레임과 비교해 바뀐 프레임만 저장"""
+
+    def __init__(self, store_dir, threshold=4, logger=None):
+        self.store_dir = store_dir
+        self.frames_dir = os.path.join(store_dir, "frames")
+        self.index_path = os.path.join(store_dir, "index.jsonl")
+        self.threshold = threshold
+        self.logger = logger
+        self.latest = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.frames_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """인덱스에서 이름별 마지막 프레임 복원"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 동시 기록 중 잘린 줄은 무시
+                    continue
+                self.latest[record["name"]] = record
+
+    def add(self, run_id, name, raw, extension):
+        """프레임 추가 - (프레임 경로, 새로 저장했는지 여부)
+
+        name: 실행 간에 같은 화면을 가리키는 키 (대상 이름 + 액션 순번)
+        """
+        phash = dhash(raw)
+        digest = hashlib.sha256(raw).hexdigest()[:20]
+
+        with self._lock:
+            previous = self.latest.get(name)
+            if previous is not None and self._same(previous, phash, digest):
+                # 비교 기준은 처음 저장된 프레임으로 유지 (조금씩 변하는 화면이 누적되지 않도록)
+                frame, digest, phash_hex = previous["frame"], previous["digest"], previous["phash"]
+                stored = False
+            else:
+                frame = digest + extension
+                phash_hex = f"{phash:0{HASH_HEX_LENGTH}x}" if phash is not None else None
+                self._write_frame(frame, raw)
+                stored = True
+
+            record = {
+                "run_id": run_id,
+                "name": name,
+                "frame": frame,
+                "digest": digest,
+                "phash": phash_hex,
+                "stored": stored,
+                "time": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.latest[name] = record
+            # 한 줄 append 는 O_APPEND 로 원자적이므로 여러 프로세스가 같은 인덱스를 공유 가능
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if self.logger and not stored:
+            self.logger.debug("직전 프레임과 동일한 스크린샷 - 저장 생략: %s", name)
+        return os.path.join(self.frames_dir, frame), stored
+
+    def _same(self, previous, phash, digest):
+        if previous.get("digest") == digest:
+            return True
+        if phash is None or len(previous.get("phash") or "") != HASH_HEX_LENGTH:
+            # 해시 크기가 다른 이전 기록과는 비교할 수 없음
+            return False
+        return hamming(int(previous["phash"], 16), phash) <= self.threshold
+
+    def _write_frame(self, frame, raw):
+        path = os.path.join(self.frames_dir, frame)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+
+    def runs(self):
+        """실행 ID -> {이름: 프레임} 인덱스 (리뷰 도구용)"""
+        runs = {}
+        if not os.path.exists(self.index_path):
+            return runs
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                runs.setdefault(record["run_id"], {})[record["name"]] = record["frame"]
+        return runs
+
+
+def link_frame(frame_path, path):
+    """프레임을 출력 경로에 하드링크 (불가능하면 복사) - 기존 파일은 원자적으로 교체"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(frame_path, tmp_path)
+    except OSError:
+        import shutil
+        shutil.copyfile(frame_path, tmp_path)
+    os.replace(tmp_path, path)
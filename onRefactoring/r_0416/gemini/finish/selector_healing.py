@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+셀렉터 자가 복구 (self-healing)
+기본 셀렉터로 요소를 찾지 못하면 대체 셀렉터(fallbacks)를 순서대로 시도하고,
+성공한 셀렉터를 학습 저장소에 기록해 다음 실행에서 먼저 시도
+
+셀렉터 설정 예시:
+  {"type": "css", "value": "#login-btn",
+   "fallbacks": [{"type": "id", "value": "loginButton"},
+                 {"type": "xpath", "value": "//form//button[@type='submit']"},
+                 {"type": "text", "value": "로그인"}]}
+
+학습 저장소: output.learned_selectors (기본 .learned_selectors.json)
+  {"<대상 이름>#<액션 번호>": {"primary": [By, value], "locator": [By, value], "time": ...}}
+  설정 파일의 기본 셀렉터가 바뀌면 기록은 무시되고, 기본 셀렉터가 다시 동작하면 삭제
+"""
+
+import os
+import json
+import tempfile
+import threading
+from datetime import datetime
+
+DEFAULT_STORE = ".learned_selectors.json"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class LearnedSelectorStore:
+    """액션 키 -> 마지막으로 성공한 대체 셀렉터 (JSON 파일, 변경 시 원자적 저장)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError):
+                # 손상된 저장소는 버리고 다시 학습
+                self._entries = {}
+        return self._entries
+
+    def lookup(self, key, primary):
+        """기본 셀렉터가 같을 때만 학습된 로케이터 반환"""
+        with self._lock:
+            entry = self._load().get(key)
+        if entry and tuple(entry["primary"]) == tuple(primary):
+            return tuple(entry["locator"])
+        return None
+
+    def record(self, key, primary, locator):
+        """성공한 로케이터 기록 - 기본 셀렉터가 성공했으면 학습 기록 삭제. 변경 여부 반환"""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if tuple(locator) == tuple(primary):
+                if entry is None:
+                    return False
+                del entries[key]
+            else:
+                if entry and tuple(entry["primary"]) == tuple(primary) and tuple(entry["locator"]) == tuple(locator):
+                    # 이미 학습된 셀렉터 재사용 - 파일은 그대로 둠
+                    return False
+                entries[key] = {"primary": list(primary), "locator": list(locator),
+                                "time": datetime.now().isoformat(timespec="seconds")}
+            self._save(entries)
+            return True
+
+    def _save(self, entries):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".learned_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def open_store(config):
+    path = config.get("output", {}).get("learned_selectors", DEFAULT_STORE)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = LearnedSelectorStore(path)
+        return _stores[path]
+
+
+def candidate_locators(action, store):
+    """시도 순서: 학습된 셀렉터 -> 기본 셀렉터 -> 대체 셀렉터 (중복 제외)"""
+    fallbacks = action.params.get("fallbacks", ())
+    learned = store.lookup(action.params["selector_key"], action.locator) if "selector_key" in action.params else None
+    candidates = [learned] if learned else []
+    candidates.append(action.locator)
+    candidates.extend(fallbacks)
+    return list(dict.fromkeys(candidates))
+
+
+def run_with_fallbacks(action, config, logger, attempt, is_empty=None):
+    """attempt(locator) 를 후보 셀렉터 순서대로 실행
+
+    요소가 없거나(NoSuchElementException) is_empty(결과) 가 참이면 다음 후보로 넘어가며,
+    성공한 셀렉터는 학습 저장소에 기록. 모든 후보가 빈 결과면 마지막 결과 반환
+    """
+    from selenium.common.exceptions import NoSuchElementException, InvalidSelectorException
+
+    store = open_store(config)
+    candidates = candidate_locators(action, store)
+    if len(candidates) == 1:
+        return attempt(action.locator)
+
+    missing = None
+    result = None
+    for locator in candidates:
+        try:
+            result = attempt(locator)
+        except (NoSuchElementException, InvalidSelectorException) as e:
+            missing = e
+            continue
+        if is_empty is not None and is_empty(result):
+            continue
+        key = action.params["selector_key"]
+        if store.record(key, action.locator, locator):
+            if locator != action.locator:
+                logger.warning("셀렉터 복구: %s=%s -> %s=%s (학습 저장)",
+                               action.locator[0], action.locator[1], locator[0], locator[1])
+            else:
+                logger.info("기본 셀렉터 동작 - 학습 기록 삭제: %s", key)
+        elif locator != action.locator:
+            logger.debug("학습된 셀렉터 사용: %s -> %s=%s", key, locator[0], locator[1])
+        return result
+
+    if result is None and missing is not None:
+        raise missing
+    return result
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로그인 세션 저장/복원 (save_session / load_session 액션)
+쿠키와 localStorage 를 암호화 파일로 저장해 두고 새 드라이버에 복원하여 로그인 과정을 건너뜀
+
+액션 설정 예시:
+  {"type": "load_session", "name": "naver", "url": "https://www.naver.com",
+   "check": {"selector": {"type": "css", "value": "a.logout"}, "present": true}, "max_age": 86400}
+  ... 로그인 input/click/wait 액션들 ...
+  {"type": "save_session", "name": "naver"}
+
+load_session 이 성공하면 같은 이름의 save_session 까지(로그인 액션) 건너뛰고, 만료/검증 실패 시
+로그인 액션을 그대로 수행한 뒤 save_session 이 새 세션을 저장
+
+암호화: cryptography 패키지의 Fernet, 키는 환경변수 CRAWLER_SESSION_KEY (임의 문자열)
+저장 위치: output.sessions_dir (기본 .sessions)
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+from urllib.parse import urlparse
+
+SESSION_KEY_ENV = "CRAWLER_SESSION_KEY"
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+def _fernet():
+    key = os.environ.get(SESSION_KEY_ENV)
+    if not key:
+        raise RuntimeError(f"세션 암호화 키가 없습니다: 환경변수 {SESSION_KEY_ENV} 를 설정하세요")
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        raise RuntimeError("세션 파일 암호화에 cryptography 패키지가 필요합니다: pip install cryptography")
+    # 임의 길이의 키 문자열 -> Fernet 키 (32바이트 urlsafe base64)
+    return Fernet(base64.urlsafe_b64encode(hashlib.sha256(key.encode("utf-8")).digest()))
+
+
+def session_path(config, name):
+    sessions_dir = config.get("output", {}).get("sessions_dir", ".sessions")
+    os.makedirs(sessions_dir, exist_ok=True)
+    return os.path.join(sessions_dir, f"{name}.session")
+
+
+def capture_state(driver):
+    """현재 드라이버의 쿠키 + 현재 origin 의 localStorage (restore_session 으로 복원 가능한 dict)"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        # 모든 도메인의 쿠키를 한 번에 (로그인 과정의 리다이렉트 도메인 포함)
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        cookie_format = "cdp"
+    else:
+        cookies = driver.get_cookies()
+        cookie_format = "webdriver"
+
+    parsed = urlparse(driver.current_url)
+    return {
+        "saved": time.time(),
+        "origin": f"{parsed.scheme}://{parsed.netloc}",
+        "cookie_format": cookie_format,
+        "cookies": cookies,
+        "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);") or {},
+    }
+
+
+def save_session(driver, path):
+    """capture_state 결과를 암호화 파일로 저장 - 저장한 쿠키 수 반환"""
+    state = capture_state(driver)
+    token = _fernet().encrypt(json.dumps(state, ensure_ascii=False).encode("utf-8"))
+    tmp_path = f"{path}.tmp"
+    with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+        f.write(token)
+    os.replace(tmp_path, path)
+    return len(state["cookies"])
+
+
+def read_session(path, max_age=DEFAULT_MAX_AGE):
+    """저장된 세션 읽기 - 없거나 만료/복호화 실패면 None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        token = f.read()
+    try:
+        state = json.loads(_fernet().decrypt(token).decode("utf-8"))
+    except RuntimeError:
+        raise
+    except Exception:
+        # 키가 바뀌었거나 파일이 손상됨
+        return None
+    if max_age and time.time() - state.get("saved", 0) > max_age:
+        return None
+
+    # 만료된 쿠키 제외 - 남은 쿠키가 없으면 세션 만료로 판단
+    now = time.time()
+    expiry_key = "expires" if state.get("cookie_format") == "cdp" else "expiry"
+    state["cookies"] = [
+        cookie for cookie in state.get("cookies", [])
+        if not cookie.get(expiry_key) or cookie[expiry_key] <= 0 or cookie[expiry_key] > now
+    ]
+    if not state["cookies"] and not state.get("local_storage"):
+        return None
+    return state
+
+
+def restore_session(driver, state, url=None):
+    """쿠키/localStorage 복원 후 url(또는 저장 당시 origin) 로 다시 이동"""
+    origin = state.get("origin")
+    if state.get("cookie_format") == "cdp" and hasattr(driver, "execute_cdp_cmd"):
+        cookies = [
+            {key: value for key, value in cookie.items() if key not in ("size", "session", "priority",
+                                                                          "sourceScheme", "sourcePort")}
+            for cookie in state["cookies"]
+        ]
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        if state.get("local_storage"):
+            driver.get(origin)
+    else:
+        # WebDriver 는 현재 도메인의 쿠키만 추가 가능
+        driver.get(origin)
+        for cookie in state["cookies"]:
+            if cookie.get("sameSite") not in (None, "Strict", "Lax", "None"):
+                cookie = {key: value for key, value in cookie.items() if key != "sameSite"}
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                continue
+
+    if state.get("local_storage"):
+        driver.execute_script(
+            "var items = arguments[0]; for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+            state["local_storage"],
+        )
+    driver.get(url or origin)
+
+
+def session_valid(driver, check_locator=None, present=True, timeout=5, poll_interval=0.25):
+    """로그인 상태 확인 - 로그인 후에만 보이는 요소(present) 또는 로그인 폼이 없는지(present=False)"""
+    if check_locator is None:
+        return True
+    deadline = time.monotonic() + timeout
+    while True:
+        found = bool(driver.find_elements(*check_locator))
+        if found == present:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_interval)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLI 시작 시간 측정 (--profile-startup)
+지연 import 대상 모듈들의 import 소요 시간을 측정해 출력
+"""
+
+import sys
+import time
+import importlib
+
+
+def profile_imports(module_names):
+    """모듈별 import 소요 시간 측정 - [(모듈명, 초, 이미 로드됨 여부 또는 오류)]"""
+    timings = []
+    for name in module_names:
+        if name in sys.modules:
+            timings.append((name, 0.0, "loaded"))
+            continue
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            status = ""
+        except ImportError as e:
+            status = f"ImportError: {e}"
+        timings.append((name, time.perf_counter() - started, status))
+    return timings
+
+
+def print_startup_report(module_load, timings, stream=None):
+    """모듈 로드 시간 + 지연 import 시간 보고"""
+    stream = stream or sys.stdout
+    deferred = sum(elapsed for _, elapsed, _ in timings)
+    print(f"모듈 로드 (CLI 시작): {module_load * 1000:8.1f} ms", file=stream)
+    print("지연 import (실행 시 필요한 경우에만 발생):", file=stream)
+    for name, elapsed, status in sorted(timings, key=lambda item: item[1], reverse=True):
+        print(f"  {elapsed * 1000:8.1f} ms  {name}{'  (' + status + ')' if status else ''}", file=stream)
+    print(f"합계: {(module_load + deferred) * 1000:8.1f} ms", file=stream)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단일 브라우저 다중 탭 실행
+WebDriver 명령은 한 번에 하나씩만 보낼 수 있으므로, 여러 탭에 페이지 로딩을 걸어 두고
+로딩이 끝난 탭부터 전환해 액션을 수행 (브라우저 프로세스를 늘리지 않고 로딩 대기 시간을 겹침)
+
+탭은 window.open 으로 열어 탭 열기가 로딩 완료를 기다리지 않도록 함 (드라이버의 page_load_strategy 는 바꾸지 않음)
+로딩 완료는 탭마다 is_ready 로 명시적으로 확인 - page_load_strategy 가 normal 이면 로딩 중인 탭으로 전환한 뒤의
+명령은 그 탭의 로딩이 끝날 때까지 막히지만, 그동안 다른 탭의 로딩은 계속 진행됨
+"""
+
+import time
+
+
+class TabScheduler:
+    """탭 단위 작업 스케줄러"""
+
+    def __init__(self, driver, logger, max_tabs=4, poll_interval=0.1):
+        self.driver = driver
+        self.logger = logger
+        self.max_tabs = max(1, int(max_tabs))
+        self.poll_interval = poll_interval
+
+    def run(self, jobs, is_ready, on_ready, on_failure):
+        """jobs: (job, url, timeout) 반복자 - 탭이 비면 다음 작업을 가져옴
+
+        현재 창이 작업의 탭으로 전환된 상태에서 콜백 호출:
+          is_ready(job) -> 로딩 완료 여부, on_ready(job) -> 액션 수행, on_failure(job, reason)
+        """
+        driver = self.driver
+        home = driver.current_window_handle
+        jobs = iter(jobs)
+        active = []
+        exhausted = False
+
+        try:
+            while active or not exhausted:
+                # 빈 탭 슬롯 채우기
+                while not exhausted and len(active) < self.max_tabs:
+                    item = next(jobs, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    job, url, timeout = item
+                    try:
+                        handle = self._open_tab(url, home)
+                    except Exception as e:
+                        on_failure(job, f"탭 열기 실패: {e}")
+                        continue
+                    active.append({"job": job, "handle": handle, "deadline": time.monotonic() + timeout})
+
+                progressed = False
+                for tab in list(active):
+                    driver.switch_to.window(tab["handle"])
+                    try:
+                        ready = is_ready(tab["job"])
+                    except Exception:
+                        # 페이지 전환 중에는 스크립트/탐색 명령이 실패할 수 있음
+                        ready = False
+                    if ready:
+                        try:
+                            on_ready(tab["job"])
+                        except Exception as e:
+                            on_failure(tab["job"], str(e))
+                    elif time.monotonic() > tab["deadline"]:
+                        on_failure(tab["job"], "페이지 로딩 타임아웃")
+                    else:
+                        continue
+                    self._close_current(home)
+                    active.remove(tab)
+                    progressed = True
+
+                if not progressed and active:
+                    time.sleep(self.poll_interval)
+        finally:
+            for tab in active:
+                try:
+                    driver.switch_to.window(tab["handle"])
+                    driver.close()
+                except Exception:
+                    pass
+            driver.switch_to.window(home)
+
+    def _open_tab(self, url, home):
+        """새 탭에서 url 로딩 시작 - 로딩을 기다리지 않고 새 탭의 핸들 반환
+
+        로딩 중인 탭에서 스크립트를 실행하면 그 탭의 로딩을 기다리므로 로딩이 끝난 시작 창에서 엶
+        """
+        self.driver.switch_to.window(home)
+        before = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+        opened = [handle for handle in self.driver.window_handles if handle not in before]
+        if not opened:
+            raise RuntimeError("새 탭이 열리지 않았습니다 (팝업 차단)")
+        return opened[0]
+
+    def _close_current(self, home):
+        try:
+            if self.driver.current_window_handle != home:
+                self.driver.close()
+        except Exception as e:
+            self.logger.debug("탭 닫기 실패: %s", e)
+        self.driver.switch_to.window(home)
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""테스트 공통 설정 - finish/ 와 상위 gemini/ 의 모듈을 bare name 으로 import"""
+
+import os
+import sys
+
+FINISH_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (FINISH_DIR, os.path.dirname(FINISH_DIR)):
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""job_queue.SqliteJobQueue / JobResultCollector"""
+
+import pytest
+
+from job_queue import DONE, FAILED, PENDING, JobResultCollector, LeaseLost, RedisJobQueue, SqliteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    job_queue = SqliteJobQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    yield job_queue
+    job_queue.close()
+
+
+def status_of(job_queue, job_id):
+    return next(row for row in job_queue.results() if row["id"] == job_id)
+
+
+def test_lease_complete(queue):
+    job_id = queue.enqueue({"target_index": 0})
+    job = queue.lease("w1")
+    assert job == {"id": job_id, "payload": {"target_index": 0}, "attempts": 1}
+    # 임대 중인 작업은 다른 워커가 가져가지 못함
+    assert queue.lease("w2") is None
+    assert queue.complete(job_id, "w1", {"success": True})
+    assert status_of(queue, job_id)["status"] == DONE
+
+
+def test_only_lease_owner_can_report(queue):
+    job_id = queue.enqueue({})
+    queue.lease("w1")
+    assert not queue.complete(job_id, "w2", {"success": True})
+    assert not queue.extend(job_id, "w2")
+    assert queue.extend(job_id, "w1")
+
+
+def test_expired_lease_moves_to_another_worker(queue):
+    job_id = queue.enqueue({})
+    queue.lease("w1", visibility_timeout=-1)
+    job = queue.lease("w2")
+    assert job["id"] == job_id and job["attempts"] == 2
+    # 임대를 잃은 워커의 보고는 반영되지 않음
+    assert not queue.fail(job_id, "w1", {"success": False})
+    assert queue.complete(job_id, "w2", {"success": True})
+
+
+def test_failed_job_retried_until_attempts_exhausted(queue):
+    job_id = queue.enqueue({})
+    queue.lease("w1")
+    assert queue.fail(job_id, "w1", {"success": False})
+    assert status_of(queue, job_id)["status"] == PENDING
+    queue.lease("w1")
+    assert queue.fail(job_id, "w1", {"success": False})
+    assert status_of(queue, job_id)["status"] == FAILED
+    assert queue.lease("w1") is None
+
+
+def test_expired_last_attempt_is_failed(queue):
+    job_id = queue.enqueue({})
+    queue.lease("w1", visibility_timeout=-1)
+    queue.lease("w2", visibility_timeout=-1)
+    assert queue.lease("w3") is None
+    row = status_of(queue, job_id)
+    assert row["status"] == FAILED
+    assert row["result"] == {"error": "최대 시도 횟수 초과"}
+
+
+def test_collector_raises_when_lease_lost(queue):
+    job_id = queue.enqueue({})
+    queue.lease("w1")
+    # 연장한 임대가 바로 만료되도록 음수 visibility timeout
+    collector = JobResultCollector(queue, job_id, "w1", -1)
+    collector.record_action("key", 0, {"results": [1]})
+    assert collector.outputs == {0: {"results": [1]}}
+
+    assert queue.lease("w2")["id"] == job_id
+    with pytest.raises(LeaseLost):
+        collector.record_action("key", 1, {"results": [2]})
+    assert 1 not in collector.outputs
+
+
+def test_redis_queue_requires_eval():
+    class NoScripting:
+        def eval(self, *args):
+            raise Exception("unknown command 'eval'")
+
+    with pytest.raises(RuntimeError):
+        RedisJobQueue(NoScripting())
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""network_capture JSONPath 부분 구현"""
+
+import pytest
+
+from network_capture import find_jsonpath, parse_jsonpath
+
+DOCUMENT = {
+    "data": {
+        "items": [
+            {"name": "사과", "price": 1000, "tags": ["과일"]},
+            {"name": "배", "price": 2000, "detail": {"name": "신고배"}},
+            {"name": "감", "price": 1500},
+        ],
+        "total-count": 3,
+    }
+}
+
+
+def query(path):
+    return find_jsonpath(parse_jsonpath(path), DOCUMENT)
+
+
+def test_root():
+    assert query("$") == [DOCUMENT]
+
+
+def test_keys_and_quoted_keys():
+    assert query("$.data.total-count") == [3]
+    assert query("$['data'][\"total-count\"]") == [3]
+
+
+def test_indexes_and_slices():
+    assert query("$.data.items[0].name") == ["사과"]
+    assert query("$.data.items[-1].name") == ["감"]
+    assert query("$.data.items[5].name") == []
+    assert query("$.data.items[1:].price") == [2000, 1500]
+    assert query("$.data.items[:1].price") == [1000]
+
+
+def test_wildcards():
+    assert query("$.data.items[*].price") == [1000, 2000, 1500]
+    assert query("$.data.items.*.price") == [1000, 2000, 1500]
+
+
+def test_recursive_descent():
+    assert query("$..name") == ["사과", "배", "신고배", "감"]
+    assert query("$.data.items[0]..*") == ["사과", 1000, ["과일"], "과일"]
+
+
+def test_missing_path_is_empty():
+    assert query("$.data.nothing[*]") == []
+
+
+@pytest.mark.parametrize("path", ["data.items", "$.data[?(@.price)]", "$.data.items["])
+def test_unsupported_syntax(path):
+    with pytest.raises(ValueError):
+        parse_jsonpath(path)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""설정 생성 프롬프트의 대상 페이지 구조 요약"""
+
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import dom_summary
+from gemini_config_gen import GeminiConfigGenerator
+
+SUMMARY = "form#search: input[name=q], button.submit"
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return FakeResponse(json.dumps({"targets": []}))
+
+    def count_tokens(self, prompt):
+        raise RuntimeError("오프라인")
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    fetched = []
+
+    def fetch_page_summary(url, logger=None, browser=None, max_chars=3000):
+        fetched.append(url)
+        return SUMMARY
+
+    monkeypatch.setattr(dom_summary, "fetch_page_summary", fetch_page_summary)
+    gen = GeminiConfigGenerator(api_key="test", max_retries=1, temp_dir=str(tmp_path))
+    gen._model = FakeModel()
+    gen.fetched = fetched
+    return gen
+
+
+def test_prompt_with_target_url_contains_page_summary(generator):
+    generator.generate_config("검색 결과 추출", user_url="https://example.com")
+
+    assert generator.fetched == ["https://example.com"]
+    prompt = generator._model.prompts[0]
+    assert "실제 대상 페이지 구조 요약" in prompt
+    assert SUMMARY in prompt
+
+
+def test_prompt_without_url_skips_page_summary(generator):
+    generator.generate_config("검색 결과 추출")
+
+    assert generator.fetched == []
+    assert "실제 대상 페이지 구조 요약" not in generator._model.prompts[0]
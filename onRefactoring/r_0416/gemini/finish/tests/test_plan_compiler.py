@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""plan_compiler: 컴파일, JSON 캐시, 세션 건너뛰기"""
+
+import json
+import os
+
+import pytest
+
+from plan_compiler import PLAN_CACHE_KEEP, _prune_cache, compile_plan, load_compiled
+
+CONFIG = {
+    "targets": [
+        {
+            "name": "로그인 후 추출",
+            "url": "https://example.com",
+            "wait_for": {"type": "id", "value": "main"},
+            "actions": [
+                {"type": "load_session", "name": "site"},
+                {"type": "input", "selector": {"type": "css", "value": "#user"}, "text": "id"},
+                {"type": "click", "selector": {"type": "text", "value": "로그인"}},
+                {"type": "save_session", "name": "site"},
+                {"type": "extract", "selector": "li.item"},
+                {"type": "capture_network", "url_pattern": "/api/"},
+                {"type": "extract_json", "source": "default", "path": "$.items[*].name"},
+                {"type": "click", "selector": {"type": "css", "value": " "}},
+            ],
+        }
+    ]
+}
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(CONFIG, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_compile_locators_and_errors():
+    target = compile_plan(CONFIG)[0]
+    actions = target.actions
+    assert target.wait == ("id", "main", 10)
+    assert actions[1].locator == ("css selector", "#user")
+    assert actions[2].locator[0] == "xpath" and "로그인" in actions[2].locator[1]
+    assert actions[4].locator == ("css selector", "li.item")
+    assert actions[6].params["path"] == (("key", "items"), ("wild", None), ("key", "name"))
+    assert actions[7].error is not None
+    assert all(action.error is None for action in actions[:7])
+
+
+def test_load_session_skips_to_after_save_session():
+    actions = compile_plan(CONFIG)[0].actions
+    assert actions[0].params["skip_to"] == 4
+
+
+def test_params_are_read_only():
+    action = compile_plan(CONFIG)[0].actions[1]
+    with pytest.raises(TypeError):
+        action.params["text"] = "다른 값"
+
+
+def test_cache_round_trip(config_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    config, plan = load_compiled(config_path, cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached_config, cached_plan = load_compiled(config_path, cache_dir)
+    assert cached_config == config
+    assert cached_plan == plan
+    action = cached_plan[0].actions[5]
+    assert action.params["url_pattern"].search("/api/list")
+    with pytest.raises(TypeError):
+        action.params["timeout"] = 0
+
+
+def test_cache_invalidated_when_config_changes(config_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    load_compiled(config_path, cache_dir)
+    changed = dict(CONFIG, targets=[dict(CONFIG["targets"][0], name="변경됨")])
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(changed, f, ensure_ascii=False)
+
+    _, plan = load_compiled(config_path, cache_dir)
+    assert plan[0].name == "변경됨"
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_corrupt_cache_is_recompiled(config_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    load_compiled(config_path, str(cache_dir))
+    cache_file = next(cache_dir.iterdir())
+    cache_file.write_text("{", encoding="utf-8")
+
+    _, plan = load_compiled(config_path, str(cache_dir))
+    assert plan[0].name == "로그인 후 추출"
+
+
+def test_prune_keeps_most_recent(tmp_path):
+    for index in range(PLAN_CACHE_KEEP + 3):
+        path = tmp_path / f"{index:02d}.json"
+        path.write_text("{}")
+        os.utime(path, (index, index))
+    (tmp_path / "old.pickle").write_bytes(b"")
+
+    _prune_cache(str(tmp_path))
+    remaining = sorted(path.name for path in tmp_path.iterdir())
+    assert len(remaining) == PLAN_CACHE_KEEP
+    assert "00.json" not in remaining and "old.pickle" not in remaining
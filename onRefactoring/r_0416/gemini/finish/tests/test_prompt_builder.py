@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""prompt_builder: 토큰 추정, 섹션 자르기, count_tokens 호출 조건"""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from prompt_builder import (
+    COUNT_TOKENS_MARGIN, TRUNCATION_MARKER, PromptBudgetMixin, PromptBuilder, compact_template, estimate_tokens,
+    minify_json,
+)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("한글") == 2
+
+
+def test_minify_and_compact():
+    template = {"targets": [{"url": "https://example.com"}], "selectors": {}, "actions": [], "name": ""}
+    assert compact_template(template) == {"targets": [{"url": "https://example.com"}]}
+    assert minify_json({"a": [1, 2], "b": "값"}) == '{"a":[1,2],"b":"값"}'
+
+
+def test_within_budget_is_unchanged():
+    builder = PromptBuilder(budget=100).add("지시문").add("  들여쓴 줄\n\n\n\n다음 줄", priority=0)
+    assert builder.build() == "지시문\n\n들여쓴 줄\n\n다음 줄"
+    assert builder.tokens == builder.original_tokens
+
+
+def test_lowest_priority_truncated_first():
+    builder = PromptBuilder(budget=60)
+    builder.add("필수 " * 10)
+    builder.add("context " * 40, priority=1)
+    builder.add("summary " * 40, priority=0)
+    prompt = builder.build()
+
+    assert builder.tokens <= 60
+    assert builder.original_tokens > 60
+    assert prompt.startswith("필수")
+    # priority 0 섹션을 모두 잘라도 부족하면 다음 섹션의 뒷부분을 잘라냄
+    assert "summary" not in prompt
+    assert "context" in prompt and prompt.endswith(TRUNCATION_MARKER)
+
+
+def test_required_sections_never_truncated():
+    builder = PromptBuilder(budget=5).add("a" * 100).add("b" * 100, priority=0)
+    prompt = builder.build()
+    assert prompt == "a" * 100
+    assert builder.tokens > builder.budget
+
+
+class Generator(PromptBudgetMixin):
+    def __init__(self, budget, actual_ratio):
+        self.prompt_budget = budget
+        self.logger = logging.getLogger("test_prompt_builder")
+        self.calls = []
+
+        def count_tokens(prompt):
+            self.calls.append(prompt)
+            return SimpleNamespace(total_tokens=int(estimate_tokens(prompt) * actual_ratio))
+
+        self.model = SimpleNamespace(count_tokens=count_tokens)
+
+
+def builder_for(budget, required_tokens, elastic_tokens):
+    return (PromptBuilder(budget)
+            .add("x" * (required_tokens * 4))
+            .add("y" * (elastic_tokens * 4), priority=0))
+
+
+def test_far_below_budget_skips_count_tokens():
+    generator = Generator(budget=1000, actual_ratio=1.0)
+    generator._finish_prompt(builder_for(1000, 100, 100), "테스트")
+    assert generator.calls == []
+
+
+def test_near_budget_counts_once():
+    generator = Generator(budget=1000, actual_ratio=1.0)
+    builder = builder_for(1000, 100, 2000)
+    generator._finish_prompt(builder, "테스트")
+    assert builder.tokens >= 1000 * (1 - COUNT_TOKENS_MARGIN)
+    assert len(generator.calls) == 1
+
+
+def test_underestimate_retruncates_without_recounting():
+    generator = Generator(budget=1000, actual_ratio=1.25)
+    builder = builder_for(1000, 100, 2000)
+    prompt = generator._finish_prompt(builder, "테스트")
+    assert len(generator.calls) == 1
+    assert estimate_tokens(prompt) * 1.25 <= 1000
+
+
+def test_page_summary_section():
+    generator = Generator(budget=1000, actual_ratio=1.0)
+    generator.page_summary = ""
+    assert generator._page_summary_section() == ""
+    generator.page_summary = "form#search"
+    assert "form#search" in generator._page_summary_section()
+
+
+@pytest.mark.parametrize("enabled, url, task", [(False, "https://example.com", ""), (True, None, "URL 없는 작업")])
+def test_page_summary_not_loaded(enabled, url, task):
+    generator = Generator(budget=1000, actual_ratio=1.0)
+    generator.page_summary_enabled = enabled
+    generator.user_url = url
+    assert generator._load_page_summary(task) == ""
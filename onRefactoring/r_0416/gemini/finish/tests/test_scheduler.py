@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""scheduler.CronSchedule"""
+
+from datetime import datetime
+
+import pytest
+
+from scheduler import CronSchedule
+
+
+def test_every_ten_minutes():
+    schedule = CronSchedule("*/10 * * * *")
+    assert schedule.next_run(datetime(2024, 5, 1, 12, 3, 45)) == datetime(2024, 5, 1, 12, 10)
+    # 정각에 맞아도 다음 실행은 그 이후
+    assert schedule.next_run(datetime(2024, 5, 1, 12, 10)) == datetime(2024, 5, 1, 12, 20)
+
+
+def test_ranges_and_lists():
+    schedule = CronSchedule("0,30 9-17/4 * * *")
+    assert schedule.fields[0] == {0, 30}
+    assert schedule.fields[1] == {9, 13, 17}
+    assert schedule.next_run(datetime(2024, 5, 1, 17, 31)) == datetime(2024, 5, 2, 9, 0)
+
+
+def test_sunday_as_zero_or_seven():
+    # 2024-05-05 는 일요일
+    for expression in ("0 8 * * 0", "0 8 * * 7"):
+        assert CronSchedule(expression).next_run(datetime(2024, 5, 1)) == datetime(2024, 5, 5, 8, 0)
+
+
+def test_day_or_weekday_when_both_restricted():
+    schedule = CronSchedule("0 0 15 * 1")
+    # 2024-05-06 월요일이 15일보다 먼저
+    assert schedule.next_run(datetime(2024, 5, 1)) == datetime(2024, 5, 6)
+    assert schedule.matches(datetime(2024, 5, 15))
+
+
+def test_day_and_weekday_when_one_is_wildcard():
+    schedule = CronSchedule("0 0 */2 * 1")
+    assert not schedule.day_or_weekday
+    # 홀수 날짜인 월요일 중 첫 번째: 2024-05-13
+    assert schedule.next_run(datetime(2024, 5, 1)) == datetime(2024, 5, 13)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
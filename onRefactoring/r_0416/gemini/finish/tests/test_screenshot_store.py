@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""screenshot_store.ScreenshotStore 중복 제거"""
+
+import os
+import zlib
+import struct
+
+from screenshot_store import HAS_PILLOW, ScreenshotStore, hamming, link_frame
+
+
+def png(shade=0, size=64, step=4):
+    """가로 그라데이션 회색조 PNG (Pillow 없이 생성)"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes((x * step + shade) % 256 for x in range(size))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * size)) + chunk(b"IEND", b""))
+
+
+IMAGE_A = png()
+# 밝기 방향이 반대인 화면
+IMAGE_B = png(step=-4)
+
+
+def test_same_key_same_content_reuses_frame(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+    first, stored = store.add("run1", "목록#0", IMAGE_A, ".png")
+    assert stored
+    second, stored = store.add("run2", "목록#0", IMAGE_A, ".png")
+    assert not stored
+    assert second == first
+    assert len(os.listdir(store.frames_dir)) == 1
+
+
+def test_changed_content_is_stored(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+    first, _ = store.add("run1", "목록#0", IMAGE_A, ".png")
+    second, stored = store.add("run2", "목록#0", IMAGE_B, ".png")
+    assert stored and second != first
+
+
+def test_keys_are_compared_separately(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+    store.add("run1", "목록#0", IMAGE_A, ".png")
+    # 다른 키의 직전 프레임과는 비교하지 않음 (내용이 같으면 같은 프레임 파일은 공유)
+    path, stored = store.add("run1", "상세#1", IMAGE_A, ".png")
+    assert stored
+    assert len(os.listdir(store.frames_dir)) == 1
+    assert store.runs() == {"run1": {"목록#0": os.path.basename(path), "상세#1": os.path.basename(path)}}
+
+
+def test_index_survives_reload(tmp_path):
+    ScreenshotStore(str(tmp_path)).add("run1", "목록#0", IMAGE_A, ".png")
+    with open(os.path.join(str(tmp_path), "index.jsonl"), "a", encoding="utf-8") as f:
+        # 동시 기록 중 잘린 줄
+        f.write('{"run_id": "run')
+
+    reloaded = ScreenshotStore(str(tmp_path))
+    _, stored = reloaded.add("run2", "목록#0", IMAGE_A, ".png")
+    assert not stored
+
+
+def test_link_frame_replaces_output(tmp_path):
+    store = ScreenshotStore(str(tmp_path / "store"))
+    frame, _ = store.add("run1", "목록#0", IMAGE_A, ".png")
+    output = tmp_path / "shot.png"
+    output.write_bytes(b"old")
+    link_frame(frame, str(output))
+    assert output.read_bytes() == IMAGE_A
+
+
+def test_hamming():
+    assert hamming(0b1011, 0b0001) == 2
+
+
+def test_perceptual_hash_ignores_small_changes(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+    store.add("run1", "목록#0", png(shade=0), ".png")
+    # 내용 해시는 다르지만 (Pillow 가 있으면) 화면은 거의 같음
+    _, stored = store.add("run2", "목록#0", png(shade=1), ".png")
+    assert stored is not HAS_PILLOW
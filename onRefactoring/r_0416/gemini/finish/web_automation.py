@@ -6,28 +6,41 @@
 사용자가 config.json 파일을 통해 유동적으로 설정 가능
 """
 
+import time
+
+# --profile-startup 용: 모듈 로드 시작 시각
+_MODULE_LOAD_STARTED = time.perf_counter()
+
 import os
 import sys
-import time
 import json
-import logging
 import argparse
-import uuid
-import tempfile
 from datetime import datetime
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+# selenium 모듈은 실제로 필요한 코드 경로에서만 import (--enqueue 등은 selenium 없이 동작)
+from logger_manager import LoggerManager
+from checkpoint_manager import CheckpointManager, target_key
+from retry_policy import RetryPolicy, host_of
+from job_queue import open_queue, build_jobs, JobResultCollector, LeaseLost
+from scheduler import ConfigScheduler
+from startup_profiler import profile_imports, print_startup_report
+from plan_compiler import (
+    resolve_by, compile_action, compile_target, compile_plan, report_plan_issues, load_compiled
+)
+from output_writer import OutputWriter
+from change_detector import detect_changes
+from http_cache import cacheable, conditional_fetch, store_fetch
+from tab_scheduler import TabScheduler
+from cdp_backend import cdp_backend_for
+import network_capture
+import session_store
+import dom_summary
+from profile_manager import build_template
+from webdrive_manager import backend_for
+from element_cache import ElementCache, prefetch_locators
+from selector_healing import run_with_fallbacks, open_store, candidate_locators
+import process_supervisor
+from health_monitor import HealthMonitor, count_targets
 
 # 기본 설정값
 DEFAULT_CONFIG = {
@@ -69,25 +82,22 @@ DEFAULT_CONFIG = {
     }
 }
 
+# 브라우저별로 실제 실행 시 import 되는 모듈 (--profile-startup 측정 대상)
+STARTUP_MODULES = {
+    browser: [
+        "selenium.webdriver",
+        f"selenium.webdriver.{browser}.options",
+        "selenium.webdriver.common.by",
+        "selenium.webdriver.support.ui",
+        "selenium.webdriver.support.expected_conditions",
+        "psutil",
+    ]
+    for browser in ("chrome", "firefox", "edge")
+}
+
 def setup_logging(config):
-    """로깅 설정"""
-    log_level = getattr(logging, config["output"].get("log_level", "INFO"))
-    log_dir = config["output"].get("logs_dir", "logs")
-    
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    log_file = os.path.join(log_dir, f"automation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-    
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
-    return logging.getLogger("web_automation")
+    """로깅 설정 (구조화/비동기 로깅은 LoggerManager 참고)"""
+    return LoggerManager.setup_logging(config)
 
 def load_config(config_path="config.json"):
     """설정 파일 로드"""
@@ -110,250 +120,628 @@ def load_config(config_path="config.json"):
         print("기본 설정을 사용합니다.")
         return DEFAULT_CONFIG
 
-def setup_driver(config, logger=None):
-    import tempfile
-    import psutil
-    from selenium.webdriver.chrome.options import Options as ChromeOptions
-    from selenium.webdriver.firefox.options import Options as FirefoxOptions
-    from selenium.webdriver.edge.options import Options as EdgeOptions
-
-    browser_config = config["browser"]
-    browser_type = browser_config.get("type", "chrome").lower()
-    headless = browser_config.get("headless", True)
-    browser_options = browser_config.get("options", [])
-
-    if browser_type == "chrome":
-        # user_data_dir 생성
-        user_data_dir = tempfile.mkdtemp(prefix=f'chrome_{uuid.uuid4().hex}_')
-        logger.info(f"생성된 user-data-dir: {user_data_dir}")
-
-        options = ChromeOptions()
-        options.add_argument(f"--user-data-dir={user_data_dir}")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        if headless:
-            options.add_argument("--headless=new")
-        for opt in browser_options:
-            if not opt.startswith("--user-data-dir="):
-                options.add_argument(opt)
-
-        max_retries = int(config["browser"].get("retries", 5))
-        for attempt in range(max_retries):
-            try:
-                driver = webdriver.Chrome(options=options)
-                driver.user_data_dir = user_data_dir
-                return driver
-            except WebDriverException as e:
-                if "user data directory is already in use" in str(e) and attempt < max_retries - 1:
-                    logger.warning(f"시도 {attempt+1}/{max_retries}: Chrome 프로세스 정리 시도")
-                    _cleanup_chrome_processes(user_data_dir, logger)
-                    time.sleep(2)
-                    continue
-                raise
-
-    elif browser_type == "firefox":
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-        for option in browser_options:
-            options.add_argument(option)
-        return webdriver.Firefox(options=options)
-
-    elif browser_type == "edge":
-        options = EdgeOptions()
-        if headless:
-            options.add_argument("--headless")
-        for option in browser_options:
-            options.add_argument(option)
-        return webdriver.Edge(options=options)
+def setup_driver(config, logger=None, user_data_dir=None):
+    """드라이버 생성 - user_data_dir 를 지정하면 그 프로필을 그대로 사용 (종료 시 삭제하지 않음)
 
-    else:
-        raise ValueError(f"지원되지 않는 브라우저 유형: {browser_type}")
-
-def _cleanup_chrome_processes(user_data_dir, logger):
-    """특정 user-data-dir을 사용하는 Chrome 프로세스 종료"""
-    import psutil
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            if 'chrome' in proc.info['name'].lower() and \
-               any(f'--user-data-dir={user_data_dir}' in cmd for cmd in proc.info['cmdline']):
-                logger.info(f"종료 대상 프로세스: PID={proc.pid}, CMD={' '.join(proc.info['cmdline'])}")
-                proc.terminate()
-                try:
-                    proc.wait(3)
-                except psutil.TimeoutExpired:
-                    logger.warning(f"강제 종료: PID={proc.pid}")
-                    proc.kill()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+    브라우저별 옵션/프로필/재시도는 webdrive_manager 의 백엔드가 처리
+    """
+    return backend_for(config, logger).launch(user_data_dir)
 
 def get_by_method(selector_type):
     """셀렉터 타입에 따른 By 메서드 반환"""
-    selector_map = {
-        'id': By.ID,
-        'class_name': By.CLASS_NAME,
-        'css': By.CSS_SELECTOR,
-        'xpath': By.XPATH,
-        'tag_name': By.TAG_NAME,
-        'name': By.NAME,
-        'link_text': By.LINK_TEXT,
-        'partial_link_text': By.PARTIAL_LINK_TEXT
-    }
-    
-    return selector_map.get(selector_type.lower(), By.CSS_SELECTOR)
+    return resolve_by(selector_type)
 
-def take_screenshot(driver, filename, config):
+def take_screenshot(driver, filename, config, writer=None):
     """화면 캡처"""
-    screenshots_dir = config["output"].get("screenshots_dir", "screenshots")
-    
-    if not os.path.exists(screenshots_dir):
-        os.makedirs(screenshots_dir)
+    if writer is None:
+        writer = OutputWriter(config)
     
     if filename is None:
         filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
     
-    screenshot_path = os.path.join(screenshots_dir, filename)
+    screenshot_path = writer.path("screenshots_dir", filename)
     driver.save_screenshot(screenshot_path)
     return screenshot_path
 
-def perform_action(driver, action, config, logger):
-    """설정된 액션 수행"""
-    action_type = action.get("type", "").lower()
-    
-    if action_type == "screenshot":
-        filename = action.get("filename")
-        screenshot_path = take_screenshot(driver, filename, config)
-        logger.info(f"스크린샷 저장: {screenshot_path}")
-    
-    elif action_type == "input":
-        selector = action.get("selector", {})
-        selector_type = selector.get("type", "css")
-        selector_value = selector.get("value", "")
-        text = action.get("text", "")
-        submit = action.get("submit", False)
-        
-        element = driver.find_element(get_by_method(selector_type), selector_value)
-        element.clear()
-        element.send_keys(text)
-        
-        if submit:
-            element.send_keys(Keys.RETURN)
-        
-        logger.info(f"입력 완료: '{text}' (제출: {submit})")
-    
-    elif action_type == "click":
-        selector = action.get("selector", {})
-        selector_type = selector.get("type", "css")
-        selector_value = selector.get("value", "")
-        
-        element = driver.find_element(get_by_method(selector_type), selector_value)
-        element.click()
-        
-        logger.info(f"클릭 완료: {selector_value}")
+def _action_screenshot(driver, action, config, logger, writer):
+    # 인코딩/기록은 스크린샷 파이프라인의 백그라운드 스레드에서 처리
+    screenshot_path = writer.screenshots.capture(
+        driver, action.params["filename"], action.locator, action.params["full_page"], action.params["frame_key"]
+    )
+    logger.info("스크린샷 저장: %s", screenshot_path)
+    return screenshot_path
+
+def _element_cache(driver):
+    """현재 대상의 요소 캐시 (대상 처리 밖에서 호출되면 임시 캐시)"""
+    return getattr(driver, "element_cache", None) or ElementCache(driver)
+
+def _action_input(driver, action, config, logger, writer):
+    text = action.params["text"]
+    submit = action.params["submit"]
+
+    backend = cdp_backend_for(driver, config)
+    if backend:
+        run_with_fallbacks(action, config, logger, lambda locator: backend.input(locator, text, submit))
+    else:
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+
+            if submit:
+                from selenium.webdriver.common.keys import Keys
+                element.send_keys(Keys.RETURN)
+
+        cache = _element_cache(driver)
+        run_with_fallbacks(action, config, logger, lambda locator: cache.use(locator, type_text))
+
+    logger.info("입력 완료: '%s' (제출: %s)", text, submit)
+
+def _action_click(driver, action, config, logger, writer):
+    backend = cdp_backend_for(driver, config)
+    if backend:
+        run_with_fallbacks(action, config, logger, backend.click)
+    else:
+        cache = _element_cache(driver)
+        run_with_fallbacks(action, config, logger, lambda locator: cache.use(locator, lambda element: element.click()))
+
+    logger.info("클릭 완료: %s", action.locator[1])
+
+def _action_wait(driver, action, config, logger, writer):
+    seconds = action.params["seconds"]
+    time.sleep(seconds)
+    logger.info("%s초 대기 완료", seconds)
+
+def _action_extract(driver, action, config, logger, writer):
+    attribute = action.params["attribute"]
+
+    backend = cdp_backend_for(driver, config)
+    if backend:
+        def collect(locator):
+            return backend.extract(locator, attribute)
+    else:
+        cache = _element_cache(driver)
+
+        def collect(locator):
+            return cache.use(locator, lambda elements: [
+                element.get_attribute(attribute) if attribute else element.text for element in elements
+            ], many=True)
+
+    # 결과가 비면 대체 셀렉터 시도
+    results = run_with_fallbacks(action, config, logger, collect, is_empty=lambda found: not found)
+
+    logger.info("데이터 추출 완료: %d개 항목", len(results))
+    return _save_extract(action, results, config, logger, writer)
+
+def _save_extract(action, results, config, logger, writer):
+    """추출 결과 저장 (extract / extract_json 공통) - 체크포인트에 기록할 결과 반환"""
+    output = {"results": results}
+
+    # 변경 감지 모드: 직전 실행과 달라진 항목만 기록
+    detect = action.params["detect_changes"]
+    if detect is None:
+        detect = config["output"].get("change_detection", False)
+    if detect:
+        diff = detect_changes(writer, action.params["change_key"], results)
+        output["changed"] = diff is not None
+        if diff is None:
+            logger.info("추출 결과 변경 없음 - 저장 생략")
+            return output
+        base = os.path.splitext(action.params["output_file"] or f"extract_{action.params['change_key']}")[0]
+        changes_path = writer.path("results_dir", f"{base.replace(' ', '_').replace('#', '_')}.changes.jsonl")
+        writer.append(changes_path, json.dumps(
+            dict(diff, key=action.params["change_key"], time=datetime.now().isoformat(timespec="seconds")),
+            ensure_ascii=False, default=str,
+        ) + "\n")
+        logger.info("추출 결과 변경: 추가 %d, 삭제 %d, 변경 %d -> %s",
+                    len(diff["added"]), len(diff["removed"]), len(diff["changed"]), changes_path)
+        output["changes_path"] = changes_path
+        return output
+
+    # 결과 저장 (대상 처리가 끝날 때 일괄 기록)
+    if action.params["save"]:
+        output_file = action.params["output_file"] or f"extract_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        output_path = writer.path("results_dir", output_file)
+        writer.write(output_path, "".join(
+            f"Item {idx+1}: {result if isinstance(result, str) else json.dumps(result, ensure_ascii=False)}\n"
+            for idx, result in enumerate(results)
+        ))
+
+        logger.info("추출 결과 저장: %s", output_path)
+        output["output_path"] = output_path
+    return output
+
+def _action_capture_network(driver, action, config, logger, writer):
+    params = action.params
+    captured = network_capture.capture(
+        driver, params["url_pattern"], params["resource_types"], params["timeout"], params["min_count"]
+    )
+    if len(captured) < params["min_count"]:
+        from selenium.common.exceptions import TimeoutException
+        raise TimeoutException(f"네트워크 응답 수집 실패: {params['url_pattern'].pattern} ({len(captured)}개)")
+
+    # 같은 대상의 extract_json 액션에서 사용
+    if not hasattr(driver, "network_captures"):
+        driver.network_captures = {}
+    driver.network_captures[params["name"]] = captured
+    logger.info("네트워크 응답 수집 완료: %s (%d개)", params["name"], len(captured))
+    return {"name": params["name"], "urls": [response["url"] for response in captured]}
+
+def _action_extract_json(driver, action, config, logger, writer):
+    source = action.params["source"]
+    captured = getattr(driver, "network_captures", {}).get(source)
+    if captured is None:
+        raise ValueError(f"수집된 네트워크 응답이 없습니다: {source} (capture_network 액션 필요)")
+
+    results = []
+    for response in captured:
+        results.extend(network_capture.find_jsonpath(action.params["path"], response["body"]))
+
+    logger.info("JSON 추출 완료: %d개 항목", len(results))
+    return _save_extract(action, results, config, logger, writer)
+
+def _action_load_session(driver, action, config, logger, writer):
+    params = action.params
+    path = session_store.session_path(config, params["name"])
+    try:
+        state = session_store.read_session(path, params["max_age"])
+    except RuntimeError as e:
+        logger.warning("세션 복원 불가 - 로그인 수행: %s", e)
+        return {"restored": False}
+    if state is None:
+        logger.info("저장된 세션 없음 또는 만료 - 로그인 수행: %s", params["name"])
+        return {"restored": False}
+
+    session_store.restore_session(driver, state, params["url"] or driver.current_url)
+    if not session_store.session_valid(driver, params["check_locator"], params["check_present"]):
+        logger.info("복원한 세션이 유효하지 않음 - 로그인 수행: %s", params["name"])
+        return {"restored": False}
+
+    logger.info("세션 복원 완료 - 로그인 액션 건너뜀: %s", params["name"])
+    return {"restored": True, "skip_to": params["skip_to"]}
+
+def _action_save_session(driver, action, config, logger, writer):
+    path = session_store.session_path(config, action.params["name"])
+    count = session_store.save_session(driver, path)
+    logger.info("세션 저장 완료: %s (쿠키 %d개)", path, count)
+    return {"saved": path, "cookies": count}
+
+def _action_scroll(driver, action, config, logger, writer):
+    if action.script:
+        backend = cdp_backend_for(driver, config)
+        if backend:
+            backend.execute(action.script)
+        else:
+            driver.execute_script(action.script)
+
+    logger.info("스크롤 완료: %s", action.params["target"])
+
+# 액션 타입 -> 처리 함수 (실행 계획 컴파일 시 타입이 확정되므로 문자열 비교 분기 없음)
+ACTION_HANDLERS = {
+    "screenshot": _action_screenshot,
+    "input": _action_input,
+    "click": _action_click,
+    "wait": _action_wait,
+    "extract": _action_extract,
+    "scroll": _action_scroll,
+    "capture_network": _action_capture_network,
+    "extract_json": _action_extract_json,
+    "load_session": _action_load_session,
+    "save_session": _action_save_session,
+}
+
+def perform_action(driver, action, config, logger, writer=None):
+    """설정된 액션 수행 - 체크포인트에 기록할 결과 반환
+
+    action 은 컴파일된 CompiledAction 또는 원본 dict (dict 이면 즉석에서 컴파일)
+    writer 를 넘기면 파일 기록은 writer.flush() 시점까지 미뤄짐 (없으면 즉시 기록)
+    """
+    if isinstance(action, dict):
+        action = compile_action(action)
+    if action.error:
+        raise ValueError(action.error)
+
+    handler = ACTION_HANDLERS.get(action.type)
+    if handler is None:
+        return None
+    if writer is not None:
+        return handler(driver, action, config, logger, writer)
+    writer = OutputWriter(config, logger, background=False)
+    try:
+        return handler(driver, action, config, logger, writer)
+    finally:
+        writer.close()
+
+def process_target(driver, target, config, logger, checkpoint=None, checkpoint_key=None, retry_policy=None,
+                   writer=None, failures=None):
+    """대상 사이트 처리 (target 은 CompiledTarget 또는 원본 dict)
+
+    대상 처리 중 생성된 결과 파일은 writer 에 모아 두었다가 끝날 때 한 번에 기록
+    failures 리스트를 넘기면 실패한 단계(이동/대기/액션)마다 오류와 주변 DOM 요약을 추가 (설정 자동 수정용)
+    """
+    if isinstance(target, dict):
+        target = compile_target(target, config)
+    if retry_policy is None:
+        retry_policy = RetryPolicy(config)
+    own_writer = writer is None
+    if own_writer:
+        writer = OutputWriter(config, logger, background=False)
+    try:
+        return _process_target(driver, target, config, logger, checkpoint, checkpoint_key, retry_policy, writer,
+                               failures)
+    except LeaseLost:
+        # 다른 워커가 같은 작업을 처리하므로 이 대상의 결과 파일은 기록하지 않음
+        writer.discard()
+        raise
+    finally:
+        if own_writer:
+            writer.close()
+        else:
+            writer.flush()
+
+def _record_failure(failures, driver, target, stage, error, action=None, locator=None):
+    """실패 정보 기록 - 셀렉터가 있으면 기대 위치 주변 DOM 요약 포함"""
+    if failures is None:
+        return
+    # WebDriverException 메시지의 문서 링크는 제외
+    lines = str(getattr(error, "msg", None) or error).strip().splitlines()
+    message = lines[0].split("; For documentation")[0] if lines else ""
+    failure = {
+        "target_index": target.index,
+        "target": target.name,
+        "url": target.url,
+        "stage": stage,
+        "error": f"{type(error).__name__}: {message}",
+    }
+    if action is not None:
+        failure["action_index"] = action.index
+        failure["action"] = action.raw
+    if stage != "navigate":
+        failure["dom"] = dom_summary.excerpt(driver, locator)
+    failures.append(failure)
+
+def _process_target(driver, target, config, logger, checkpoint, checkpoint_key, retry_policy, writer, failures=None):
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
+    name = target.name
+    url = target.url
+    host = host_of(url)
+    breaker = retry_policy.breaker
     
-    elif action_type == "wait":
-        seconds = action.get("seconds", 1)
-        time.sleep(seconds)
-        logger.info(f"{seconds}초 대기 완료")
+    logger.info("대상 처리 시작: %s (%s)", name, url, extra={"target": name})
     
-    elif action_type == "extract":
-        selector = action.get("selector", {})
-        selector_type = selector.get("type", "css")
-        selector_value = selector.get("value", "")
-        attribute = action.get("attribute", None)
-        
-        elements = driver.find_elements(get_by_method(selector_type), selector_value)
-        results = []
-        
-        for element in elements:
-            if attribute:
-                results.append(element.get_attribute(attribute))
-            else:
-                results.append(element.text)
-        
-        logger.info(f"데이터 추출 완료: {len(results)}개 항목")
-        
-        # 결과 저장
-        if action.get("save", False):
-            results_dir = config["output"].get("results_dir", "results")
-            if not os.path.exists(results_dir):
-                os.makedirs(results_dir)
-                
-            output_file = action.get("output_file", f"extract_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
-            output_path = os.path.join(results_dir, output_file)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for idx, result in enumerate(results):
-                    f.write(f"Item {idx+1}: {result}\n")
-            
-            logger.info(f"추출 결과 저장: {output_path}")
+    skipped, validators = _reuse_unchanged(target, config, logger, checkpoint, checkpoint_key, writer)
+    if skipped:
+        return True
     
-    elif action_type == "scroll":
-        target = action.get("target", "bottom")
-        amount = action.get("amount", None)
-        
-        if target == "bottom":
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        elif target == "top":
-            driver.execute_script("window.scrollTo(0, 0);")
-        elif amount:
-            driver.execute_script(f"window.scrollBy(0, {amount});")
-        
-        logger.info(f"스크롤 완료: {target}")
+    # 네트워크 응답 수집 대상은 이전 대상의 성능 로그를 비우고 시작
+    if any(action.type == "capture_network" for action in target.actions):
+        network_capture.drain(driver)
+        driver.network_captures = {}
 
-def process_target(driver, target, config, logger):
-    """대상 사이트 처리"""
-    name = target.get("name", "Unnamed Target")
-    url = target.get("url")
-    
-    logger.info(f"대상 처리 시작: {name} ({url})")
-    
     # URL 접근
-    driver.get(url)
+    try:
+        retry_policy.run(lambda: driver.get(url), {"type": "navigate"}, logger)
+    except Exception as e:
+        logger.error("페이지 접근 실패: %s - %s", url, e, extra={"target": name})
+        _record_failure(failures, driver, target, "navigate", e)
+        breaker.record_failure(host)
+        return False
     
     # 페이지 로딩 대기
-    wait_config = target.get("wait_for", {})
-    if wait_config:
-        selector_type = wait_config.get("type", "tag_name")
-        selector_value = wait_config.get("value", "body")
-        timeout = wait_config.get("timeout", config["timeouts"].get("default_wait", 10))
-        
+    if target.wait:
         try:
-            WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((get_by_method(selector_type), selector_value))
-            )
-            logger.info(f"페이지 로딩 완료: {url}")
-        except TimeoutException:
-            logger.error(f"페이지 로딩 타임아웃: {url}")
+            backend = cdp_backend_for(driver, config)
+            loaded = None
+            if backend:
+                try:
+                    # 브라우저 안에서 폴링 (CDP 명령 1회)
+                    loaded = backend.wait_for((target.wait.by, target.wait.value), target.wait.timeout)
+                except Exception as e:
+                    # 대기 중 페이지가 다시 이동하면 실행 컨텍스트가 사라짐 - WebDriver 대기로 전환
+                    logger.debug("CDP 대기 실패, WebDriver 대기 사용: %s", e)
+            if loaded is None:
+                WebDriverWait(driver, target.wait.timeout).until(
+                    EC.presence_of_element_located((target.wait.by, target.wait.value))
+                )
+            elif not loaded:
+                raise TimeoutException(f"{target.wait.by}={target.wait.value}")
+            logger.info("페이지 로딩 완료: %s", url, extra={"target": name})
+        except TimeoutException as e:
+            logger.error("페이지 로딩 타임아웃: %s", url, extra={"target": name})
+            _record_failure(failures, driver, target, "wait", e, locator=(target.wait.by, target.wait.value))
+            breaker.record_failure(host)
             return False
     
+    return _run_actions(driver, target, config, logger, checkpoint, checkpoint_key, retry_policy, writer, validators,
+                        failures)
+
+def _reuse_unchanged(target, config, logger, checkpoint, checkpoint_key, writer):
+    """조건부 요청: 페이지 내용이 직전과 같으면 직전 결과 사용 - (건너뜀 여부, 새 검증 정보)"""
+    if not (target.raw.get("conditional_fetch", config["output"].get("conditional_fetch", False))
+            and cacheable(target)):
+        return False, None
+    unchanged, entry, validators = conditional_fetch(
+        writer, target.url, config["timeouts"].get("page_load", 30), logger
+    )
+    if unchanged and entry.get("outputs") is not None:
+        logger.info("페이지 변경 없음 - 직전 결과 사용: %s", target.url, extra={"target": target.name})
+        if checkpoint is not None:
+            for action_index, output in sorted((int(k), v) for k, v in entry["outputs"].items()):
+                checkpoint.record_action(checkpoint_key, action_index, output)
+        return True, validators
+    return False, validators
+
+def _run_actions(driver, target, config, logger, checkpoint, checkpoint_key, retry_policy, writer, validators=None,
+                 failures=None):
+    """페이지 로딩이 끝난 현재 창에서 대상의 액션 수행 + 결과 저장"""
+    name = target.name
+    url = target.url
+    host = host_of(url)
+    breaker = retry_policy.breaker
+
+    # 새 페이지이므로 요소 캐시를 새로 만들고, 첫 DOM 변경 액션까지 쓰는 셀렉터를 한 번에 탐색
+    cache = driver.element_cache = ElementCache(driver)
+    if not cdp_backend_for(driver, config):
+        # 학습된 셀렉터가 있으면 그것을 먼저 탐색
+        store = open_store(config)
+        cache.prefetch(prefetch_locators(target.actions, lambda action: candidate_locators(action, store)[0]))
+
     # 작업 수행
-    actions = target.get("actions", [])
-    for action in actions:
+    changes = []
+    outputs = {}
+    next_index = 0
+    for action_index, action in enumerate(target.actions):
+        if action_index < next_index:
+            # 세션 복원으로 건너뛴 로그인 액션
+            continue
+        started = time.perf_counter()
         try:
-            perform_action(driver, action, config, logger)
+            output = retry_policy.run(lambda: perform_action(driver, action, config, logger, writer), action.raw, logger)
         except Exception as e:
-            logger.error(f"작업 수행 실패: {action.get('type')} - {e}")
+            cache.invalidate()
+            logger.error("작업 수행 실패: %s - %s", action.type, e,
+                         extra={"target": name, "action_index": action_index,
+                                "duration": round(time.perf_counter() - started, 3)})
+            _record_failure(failures, driver, target, "action", e, action, action.locator)
+            if breaker.record_failure(host):
+                logger.error("서킷 브레이커 열림: %s - 남은 작업 중단", host, extra={"target": name})
+                return False
+            validators = None
+            continue
+        breaker.record_success(host)
+        cache.after_action(action)
+        outputs[action_index] = output
+        logger.debug("작업 완료: %s", action.type,
+                     extra={"target": name, "action_index": action_index,
+                            "duration": round(time.perf_counter() - started, 3)})
+        if checkpoint is not None:
+            checkpoint.record_action(checkpoint_key, action_index, output)
+        if isinstance(output, dict) and "changed" in output:
+            changes.append(output["changed"])
+        if isinstance(output, dict) and output.get("skip_to"):
+            next_index = output["skip_to"]
+    logger.debug("요소 캐시: 적중 %d회, 탐색 %d회", cache.hits, cache.misses, extra={"target": name})
+
+    # 모든 액션이 성공한 경우에만 다음 조건부 요청용 결과 저장
+    store_fetch(writer, url, validators, outputs)
     
+    # 변경 감지 대상의 추출 결과가 모두 그대로면 결과 파일도 쓰지 않음
+    if changes and not any(changes):
+        logger.info("변경 없음 - 결과 저장 생략", extra={"target": name})
+        return True
+
     # 결과 저장
-    results_dir = config["output"].get("results_dir", "results")
-    if not os.path.exists(results_dir):
-        os.makedirs(results_dir)
-        
-    result_file = os.path.join(
-        results_dir, 
+    result_file = writer.path(
+        "results_dir",
         f"result_{name.replace(' ', '_').replace('/', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
     )
+    writer.write(result_file, (
+        f"대상: {name}\n"
+        f"URL: {url}\n"
+        f"제목: {driver.title}\n"
+        f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    ))
     
-    with open(result_file, "w", encoding='utf-8') as f:
-        f.write(f"대상: {name}\n")
-        f.write(f"URL: {url}\n")
-        f.write(f"제목: {driver.title}\n")
-        f.write(f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    
-    logger.info(f"결과 저장 완료: {result_file}")
+    logger.info("결과 저장 완료: %s", result_file, extra={"target": name})
     return True
 
+def process_targets_in_tabs(driver, targets, config, logger, retry_policy, writer, checkpoint=None, max_tabs=4,
+                            monitor=None):
+    """한 브라우저의 여러 탭에서 대상들을 동시에 처리 - ({대상 index: 성공 여부}, 계속 사용할 드라이버)
+
+    페이지 로딩은 탭별로 동시에 진행되고, 액션은 로딩이 끝난 탭부터 차례로 수행
+    capture_network 대상은 성능 로그가 탭 구분 없이 쌓이므로 탭 처리가 끝난 뒤 process_target 으로 하나씩 처리.
+    열린 탭이 있는 동안은 드라이버를 교체할 수 없으므로 상태 점검(monitor)은 탭 처리가 모두 끝난 뒤와
+    순차 처리 대상마다 수행 (monitor 가 없으면 처리 대상 수만 누적)
+    """
+    results = {}
+    sequential = [target for target in targets if any(action.type == "capture_network" for action in target.actions)]
+    tabbed = [target for target in targets if target not in sequential]
+
+    def after_targets(driver, count):
+        if monitor is None:
+            count_targets(driver, count)
+            return driver
+        return monitor.after_target(driver, count)
+
+    def finish(target, success):
+        results[target.index] = success
+        writer.flush()
+        if checkpoint is not None:
+            checkpoint.record_target(target_key(target.index, target.raw), success)
+
+    def jobs():
+        for target in tabbed:
+            key = target_key(target.index, target.raw)
+            if retry_policy.breaker.is_open(host_of(target.url)):
+                logger.warning("서킷 브레이커 열림 - 대상 건너뜀: %s", key)
+                continue
+            logger.info("대상 처리 시작: %s (%s)", target.name, target.url, extra={"target": target.name})
+            skipped, validators = _reuse_unchanged(target, config, logger, checkpoint, key, writer)
+            if skipped:
+                finish(target, True)
+                continue
+            timeout = target.wait.timeout if target.wait else config["timeouts"].get("page_load", 30)
+            yield (target, validators), target.url, timeout
+
+    def is_ready(job):
+        target, _ = job
+        if target.wait:
+            return bool(driver.find_elements(target.wait.by, target.wait.value))
+        return driver.execute_script("return document.readyState") == "complete"
+
+    def on_ready(job):
+        target, validators = job
+        logger.info("페이지 로딩 완료: %s", target.url, extra={"target": target.name})
+        key = target_key(target.index, target.raw)
+        finish(target, _run_actions(driver, target, config, logger, checkpoint, key, retry_policy, writer, validators))
+
+    def on_failure(job, reason):
+        target, _ = job
+        logger.error("대상 처리 실패: %s - %s", target.url, reason, extra={"target": target.name})
+        retry_policy.breaker.record_failure(host_of(target.url))
+        finish(target, False)
+
+    TabScheduler(driver, logger, max_tabs).run(jobs(), is_ready, on_ready, on_failure)
+    if results:
+        driver = after_targets(driver, len(results))
+
+    for target in sequential:
+        key = target_key(target.index, target.raw)
+        if retry_policy.breaker.is_open(host_of(target.url)):
+            logger.warning("서킷 브레이커 열림 - 대상 건너뜀: %s", key)
+            continue
+        finish(target, process_target(driver, target, config, logger, checkpoint, key, retry_policy, writer))
+        driver = after_targets(driver, 1)
+    return results, driver
+
+def teardown_driver(driver, logger):
+    """드라이버 종료 및 임시 user-data-dir 정리"""
+    try:
+        if driver:
+            driver.quit()
+            logger.info("드라이버 종료 완료")
+    except Exception as e:
+        logger.error("드라이버 종료 실패: %s", e)
+    finally:
+        # quit 실패/타임아웃으로 남은 브라우저 프로세스 그룹 정리
+        if driver:
+            process_supervisor.release(driver)
+
+    # 임시 프로필 정리
+    try:
+        if driver and hasattr(driver, "user_data_dir"):
+            import shutil
+            user_data_dir = driver.user_data_dir
+            if os.path.exists(user_data_dir):
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+                logger.info("임시 디렉터리 삭제: %s", user_data_dir)
+    except Exception as e:
+        logger.error("임시 디렉터리 삭제 실패: %s", e)
+
+def run_config_targets(driver, config, logger, plan=None):
+    """설정 파일의 모든 대상을 주어진 드라이버로 처리 (스케줄러 데몬용)"""
+    for section in ("output", "timeouts"):
+        config.setdefault(section, dict(DEFAULT_CONFIG[section]))
+    if plan is None:
+        plan = compile_plan(config, logger)
+    writer = OutputWriter(config, logger)
+    retry_policy = RetryPolicy(config)
+    results = []
+    try:
+        tabs = int(config["browser"].get("tabs", 1))
+        if tabs > 1:
+            done, _ = process_targets_in_tabs(driver, plan, config, logger, retry_policy, writer, max_tabs=tabs)
+            return [done.get(target.index, False) for target in plan]
+        for target in plan:
+            if retry_policy.breaker.is_open(host_of(target.url)):
+                logger.warning("서킷 브레이커 열림 - 대상 건너뜀: %s", target.name)
+                results.append(False)
+                continue
+            results.append(process_target(driver, target, config, logger, retry_policy=retry_policy, writer=writer))
+            count_targets(driver)
+    finally:
+        writer.close()
+    return results
+
+def run_worker(job_queue, logger, worker_id, lease_timeout=600, poll_interval=5, exit_when_empty=False):
+    """큐에서 대상 작업을 임대해 처리하는 워커 루프
+
+    같은 브라우저 설정의 작업이 이어지면 드라이버를 재사용
+    """
+    driver = None
+    driver_key = None
+    monitor = None
+    processed = 0
+    # 브라우저 설정이 바뀌어 교체된 모니터들의 드라이버 교체 횟수
+    recycled = 0
+    try:
+        while True:
+            job = job_queue.lease(worker_id, lease_timeout)
+            if job is None:
+                if exit_when_empty:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            payload = job["payload"]
+            target = payload["target"]
+            # 작업 설정에는 targets 가 없으므로 이 작업의 대상을 넣어 성능 로그 필요 여부 등을 판단
+            config = dict(payload["config"], targets=[target])
+            logger.info("작업 임대: %s (시도 %d) - %s", job["id"], job["attempts"], target.get("name"))
+
+            browser_key = network_capture.driver_key(config)
+            try:
+                if driver is None or browser_key != driver_key:
+                    teardown_driver(driver, logger)
+                    driver = None
+                    if monitor is not None:
+                        recycled += monitor.recycled
+                    monitor = HealthMonitor(config, setup_driver, teardown_driver, logger)
+                    driver = monitor.track(setup_driver(config, logger))
+                    driver_key = browser_key
+
+                collector = JobResultCollector(job_queue, job["id"], worker_id, lease_timeout)
+                key = f"{payload.get('target_index')}:{target.get('name', 'Unnamed Target')}"
+                success = process_target(driver, target, config, logger, collector, key)
+                result = {"success": success, "worker": worker_id, "outputs": collector.outputs}
+                if success:
+                    reported = job_queue.complete(job["id"], worker_id, result)
+                else:
+                    reported = job_queue.fail(job["id"], worker_id, result)
+                if not reported:
+                    # 처리 중 임대가 만료되어 다른 워커가 가져간 작업 - 그 워커의 결과를 덮어쓰지 않음
+                    logger.warning("임대 만료 - 결과를 반영하지 않음: %s", job["id"])
+            except LeaseLost:
+                # 처리 도중 임대를 잃음 - 남은 액션과 결과 파일 기록을 중단하고 다음 작업으로 (드라이버는 정상)
+                logger.warning("임대 만료 - 처리 중단, 결과를 반영하지 않음: %s", job["id"])
+            except Exception as e:
+                logger.error("작업 처리 실패: %s - %s", job["id"], e, exc_info=True)
+                job_queue.fail(job["id"], worker_id, {"success": False, "worker": worker_id, "error": str(e)})
+                # 드라이버 상태를 알 수 없으므로 다음 작업에서 새로 생성
+                teardown_driver(driver, logger)
+                driver = None
+            processed += 1
+
+            # 결과 보고 후 메모리 증가/충돌 시 다음 작업 전에 드라이버 교체
+            # (교체 실패가 이미 보고된 작업 결과에 영향을 주지 않도록 별도 처리)
+            if driver is not None:
+                try:
+                    driver = monitor.after_target(driver)
+                except Exception as e:
+                    logger.error("드라이버 상태 점검/교체 실패 - 다음 작업에서 새로 생성: %s", e)
+                    # 교체 도중 실패했으면 이전 드라이버는 이미 종료됨 - 모니터가 가진 드라이버만 정리
+                    teardown_driver(monitor.driver, logger)
+                    driver = None
+    finally:
+        teardown_driver(driver, logger)
+    if monitor is not None:
+        recycled += monitor.recycled
+    logger.info("워커 종료: %d개 작업 처리, 드라이버 교체 %d회", processed, recycled)
+    return processed
+
 def main():
     """메인 실행 함수"""
     parser = argparse.ArgumentParser(description='설정 파일 기반 웹 자동화 도구')
@@ -361,20 +749,124 @@ def main():
     parser.add_argument('-t', '--target', help='특정 대상만 실행 (이름)')
     parser.add_argument('--headless', action='store_true', help='헤드리스 모드 강제 적용')
     parser.add_argument('--retries', type=int, default=3, help='Chrome 프로세스 종료 재시도 횟수')
+    parser.add_argument('--log-format', choices=['text', 'json'], help='로그 파일 형식 (json: 구조화 JSON lines)')
+    parser.add_argument('--resume', action='store_true', help='체크포인트 저널에서 완료된 대상을 건너뛰고 이어서 실행')
+    parser.add_argument('--queue', help='작업 큐 (sqlite:///path/queue.db: 같은 호스트 전용, redis://host:6379/0#name: 여러 머신)')
+    parser.add_argument('--enqueue', action='store_true', help='설정 파일의 대상들을 작업 큐에 등록하고 종료')
+    parser.add_argument('--worker', action='store_true', help='작업 큐에서 대상을 가져와 처리하는 워커 모드')
+    parser.add_argument('--worker-id', help='워커 이름 (기본: 호스트명-PID)')
+    parser.add_argument('--lease-timeout', type=int, default=600, help='작업 임대 시간(초) - 초과 시 다른 워커가 재처리')
+    parser.add_argument('--exit-when-empty', action='store_true', help='큐가 비면 워커 종료')
+    parser.add_argument('--schedule-dir', help='스케줄러 데몬 모드: 디렉터리의 설정 파일들을 schedule/interval 에 따라 반복 실행')
+    parser.add_argument('--max-workers', type=int, default=2, help='스케줄러 동시 실행 수')
+    parser.add_argument('--tabs', type=int, help='한 브라우저에서 동시에 처리할 탭 수 (다중 탭 모드)')
+    parser.add_argument('--build-profile-template', action='store_true',
+                        help='browser.profile_template 경로에 대상 페이지 캐시가 포함된 프로필 템플릿을 만들고 종료')
+    parser.add_argument('--plan-cache', default='.plan_cache', help='컴파일된 실행 계획 캐시 디렉터리')
+    parser.add_argument('--profile-startup', action='store_true', help='모듈 import 소요 시간을 출력하고 종료')
     args = parser.parse_args()
     
-    # 설정 파일 로드
-    config = load_config(args.config)
+    if args.profile_startup:
+        module_load = time.perf_counter() - _MODULE_LOAD_STARTED
+        browser_type = "chrome"
+        if os.path.exists(args.config):
+            browser_type = load_config(args.config)["browser"].get("type", "chrome").lower()
+        print_startup_report(module_load, profile_imports(STARTUP_MODULES.get(browser_type, [])))
+        return
+
+    # 설정 파일 로드 (실행 계획은 설정 파일 해시 기준으로 디스크 캐시)
+    plan = None
+    if os.path.exists(args.config):
+        try:
+            config, plan = load_compiled(args.config, args.plan_cache)
+        except Exception as e:
+            print(f"실행 계획 캐시 사용 불가: {e}")
+    if plan is None:
+        config = load_config(args.config)
     
     # 명령줄 인자로 설정 덮어쓰기
     if args.headless:
         config["browser"]["headless"] = True
     if args.retries:
         config["browser"]["retries"] = args.retries
+    if args.log_format:
+        config["output"]["log_format"] = args.log_format
+    if (args.enqueue or args.worker) and not args.queue:
+        parser.error("--enqueue/--worker 에는 --queue 가 필요합니다")
+    if args.worker_id:
+        config["output"]["worker_id"] = args.worker_id
+    if args.tabs:
+        config["browser"]["tabs"] = args.tabs
+
     # 로깅 설정
     logger = setup_logging(config)
-    logger.info(f"설정 파일 로드 완료: {args.config}")
+    logger.info("설정 파일 로드 완료: %s", args.config)
+
+    # 이전 실행이 강제 종료되며 남긴 브라우저 프로세스/임시 프로필 정리
+    reaped = process_supervisor.reap(logger)
+    if reaped:
+        logger.info("고아 프로세스/임시 프로필 %d개 정리", reaped)
     
+    if args.build_profile_template:
+        template = config["browser"].get("profile_template")
+        if not template:
+            parser.error("--build-profile-template 에는 설정 파일의 browser.profile_template 이 필요합니다")
+        urls = [target.get("url") for target in config.get("targets", []) if target.get("url")]
+        try:
+            build_template(template, lambda user_data_dir: setup_driver(config, logger, user_data_dir),
+                           teardown_driver, urls, logger, backend_for(config, logger).profile_format)
+        finally:
+            LoggerManager.shutdown_logging()
+        return
+
+    if args.enqueue:
+        job_queue = open_queue(args.queue)
+        jobs = build_jobs(config, source=args.config)
+        if args.target:
+            jobs = [job for job in jobs if job["target"].get("name") == args.target]
+        for job in jobs:
+            job_queue.enqueue(job)
+        job_queue.close()
+        logger.info("작업 큐 등록 완료: %d개 대상 -> %s", len(jobs), args.queue)
+        LoggerManager.shutdown_logging()
+        return
+
+    if args.schedule_dir:
+        import signal
+        if "DISPLAY" not in os.environ and os.name == "posix":
+            os.environ["DISPLAY"] = ":99"
+
+        def health_check(config, driver):
+            # 반납된 드라이버 점검 - 메모리 초과/무응답이면 풀에 보관하지 않음
+            return HealthMonitor(config, setup_driver, teardown_driver, logger).diagnose(driver)[0]
+
+        daemon = ConfigScheduler(args.schedule_dir, run_config_targets, setup_driver, teardown_driver,
+                                 logger, max_workers=args.max_workers, health_check=health_check)
+        signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+        reaper = process_supervisor.Reaper(logger).start()
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            daemon.shutdown()
+        finally:
+            reaper.stop()
+            LoggerManager.shutdown_logging()
+        return
+
+    if args.worker:
+        if "DISPLAY" not in os.environ and os.name == "posix":
+            os.environ["DISPLAY"] = ":99"
+        job_queue = open_queue(args.queue)
+        worker_id = args.worker_id or f"{os.uname().nodename}-{os.getpid()}"
+        reaper = process_supervisor.Reaper(logger).start()
+        try:
+            run_worker(job_queue, logger, worker_id, args.lease_timeout, exit_when_empty=args.exit_when_empty)
+        finally:
+            reaper.stop()
+            job_queue.close()
+            LoggerManager.shutdown_logging()
+        return
+
     try:
         # 환경변수 확인 - 헤드리스 리눅스 환경에서 필요
         if "DISPLAY" not in os.environ and os.name == "posix" and config["browser"].get("headless", False):
@@ -383,49 +875,70 @@ def main():
         
         # 드라이버 설정 - logger 인자 전달
         driver = None
-        user_data_dir = None
+        checkpoint = None
+        writer = None
+        monitor = HealthMonitor(config, setup_driver, teardown_driver, logger)
         try:
-            driver = setup_driver(config, logger)
-            logger.info(f"드라이버 설정 완료 (브라우저: {config['browser'].get('type')}, 헤드리스: {config['browser'].get('headless')})")
+            driver = monitor.track(setup_driver(config, logger))
+            logger.info("드라이버 설정 완료 (브라우저: %s, 헤드리스: %s)", config['browser'].get('type'), config['browser'].get('headless'))
         except Exception as e:
-            logger.error(f"자동화 실패: {e}", exc_info=True)
+            logger.error("자동화 실패: %s", e, exc_info=True)
             sys.exit(1)
         try:
             # 대상 처리
-            targets = config.get("targets", [])
+            if plan is None:
+                plan = compile_plan(config)
+            report_plan_issues(plan, logger)
+            targets = plan
             
             # 특정 대상만 처리 (명령줄 인자로 지정된 경우)
             if args.target:
-                targets = [t for t in targets if t.get("name") == args.target]
+                targets = [t for t in targets if t.name == args.target]
                 if not targets:
-                    logger.error(f"지정된 대상을 찾을 수 없음: {args.target}")
+                    logger.error("지정된 대상을 찾을 수 없음: %s", args.target)
                     sys.exit(1)
             
+            writer = OutputWriter(config, logger)
+            checkpoint = CheckpointManager(
+                CheckpointManager.journal_path_for(config, args.config), config, resume=args.resume, logger=logger
+            )
+            retry_policy = RetryPolicy(config)
+            remaining = []
             for target in targets:
-                process_target(driver, target, config, logger)
+                key = target_key(target.index, target.raw)
+                if checkpoint.is_completed(key):
+                    logger.info("체크포인트: 완료된 대상 건너뜀 - %s", key)
+                    continue
+                remaining.append(target)
+
+            tabs = int(config["browser"].get("tabs", 1))
+            if tabs > 1:
+                _, driver = process_targets_in_tabs(driver, remaining, config, logger, retry_policy, writer, checkpoint,
+                                                    tabs, monitor)
+            else:
+                for target in remaining:
+                    key = target_key(target.index, target.raw)
+                    if retry_policy.breaker.is_open(host_of(target.url)):
+                        logger.warning("서킷 브레이커 열림 - 대상 건너뜀: %s", key)
+                        continue
+                    success = process_target(driver, target, config, logger, checkpoint, key, retry_policy, writer)
+                    checkpoint.record_target(key, success)
+                    driver = monitor.after_target(driver)
             
-            logger.info("모든 작업 완료")
+            checkpoint.complete()
+            logger.info("모든 작업 완료 (드라이버 교체 %d회)", monitor.recycled)
             
         except Exception as e:
-            logger.error(f"예상치 못한 오류: {e}", exc_info=True)
+            logger.error("예상치 못한 오류: %s", e, exc_info=True)
     finally:
-        try:
-            if driver:
-                driver.quit()
-                logger.info("드라이버 종료 완료")
-        except Exception as e:
-            logger.error(f"드라이버 종료 실패: {e}")
+        if writer is not None:
+            writer.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        # 드라이버 교체 도중 실패했으면 driver 는 이미 종료된 드라이버 - 모니터가 가진 드라이버만 정리
+        teardown_driver(monitor.driver, logger)
 
-        # user_data_dir 정리 (Chrome 전용)
-        try:
-            if driver and hasattr(driver, "user_data_dir"):
-                import shutil
-                user_data_dir = driver.user_data_dir
-                if os.path.exists(user_data_dir):
-                    shutil.rmtree(user_data_dir, ignore_errors=True)
-                    logger.info(f"임시 디렉터리 삭제: {user_data_dir}")
-        except Exception as e:
-            logger.error(f"임시 디렉터리 삭제 실패: {e}")
+        LoggerManager.shutdown_logging()
 
 if __name__ == "__main__":
     main()
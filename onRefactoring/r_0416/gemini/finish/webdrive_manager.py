@@ -1,80 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+브라우저별 드라이버 생성 백엔드
+Chrome/Edge/Firefox 모두 같은 방식으로 생성/정리
+  - 실행마다 새 임시 프로필 (browser.profile_template 이 있으면 복제해서 사용 - 프로필 형식이 다른
+    브라우저의 템플릿이면 ValueError)
+  - 프로필 충돌로 실행에 실패하면 해당 프로필의 브라우저 프로세스를 정리하고 재시도 (browser.retries)
+  - 드라이버 서비스를 별도 프로세스 그룹으로 실행하고 process_supervisor 에 등록
+  - page_load_strategy, 리소스 차단 (browser.block_resources / browser.block_urls)
 
-class WebDriveManager:
-
-    def setup_driver(config, logger=None):
-        import tempfile
-        import psutil
-        from selenium.webdriver.chrome.options import Options as ChromeOptions
-        from selenium.webdriver.firefox.options import Options as FirefoxOptions
-        from selenium.webdriver.edge.options import Options as EdgeOptions
-
-        browser_config = config["browser"]
-        browser_type = browser_config.get("type", "chrome").lower()
-        headless = browser_config.get("headless", True)
-        browser_options = browser_config.get("options", [])
-
-        if browser_type == "chrome":
-            # user_data_dir 생성
-            user_data_dir = tempfile.mkdtemp(prefix=f'chrome_{uuid.uuid4().hex}_')
-            logger.info(f"생성된 user-data-dir: {user_data_dir}")
-
-            options = ChromeOptions()
-            options.add_argument(f"--user-data-dir={user_data_dir}")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            if headless:
-                options.add_argument("--headless=new")
-            for opt in browser_options:
-                if not opt.startswith("--user-data-dir="):
-                    options.add_argument(opt)
-
-            max_retries = int(config["browser"].get("retries", 5))
-            for attempt in range(max_retries):
-                try:
-                    driver = webdriver.Chrome(options=options)
-                    driver.user_data_dir = user_data_dir
-                    return driver
-                except WebDriverException as e:
-                    if "user data directory is already in use" in str(e) and attempt < max_retries - 1:
-                        logger.warning(f"시도 {attempt + 1}/{max_retries}: Chrome 프로세스 정리 시도")
-                        _cleanup_chrome_processes(user_data_dir, logger)
-                        time.sleep(2)
-                        continue
-                    raise
-
-        elif browser_type == "firefox":
-            options = FirefoxOptions()
-            if headless:
-                options.add_argument("--headless")
-            for option in browser_options:
-                options.add_argument(option)
-            return webdriver.Firefox(options=options)
-
-        elif browser_type == "edge":
-            options = EdgeOptions()
-            if headless:
-                options.add_argument("--headless")
-            for option in browser_options:
-                options.add_argument(option)
-            return webdriver.Edge(options=options)
+리소스 차단 설정 예시:
+  "block_resources": ["image", "font", "media", "stylesheet"]
+  "block_urls": ["*.doubleclick.net/*", "*/analytics.js"]   (Chrome/Edge 전용, 첫 탭에 적용)
+  Firefox 는 스타일시트를 막는 설정(pref)이 없어 "stylesheet" 차단을 지원하지 않음
+"""
+
+import time
+import uuid
+import tempfile
+from abc import ABC, abstractmethod
+
+import network_capture
+import process_supervisor
+from profile_manager import clone_profile, template_format, template_ready
+
+# Chromium 은 URL 패턴(확장자)으로 차단
+CHROMIUM_BLOCK_PATTERNS = {
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav"],
+    "stylesheet": ["*.css"],
+}
+
+# Firefox 는 환경 설정(prefs)으로 차단
+FIREFOX_BLOCK_PREFS = {
+    "image": {"permissions.default.image": 2},
+    "font": {"browser.display.use_document_fonts": 0, "gfx.downloadable_fonts.enabled": False},
+    "media": {"media.autoplay.default": 5, "media.autoplay.blocking_policy": 2},
+}
+
+BLOCKABLE_RESOURCES = ("image", "font", "media", "stylesheet")
 
+
+class BrowserBackend(ABC):
+    """드라이버 생성 공통 흐름 - 브라우저별 차이는 하위 클래스에서 구현"""
+
+    name = None
+    process_name = None
+    # 프로필 디렉터리 형식 (같은 형식의 브라우저끼리만 프로필 템플릿 공유 가능)
+    profile_format = None
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.browser_config = config["browser"]
+        self.logger = logger
+        self.profile_template = self.browser_config.get("profile_template")
+        if template_ready(self.profile_template):
+            found = template_format(self.profile_template)
+            if found and found != self.profile_format:
+                raise ValueError(f"{self.name} 에 사용할 수 없는 프로필 템플릿 ({found} 형식): {self.profile_template}")
+        self.headless = self.browser_config.get("headless", True)
+        self.block_resources = [
+            resource for resource in self.browser_config.get("block_resources", [])
+            if resource in BLOCKABLE_RESOURCES
+        ]
+        self.block_urls = list(self.browser_config.get("block_urls", []))
+        # 다중 탭 모드도 기본값 사용 (탭 로딩 대기는 TabScheduler 가 탭마다 처리)
+        self.page_load_strategy = self.browser_config.get("page_load_strategy")
+
+    def make_profile(self):
+        """임시 프로필 생성 (프로필 템플릿이 있으면 복제) - 리퍼가 소유 프로세스를 확인하도록 기록"""
+        prefix = f"{self.name}_{uuid.uuid4().hex}_"
+        if template_ready(self.profile_template):
+            profile_dir = clone_profile(self.profile_template, prefix=prefix, logger=self.logger)
         else:
-            raise ValueError(f"지원되지 않는 브라우저 유형: {browser_type}")
+            profile_dir = tempfile.mkdtemp(prefix=prefix)
+        process_supervisor.mark_owner(profile_dir)
+        return profile_dir
+
+    @abstractmethod
+    def build_options(self, profile_dir):
+        """프로필 경로를 지정한 브라우저 옵션 생성"""
 
+    @abstractmethod
+    def create(self, options):
+        """드라이버 생성"""
 
-    def _cleanup_chrome_processes(user_data_dir, logger):
-        """특정 user-data-dir을 사용하는 Chrome 프로세스 종료"""
-        import psutil
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+    @abstractmethod
+    def is_profile_conflict(self, error):
+        """드라이버 생성 오류가 프로필 충돌(이미 실행 중인 브라우저)인지"""
+
+    def after_start(self, driver):
+        """드라이버 생성 직후 처리 (리소스 차단 등)"""
+
+    def launch(self, profile_dir=None):
+        """드라이버 생성 - profile_dir 를 지정하면 그 프로필을 그대로 사용 (종료 시 삭제하지 않음)"""
+        from selenium.common.exceptions import WebDriverException
+
+        keep_profile = profile_dir is not None
+        if not keep_profile:
+            profile_dir = self.make_profile()
+        self.logger.info("생성된 %s 프로필: %s", self.name, profile_dir)
+        options = self.build_options(profile_dir)
+        if self.page_load_strategy:
+            options.page_load_strategy = self.page_load_strategy
+
+        max_retries = int(self.browser_config.get("retries", 5))
+        for attempt in range(max_retries):
+            try:
+                driver = self.create(options)
+            except WebDriverException as e:
+                if self.is_profile_conflict(e) and attempt < max_retries - 1:
+                    self.logger.warning("시도 %d/%d: %s 프로세스 정리 시도", attempt + 1, max_retries, self.name)
+                    cleanup_browser_processes(profile_dir, self.process_name, self.logger)
+                    time.sleep(2)
+                    continue
+                raise
+            if not keep_profile:
+                driver.user_data_dir = profile_dir
+            process_supervisor.register(driver, None if keep_profile else profile_dir)
             try:
-                if 'chrome' in proc.info['name'].lower() and \
-                        any(f'--user-data-dir={user_data_dir}' in cmd for cmd in proc.info['cmdline']):
-                    logger.info(f"종료 대상 프로세스: PID={proc.pid}, CMD={' '.join(proc.info['cmdline'])}")
-                    proc.terminate()
-                    try:
-                        proc.wait(3)
-                    except psutil.TimeoutExpired:
-                        logger.warning(f"강제 종료: PID={proc.pid}")
-                        proc.kill()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
\ No newline at end of file
+                self.after_start(driver)
+            except Exception as e:
+                self.logger.warning("드라이버 초기 설정 실패: %s", e)
+            return driver
+
+
+class ChromeBackend(BrowserBackend):
+    name = "chrome"
+    process_name = "chrome"
+    profile_format = "chromium"
+    logging_capability = network_capture.PERFORMANCE_LOG_CAPABILITY
+
+    def _options_class(self):
+        from selenium.webdriver.chrome.options import Options
+        return Options
+
+    def _service(self):
+        from selenium.webdriver.chrome.service import Service
+        # 드라이버 서비스를 별도 프로세스 그룹으로 실행해 종료 시 브라우저까지 그룹 단위로 정리
+        return Service(**process_supervisor.service_kwargs())
+
+    def create(self, options):
+        from selenium import webdriver
+        return webdriver.Chrome(options=options, service=self._service())
+
+    def build_options(self, profile_dir):
+        options = self._options_class()()
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        if self.headless:
+            options.add_argument("--headless=new")
+        for opt in self.browser_config.get("options", []):
+            if not opt.startswith("--user-data-dir="):
+                options.add_argument(opt)
+        if network_capture.wants_network_capture(self.config):
+            network_capture.enable_performance_logging(options, self.logging_capability)
+        if "image" in self.block_resources:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return options
+
+    def is_profile_conflict(self, error):
+        return "user data directory is already in use" in str(error)
+
+    def after_start(self, driver):
+        patterns = [
+            pattern for resource in self.block_resources
+            for pattern in CHROMIUM_BLOCK_PATTERNS.get(resource, [])
+        ] + self.block_urls
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+class EdgeBackend(ChromeBackend):
+    """Chromium 기반 Edge - Chrome 과 같은 옵션/프로필 구조"""
+
+    name = "edge"
+    process_name = "msedge"
+    logging_capability = "ms:loggingPrefs"
+
+    def _options_class(self):
+        from selenium.webdriver.edge.options import Options
+        return Options
+
+    def _service(self):
+        from selenium.webdriver.edge.service import Service
+        return Service(**process_supervisor.service_kwargs())
+
+    def create(self, options):
+        from selenium import webdriver
+        return webdriver.Edge(options=options, service=self._service())
+
+
+class FirefoxBackend(BrowserBackend):
+    name = "firefox"
+    process_name = "firefox"
+    profile_format = "firefox"
+
+    def create(self, options):
+        from selenium import webdriver
+        from selenium.webdriver.firefox.service import Service
+        return webdriver.Firefox(options=options, service=Service(**process_supervisor.service_kwargs()))
+
+    def build_options(self, profile_dir):
+        from selenium.webdriver.firefox.options import Options
+
+        options = Options()
+        # geckodriver 가 프로필을 다시 복사하지 않도록 경로를 직접 지정
+        options.add_argument("-profile")
+        options.add_argument(profile_dir)
+        if self.headless:
+            options.add_argument("-headless")
+        for option in self.browser_config.get("options", []):
+            options.add_argument(option)
+        for resource in self.block_resources:
+            if resource not in FIREFOX_BLOCK_PREFS:
+                self.logger.warning("Firefox 는 %s 차단을 지원하지 않습니다 - 무시", resource)
+                continue
+            for key, value in FIREFOX_BLOCK_PREFS[resource].items():
+                options.set_preference(key, value)
+        if self.block_urls:
+            self.logger.warning("Firefox 는 block_urls 를 지원하지 않습니다 - 무시")
+        if network_capture.wants_network_capture(self.config):
+            self.logger.warning("Firefox 는 capture_network 를 지원하지 않습니다")
+        return options
+
+    def is_profile_conflict(self, error):
+        message = str(error)
+        return "already running" in message or "Process unexpectedly closed" in message
+
+
+BACKENDS = {
+    "chrome": ChromeBackend,
+    "edge": EdgeBackend,
+    "firefox": FirefoxBackend,
+}
+
+
+def backend_for(config, logger):
+    browser_type = config["browser"].get("type", "chrome").lower()
+    if browser_type not in BACKENDS:
+        raise ValueError(f"지원되지 않는 브라우저 유형: {browser_type}")
+    return BACKENDS[browser_type](config, logger)
+
+
+def cleanup_browser_processes(profile_dir, process_name, logger):
+    """특정 프로필을 사용하는 브라우저 프로세스 종료"""
+    # 이 도구가 띄운 브라우저면 기록된 프로세스 그룹만 바로 종료
+    records = process_supervisor.find_records(profile_dir)
+    if records:
+        for record in records:
+            logger.info("종료 대상 프로세스 그룹: PGID=%s", record.get("pgid"))
+            process_supervisor.kill_group(record)
+        return
+
+    import psutil
+    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        try:
+            if process_name in (proc.info['name'] or "").lower() and \
+               any(profile_dir in cmd for cmd in proc.info['cmdline'] or []):
+                logger.info("종료 대상 프로세스: PID=%s, CMD=%s", proc.pid, ' '.join(proc.info['cmdline']))
+                proc.terminate()
+                try:
+                    proc.wait(3)
+                except psutil.TimeoutExpired:
+                    logger.warning("강제 종료: PID=%s", proc.pid)
+                    proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
@@ -3,13 +3,26 @@ import os
 import json
 import argparse
 import re
-import google.generativeai as genai
+import time
+
+# --profile-startup 용: 모듈 로드 시작 시각
+_MODULE_LOAD_STARTED = time.perf_counter()
+
 from dotenv import load_dotenv
 import string
 import logging
 from datetime import datetime
 import sys
-import config_file_manager
+
+# 프롬프트 예산/페이지 요약/시작 시간 측정 모듈은 finish/ 에 있음 - 같은 이름의 이 디렉터리 이전 버전
+# (web_automation.py, config_file_manager.py)보다 finish/ 를 먼저 찾도록 앞에 추가
+FINISH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "finish")
+if FINISH_DIR not in sys.path:
+    sys.path.insert(0, FINISH_DIR)
+
+from prompt_builder import (DEFAULT_PROMPT_TOKEN_BUDGET, PromptBudgetMixin, PromptBuilder, compact_template,
+                            minify_json)
+
 
 class EnhancedSafeFormatter(string.Formatter):
     """누락된 키를 원본 문자열로 유지하는 커스텀 포맷터"""
@@ -18,7 +31,7 @@ class EnhancedSafeFormatter(string.Formatter):
         # 허용된 포맷 키
         self.valid_keys = {
             "task_description", "config_template", 
-            "valid_selector_types", "valid_action_types"
+            "valid_selector_types", "valid_action_types", "page_summary"
         }
         
     def get_value(self, key, args, kwargs):
@@ -46,8 +59,9 @@ class EnhancedSafeFormatter(string.Formatter):
             # 포맷 스펙 오류 시 기본 문자열 변환
             return str(value)
 
-class GeminiConfigGenerator:
-    def __init__(self, api_key=None, max_retries=5, verbose=False, temp_dir=None):
+class GeminiConfigGenerator(PromptBudgetMixin):
+    def __init__(self, api_key=None, max_retries=5, verbose=False, temp_dir=None, page_summary=True,
+                 prompt_budget=None):
         load_dotenv()
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.max_retries = max_retries
@@ -56,6 +70,12 @@ class GeminiConfigGenerator:
         self.temp_dir = temp_dir or os.getcwd()
         self.safe_formatter = EnhancedSafeFormatter()
         self.user_url = None
+        # 생성 전에 대상 페이지를 한 번 열어 구조 요약을 프롬프트에 포함 (실제 셀렉터 사용 유도)
+        self.page_summary_enabled = page_summary
+        self.page_summary_chars = 3000
+        self.page_summary = ""
+        # 프롬프트 토큰 예산 - 넘으면 페이지 요약/컨텍스트 등 우선순위 낮은 섹션부터 축소
+        self.prompt_budget = prompt_budget or int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET))
         # 로깅 설정
         self._setup_logging()
 
@@ -78,13 +98,8 @@ class GeminiConfigGenerator:
         - 특수 문자나 제어 문자는 이스케이프 처리해야 합니다
         """
 
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
-
-        genai.configure(api_key=self.api_key)
-
-        # 지원되는 모델로 변경
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        # Gemini 모델은 실제 API 호출이 필요할 때 초기화 (검증 전용 경로는 import 비용 없음)
+        self._model = None
 
 
         self.config_template = {
@@ -117,8 +132,24 @@ class GeminiConfigGenerator:
             "screenshot", "input", "click", "wait", "extract", "scroll"
         ]
 
+    @property
+    def model(self):
+        """Gemini 모델 (처음 사용할 때 google.generativeai import 및 설정)"""
+        if self._model is None:
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
+
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+
+            # 지원되는 모델로 변경
+            self._model = genai.GenerativeModel('gemini-1.5-flash')
+        return self._model
+
     def generate_config(self, task_description, custom_prompt=None, user_url=None):
         """유효한 설정 파일을 생성할 때까지 반복 시도"""
+        # API 키 누락은 기본 설정으로 대체하지 않고 바로 오류 처리
+        self.model
 
         self.user_url = self._fix_url(user_url) if user_url else None
 
@@ -129,6 +160,9 @@ class GeminiConfigGenerator:
 
         self.task_description = task_description
 
+        # 페이지 요약은 재시도마다 다시 수집하지 않고 한 번만
+        self.page_summary = self._load_page_summary(task_description)
+
         for attempt in range(self.max_retries):
             print(f"설정 파일 생성 시도 중... (시도 {attempt+1}/{self.max_retries})")
             
@@ -210,11 +244,12 @@ class GeminiConfigGenerator:
                     url_context = f"\n대상 사이트 URL: {self.user_url}\n"
 
 
-                prompt += f"""
+                builder = PromptBuilder(self.prompt_budget).add(prompt)
+                builder.add(f"""
                 
     
                 설정 파일 구조는 다음과 같아야 합니다:
-                {json.dumps(self.config_template, indent=2, ensure_ascii=False)}
+                {minify_json(compact_template(self.config_template))}
     
                 중요한 주의사항:
                 1. targets 배열에는 최소 1개 이상의 작업 단계를 포함해야 합니다
@@ -225,7 +260,9 @@ class GeminiConfigGenerator:
                     - 각 selector의 "type"은 다음 중 하나여야 합니다: {', '.join(self.valid_selector_types)}
                 4. 각 액션 타입은 다음 중 하나여야 합니다: {', '.join(self.valid_action_types)}
                 5. 웹사이트 특성에 맞게 적절한 셀렉터와 대기 시간을 설정해야 합니다
-                """
+                """)
+                builder.add(self._page_summary_section(), priority=1, squeeze=False)
+                prompt = self._finish_prompt(builder, "설정 생성")
             else:
                 # 사용자 정의 프롬프트 처리
                 try:
@@ -235,15 +272,21 @@ class GeminiConfigGenerator:
                     # 2. 포맷 변수 준비
                     format_vars = {
                         "task_description": task_description,
-                        "config_template": json.dumps(self.config_template, indent=2, ensure_ascii=False),
+                        "config_template": minify_json(compact_template(self.config_template)),
                         "valid_selector_types": ", ".join(self.valid_selector_types),
                         "valid_action_types": ", ".join(self.valid_action_types),
-                        "current_date": datetime.now().strftime('%Y-%m-%d')
+                        "current_date": datetime.now().strftime('%Y-%m-%d'),
+                        "page_summary": self.page_summary
                     }
                     
                     # 3. 향상된 안전 포맷터 사용
                     formatter = EnhancedSafeFormatter()
                     prompt = formatter.format(custom_prompt, **format_vars)
+                    builder = PromptBuilder(self.prompt_budget).add(prompt, squeeze=False)
+                    # 프롬프트에 {page_summary} 자리가 없으면 끝에 덧붙임
+                    if "{page_summary}" not in custom_prompt:
+                        builder.add(self._page_summary_section(), priority=1, squeeze=False)
+                    prompt = self._finish_prompt(builder, "사용자 정의")
                     
                 except Exception as e:
                     # 내부 try-except 블록: 프롬프트 포맷팅 오류 처리
@@ -332,46 +375,41 @@ class GeminiConfigGenerator:
         return bool(pattern.match(url)), url
 
     def _create_fallback_prompt(self, task_description, original_prompt):
-        """포맷팅 실패 시 대체 프롬프트 생성"""
+        """포맷팅 실패 시 대체 프롬프트 생성 (원본 프롬프트는 토큰 예산이 허용하는 만큼 포함)"""
         try:
-            
-            site_url = None
-            if self.user_url is None:
+            if self.user_url:
+                url_text = f"- {self.user_url}"
+            else:
                 # URL 추출
                 urls = re.findall(r'https?://[^\s"\'<>]+', original_prompt)
                 url_text = "\n".join([f"- {url}" for url in urls]) if urls else "URL이 지정되지 않았습니다."
-                if is_valid_url(url_text) is False:
-                    print("invalid url")
-            else:
-                site_url = self.user_url 
-                
-            # 텍스트 중 일부 추출 (중괄호 제외)
+
+            # 원본 프롬프트 텍스트 (중괄호 제외)
             safe_text = re.sub(r'[{}]', '', original_prompt)
-            # 처음 500자만 사용
-            if len(safe_text) > 500:
-                safe_text = safe_text[:500] + "..."
-                
-            # 안전한 프롬프트 구성
-            return f"""
+
+            # 안전한 프롬프트 구성 - 예산을 넘으면 작업 컨텍스트, 페이지 요약 순으로 축소
+            builder = PromptBuilder(self.prompt_budget)
+            builder.add(f"""
             다음 작업 설명과 관련 정보를 바탕으로 Selenium 자동화 설정 파일을 JSON 형식으로 생성해주세요.
             
             작업 설명: {task_description}
             
             관련 URL:
             {url_text}
-            
-            작업 컨텍스트:
-            {safe_text}
-            
+            """)
+            builder.add(f"작업 컨텍스트:\n{safe_text}", priority=0)
+            builder.add(f"""
             설정 파일 구조는 다음과 같아야 합니다:
-            {json.dumps(self.config_template, indent=2, ensure_ascii=False)}
+            {minify_json(compact_template(self.config_template))}
             
             중요한 주의사항:
             1. targets 배열에는 최소 1개 이상의 작업 단계를 포함해야 합니다
             2. 각 액션은 유효한 Selenium 명령어를 사용해야 합니다
             3. 모든 selectors는 반드시 유효한 값을 포함해야 합니다
             4. 응답은 반드시 유효한 JSON 형식이어야 합니다
-            """
+            """)
+            builder.add(self._page_summary_section(), priority=1, squeeze=False)
+            return self._finish_prompt(builder, "대체")
         except Exception as e:
             self.logger.error(f"대체 프롬프트 생성 실패: {e}", exc_info=True)
             return None
@@ -427,7 +465,8 @@ class GeminiConfigGenerator:
             "task_description", 
             "config_template", 
             "valid_selector_types", 
-            "valid_action_types"
+            "valid_action_types",
+            "page_summary"
         ]
         
         # 정규 표현식으로 유효하지 않은 중괄호만 이스케이프
@@ -992,16 +1031,15 @@ class GeminiConfigGenerator:
         url_info = f'\n반드시 "targetUrl": "{self.user_url}" 필드를 포함해야 합니다.' if self.user_url else ''
 
         """Gemini API를 사용하여 잘못된 JSON 수정 시도"""
-        prompt = f"""
+        builder = PromptBuilder(self.prompt_budget)
+        builder.add(f"""
         다음은 잘못된 형식의 JSON 문자열입니다. 이를 올바른 Selenium 자동화 설정 JSON으로 수정해주세요.
         
-        {url_info}  
-
-        잘못된 JSON:
-        ```
-        {invalid_json}
-        ```
-        
+        {url_info}
+        """)
+        # 잘못된 JSON 은 들여쓰기를 제거해 넣고, 예산을 넘으면 뒷부분부터 잘라냄
+        builder.add(f"잘못된 JSON:\n{invalid_json}", priority=0)
+        builder.add(f"""
         수정된 JSON은 다음 필수 요구사항을 충족해야 합니다:
         1. 모든 문자열은 큰따옴표로 묶여야 합니다.
         2. 객체의 키 이름은 큰따옴표로 묶여야 합니다.
@@ -1028,7 +1066,8 @@ class GeminiConfigGenerator:
             }}
         ]
         }}
-        """
+        """)
+        prompt = self._finish_prompt(builder, "JSON 수정")
 
         try:
             if hasattr(self, 'logger'):
@@ -1105,9 +1144,13 @@ class GeminiConfigGenerator:
         return url
 
 
+# 실제 실행 시 필요한 경우에만 import 되는 모듈 (--profile-startup 측정 대상)
+STARTUP_MODULES = ("google.generativeai", "config_file_manager")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Gemini API를 이용한 Selenium 설정 파일 생성")
-    parser.add_argument("--task", required=True, help="자동화 작업 설명")
+    parser.add_argument("--task", help="자동화 작업 설명 (생성 모드에서 필수)")
     parser.add_argument("--output", default="gemini_generated_config.json", help="출력 파일 경로")
     parser.add_argument("--api-key", help="Gemini API 키")
     parser.add_argument("--max-retries", type=int, default=5, help="최대 시도 횟수")
@@ -1118,11 +1161,58 @@ if __name__ == "__main__":
     parser.add_argument("--fix", help="기존 설정 파일 수정 모드")
     parser.add_argument("--max-fix-attempts", type=int, default=5, 
                    help="최대 수정 시도 횟수")
+    parser.add_argument("--no-page-summary", action="store_true",
+                        help="생성 전에 대상 페이지를 열어 구조 요약을 프롬프트에 넣는 단계 생략")
+    parser.add_argument("--prompt-budget", type=int,
+                        help="Gemini 프롬프트 토큰 예산 (기본: GEMINI_PROMPT_TOKEN_BUDGET 또는 6000)")
+    parser.add_argument("--profile-startup", action="store_true", help="모듈 import 소요 시간을 출력하고 종료")
 
     args = parser.parse_args()
+    if args.profile_startup:
+        from startup_profiler import profile_imports, print_startup_report
+        print_startup_report(time.perf_counter() - _MODULE_LOAD_STARTED, profile_imports(STARTUP_MODULES))
+        sys.exit(0)
+    if not (args.task or args.validate_only or args.fix):
+        parser.error("--task 가 필요합니다 (--validate-only / --fix 모드 제외)")
     print(f"input arguments : ${args}")
+
+    if args.validate_only:
+        # 검증만 수행 - Gemini 모델 초기화 없음
+        validator = GeminiConfigGenerator(api_key=args.api_key, max_retries=args.max_retries)
+        with open(args.output, 'r', encoding='utf-8') as f:
+            is_valid, issues = validator.validate_config(json.load(f))
+        if is_valid:
+            print(f"✅ 유효한 설정 파일: {args.output}")
+            sys.exit(0)
+        print(f"❌ 설정 파일 유효성 검사 실패: {args.output}")
+        for issue in issues:
+            print(f"  - {issue}")
+        sys.exit(1)
+
+    if args.fix:
+        # 수정 모드 - 모델은 수정이 필요한 문제가 있을 때만 초기화됨
+        import config_file_manager
+        file_manager = config_file_manager.ConfigFileManager()
+        print(f"🔍 설정 파일 수정 모드 시작: {args.fix}")
+    
+        validator = config_file_manager.ConfigValidator(api_key=args.api_key, prompt_budget=args.prompt_budget)
+    
+        try:
+            original_config = file_manager.load_config(args.fix)
+            fixed_config = validator.iterative_fix(original_config, args.max_fix_attempts)
+            
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(fixed_config, f, indent=2, ensure_ascii=False)
+                
+            print(f"✅ 수정 완료: {args.output}")
+        except Exception as e:
+            print(f"❌ 수정 실패: {e}")
+        sys.exit(0)
+
     # GeminiConfigGenerator 인스턴스 생성 (올바른 문법)
-    config_gen = GeminiConfigGenerator(api_key=args.api_key, max_retries=args.max_retries)
+    config_gen = GeminiConfigGenerator(api_key=args.api_key, max_retries=args.max_retries,
+                                       page_summary=not args.no_page_summary,
+                                       prompt_budget=args.prompt_budget)
 
     # 프롬프트 파일 처리
     custom_prompt = None
@@ -1143,23 +1233,4 @@ if __name__ == "__main__":
     with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
 
-
-    if args.fix:
-        file_manager = config_file_manager.ConfigFileManager()
-        print(f"🔍 설정 파일 수정 모드 시작: {args.fix}")
-    
-        validator = ConfigValidator(api_key=args.api_key)
-    
-        try:
-            original_config = file_manager.load_config(args.fix)
-            fixed_config = validator.iterative_fix(original_config, args.max_fix_attempts)
-            
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(fixed_config, f, indent=2, ensure_ascii=False)
-                
-            print(f"✅ 수정 완료: {args.output}")
-        except Exception as e:
-            print(f"❌ 수정 실패: {e}")
-
-    
     print(f"생성된 설정 파일: {args.output}")